@@ -0,0 +1,319 @@
+"""asyncio I/O backend for Communication (io_backend='asyncio').
+
+One event-loop thread replaces the reader/sender thread pair and the CSV
+log writer thread:
+
+- every link (the main `ser` plus `extra_ports`) is watched with
+  loop.add_reader on its file descriptor and drained without blocking;
+  transports without one (Windows serial, replay, loop://) are polled;
+- queued commands are paced by the same TokenBucket and written from the
+  loop;
+- the log writer is pumped from the loop instead of its own thread;
+- all signals emitted during one loop iteration are collected and sent to
+  the GUI thread as a single queued `io_events` signal;
+- a link whose port fails is reopened by a reconnect task with the same
+  backoff as the threaded reader, while the other links keep running.
+"""
+import asyncio
+import threading
+import time
+import logging
+from functools import partial
+
+import serial
+
+from codec import make_codec
+from transport import open_transport
+from linkSupervisor import LinkSupervisor, port_present, CONNECTED, RECONNECTING
+
+POLL_INTERVAL = 0.005    # seconds between reads of links without a file descriptor
+HOUSEKEEPING_TICK = 0.02  # batch/stats/log-writer/timeout checks
+
+class Link:
+    """One input the loop reads from, with its own framing state."""
+
+    def __init__(self, name, transport, codec, supervisor):
+        self.name = name
+        self.transport = transport
+        self.codec = codec
+        self.supervisor = supervisor
+        self.fd = None
+        self.saved_timeout = getattr(transport, 'timeout', None)
+        self.last_rx = time.monotonic()
+        self.bytes = 0
+        self.failed = False
+
+    def fileno(self):
+        try:
+            fd = self.transport.fileno()
+        except (AttributeError, OSError, ValueError, NotImplementedError):
+            return None
+        return fd if isinstance(fd, int) and fd >= 0 else None
+
+class AsyncIOCore:
+    """Runs a Communication's links, command queue and log writer in one loop thread."""
+
+    def __init__(self, comm):
+        self.comm = comm
+        self.loop = None
+        self.links = []
+        self._thread = None
+        self._stopping = None
+        self._commands = None
+        self._tasks = []
+        self._flush_scheduled = False
+        self.loop_iterations = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        comm = self.comm
+        comm.codec.reset()
+        comm.stats.reset()
+        self.links = [Link(comm.serial_port or 'serial', comm.ser, comm.codec, comm.supervisor)]
+        for port in comm.extra_ports:
+            try:
+                transport = self._open(port)
+            except serial.SerialException as e:
+                logging.error(f"Failed to open link {port}: {e}")
+                continue
+            codec = make_codec(comm.codec_name, comm.data_manager.getTelemetryFields(),
+                               comm.data_manager.getBinaryFormat())
+            self.links.append(Link(port, transport, codec,
+                                   LinkSupervisor(comm.reconnect_initial, comm.reconnect_max)))
+        comm.log_writer.start(threaded=False)
+        # Created up front so stop()/send_command() work as soon as start() returns
+        self.loop = asyncio.new_event_loop()
+        self._stopping = asyncio.Event()
+        self._commands = asyncio.Queue(maxsize=comm.command_queue.maxsize)
+        self._thread = threading.Thread(target=self._run, name="asyncio-io", daemon=True)
+        self._thread.start()
+
+    def _open(self, port):
+        comm = self.comm
+        return open_transport(port, comm.baud_rate, comm.timeout,
+                              telemetry_fields=comm.data_manager.getTelemetryFields(),
+                              encode=comm.codec.encode if comm.codec.binary else None)
+
+    def stop(self, timeout=5.0, keep_log=False):
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass  # loop already closed
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        for link in self.links[1:]:
+            try:
+                link.transport.close()
+            except Exception:
+                pass
+        if not keep_log:
+            self.comm.log_writer.stop()
+
+    def send_command(self, command):
+        """Thread-safe: queue a command for the loop's sender. Returns False if
+        the loop is not running."""
+        if not self.running:
+            logging.warning("I/O loop is not running, dropping command")
+            return False
+        self.loop.call_soon_threadsafe(self._queue_command, command)
+        return True
+
+    def _queue_command(self, command):
+        try:
+            self._commands.put_nowait(command)
+            logging.debug(f"Command queued: {command}, queue size: {self._commands.qsize()}")
+        except asyncio.QueueFull:
+            logging.warning("Command queue is full, dropping command")
+            self.comm._command_dropped(command)
+
+    ## Loop ##
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        except Exception as e:
+            logging.error(f"I/O loop failed: {e}")
+        finally:
+            self.loop.close()
+
+    async def _main(self):
+        comm = self.comm
+        comm._events = []
+        expected_fields = len(comm.telemetryHeaders)
+        for link in self.links:
+            print(f"Serial port {link.name} opened successfully.")
+            self._watch(link, expected_fields)
+        self._tasks.append(self.loop.create_task(self._send_commands()))
+        self._tasks.append(self.loop.create_task(self._housekeeping()))
+        try:
+            await self._stopping.wait()
+        finally:
+            for link in self.links:
+                if link.fd is not None:
+                    self.loop.remove_reader(link.fd)
+                link.transport.timeout = link.saved_timeout
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            comm._emit_batch()
+            comm._report_link_stats(force=True)
+            comm.log_writer.pump()
+            self._flush_events()
+            comm._events = None
+
+    def _watch(self, link, expected_fields):
+        link.transport.timeout = 0  # reads only take what has already arrived
+        link.fd = link.fileno()
+        if link.fd is not None:
+            self.loop.add_reader(link.fd, self._on_readable, link, expected_fields)
+        else:
+            self._tasks.append(self.loop.create_task(self._poll(link, expected_fields)))
+
+    def _read_link(self, link, expected_fields):
+        transport = link.transport
+        if hasattr(transport, 'feed_to'):
+            n, frames = transport.feed_to(link.codec)
+        else:
+            data = transport.read(max(transport.in_waiting, 1))
+            n, frames = len(data), (link.codec.feed(data) if data else [])
+        if not n:
+            return False
+        link.last_rx = time.monotonic()
+        link.bytes += n
+        self.comm._process_frames(frames, link.codec, expected_fields)
+        self._schedule_flush()
+        return True
+
+    def _on_readable(self, link, expected_fields):
+        try:
+            self._read_link(link, expected_fields)
+        except serial.SerialException as e:
+            self._drop_link(link, e, expected_fields)
+        except Exception as e:
+            print(f"Error: {e}")
+
+    async def _poll(self, link, expected_fields):
+        while True:
+            try:
+                if self._read_link(link, expected_fields):
+                    await asyncio.sleep(0)  # let the other links and tasks run
+                elif link.transport is self.comm.ser and self.comm._replay_done():
+                    self.comm._finish_replay(link.codec, expected_fields)
+                    self._schedule_flush()
+                    return
+                else:
+                    await asyncio.sleep(POLL_INTERVAL)
+            except serial.SerialException as e:
+                self._drop_link(link, e, expected_fields)
+                return
+            except Exception as e:
+                print(f"Error: {e}")
+                await asyncio.sleep(POLL_INTERVAL)
+
+    def _drop_link(self, link, error, expected_fields):
+        print(f"Serial error on {link.name}: {error}")
+        link.failed = True
+        if link.fd is not None:
+            self.loop.remove_reader(link.fd)
+            link.fd = None
+        if self.comm.reconnect and self.comm.replay is None:
+            self._tasks.append(self.loop.create_task(self._reconnect(link, error, expected_fields)))
+
+    async def _reconnect(self, link, error, expected_fields):
+        """Reopen a failed link with backoff (see Communication._reconnect)."""
+        comm = self.comm
+        supervisor = link.supervisor
+        supervisor.disconnected(link.name, error)
+        comm._emit('link_state', link.name, supervisor.state)
+        self._schedule_flush()
+        try:
+            link.transport.close()
+        except Exception:
+            pass
+        primary = link is self.links[0]
+        while True:
+            await asyncio.sleep(supervisor.next_delay())
+            if not port_present(link.name):
+                continue
+            if supervisor.state != RECONNECTING:
+                supervisor.state = RECONNECTING
+                comm._emit('link_state', link.name, supervisor.state)
+                self._schedule_flush()
+            try:
+                # Opening can block (serial settle time, TCP connect), so off the loop
+                opener = comm.open_port if primary else partial(self._open, link.name)
+                transport = await self.loop.run_in_executor(None, opener)
+            except serial.SerialException as e:
+                logging.debug(f"Reopening {link.name} failed: {e}")
+                continue
+            break
+        link.transport = transport
+        link.codec.reset()
+        link.failed = False
+        link.last_rx = time.monotonic()
+        self._watch(link, expected_fields)
+        outage = supervisor.reconnected()
+        logging.warning(f"Link {link.name} reconnected after {outage.duration:.1f}s "
+                        f"({outage.attempts} attempts)")
+        comm._emit('link_state', link.name, CONNECTED)
+        comm._emit('link_outage', outage.as_dict())
+        self._schedule_flush()
+
+    async def _send_commands(self):
+        """Send queued commands in FIFO order, paced by the command token bucket."""
+        from communication import TokenBucket  # communication imports this module
+        comm = self.comm
+        bucket = TokenBucket(comm.command_rate, comm.command_burst)
+        while True:
+            command = await self._commands.get()
+            delay = bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            bucket.consume()
+            start_write_time = time.time()
+            comm._write_serial(command)
+            logging.debug(f"Command sent, queue size: {self._commands.qsize()}, "
+                          f"write took: {time.time() - start_write_time:.3f}s")
+
+    async def _housekeeping(self):
+        """Timed work the reader thread used to do between reads."""
+        comm = self.comm
+        while True:
+            await asyncio.sleep(HOUSEKEEPING_TICK)
+            self.loop_iterations += 1
+            now = time.monotonic()
+            if comm._batch and now - comm._batch_emitted_at >= comm.batch_interval:
+                comm._emit_batch()
+            for link in self.links:
+                if not link.failed and comm.timeout and now - link.last_rx >= comm.timeout:
+                    comm.stats.timeouts += 1  # reported in the rate-limited LinkStats summary
+                    logging.debug(f"Read timeout - no data received on {link.name}")
+                    link.last_rx = now
+            comm._check_commands()
+            comm._report_link_stats()
+            comm.log_writer.pump()
+            self._flush_events()
+
+    def _schedule_flush(self):
+        # One io_events emit for everything read during this loop iteration
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.loop.call_soon(self._flush_events)
+
+    def _flush_events(self):
+        self._flush_scheduled = False
+        events = self.comm._events
+        if not events:
+            return
+        self.comm._events = []
+        try:
+            self.comm.io_events.emit(events)
+        except Exception:
+            pass
@@ -0,0 +1,303 @@
+from binascii import crc_hqx
+import bisect
+import struct
+import logging
+
+CODECS = ('csv', 'binary')
+
+class LineFramer:
+    """Incremental newline framing over a reusable receive buffer.
+
+    Bytes are appended with `feed`, which returns every complete
+    newline-terminated frame and keeps any partial tail for the next call.
+    """
+
+    def __init__(self, max_buffer=65536):
+        self.buffer = bytearray()
+        self.max_buffer = max_buffer
+        self.overflows = 0
+
+    def feed(self, data):
+        buf = self.buffer
+        buf += data
+        end = buf.rfind(b'\n')
+        if end < 0:
+            # No terminator yet; drop runaway garbage so the buffer stays bounded
+            if len(buf) > self.max_buffer:
+                buf.clear()
+                self.overflows += 1
+            return []
+        frames = buf[:end].split(b'\n')
+        del buf[:end + 1]
+        return frames
+
+    def reset(self):
+        self.buffer.clear()
+
+def resync_csv(line: str, anchor: str, expected_fields: int):
+    """Split packets that were run together by a lost newline.
+
+    Every packet starts with `anchor` (the TEAM_ID), so a lost newline glues
+    the last field of one packet to the anchor of the next. Each occurrence
+    of "<anchor>," is tried as a packet start; it is accepted when the next
+    `expected_fields - 1` commas end right before the following accepted
+    start (or the end of the line). Returns (packets, skipped) where
+    `packets` are the recovered lines and `skipped` is the number of
+    unusable fragments in between.
+
+    Only works when the anchor is the first field. If TEAM_ID sits at
+    column k > 0, the lost newline joins the previous packet's last field
+    to the next packet's first field, k fields before the anchor. Without
+    a separator there is no reliable place to split that field.
+    """
+    token = anchor + ','
+    starts = []
+    pos = line.find(token)
+    while pos >= 0:
+        starts.append(pos)
+        pos = line.find(token, pos + 1)
+    commas = [i for i, ch in enumerate(line) if ch == ',']
+    packets = []
+    skipped = 0
+    covered = 0  # end of the text already accounted for
+    i = 0
+    while i < len(starts):
+        start = starts[i]
+        first = bisect.bisect_left(commas, start)
+        last = first + expected_fields - 2
+        if last >= len(commas):
+            break
+        # The last field runs up to the next candidate start after the final comma
+        j = bisect.bisect_right(starts, commas[last], i + 1)
+        end = starts[j] if j < len(starts) else len(line)
+        if last + 1 < len(commas) and commas[last + 1] < end:
+            i += 1  # too many fields: the anchor was inside another packet's data
+            continue
+        if start > covered:
+            skipped += 1
+        packets.append(line[start:end])
+        covered = end
+        i = j
+    if covered < len(line):
+        skipped += 1
+    return packets, skipped
+
+class CsvCodec:
+    """ASCII codec: one comma-separated UTF-8 line per packet.
+
+    `feed` returns raw lines (bytes); splitting and conversion are left to
+    the caller so malformed lines can still be shown and counted.
+    """
+    name = 'csv'
+    binary = False
+
+    def __init__(self, telemetry_fields: dict):
+        self.headers = list(telemetry_fields.keys())
+        self.framer = LineFramer()
+        self._errors_taken = 0
+
+    def feed(self, data):
+        return self.framer.feed(data)
+
+    def reset(self):
+        self.framer.reset()
+
+    def take_errors(self):
+        """Framing errors since the previous call (discarded receive buffers)."""
+        n = self.framer.overflows - self._errors_taken
+        self._errors_taken += n
+        return n
+
+    def encode(self, values) -> bytes:
+        return (','.join('' if v is None else str(v) for v in values) + '\n').encode('utf-8')
+
+class EnumField:
+    """Text field sent as an index into a fixed table of values.
+
+    A table entry ending in '#' takes a decimal argument: with "SIMP#" in
+    the table, "SIMP101325" is sent as a uint32 holding the entry index in
+    the top byte and 101325 in the low 24 bits. Tables without such entries
+    fit one byte. Values the table cannot represent are sent as the
+    reserved index 255 and decoded as '?'.
+    """
+    UNKNOWN = '?'
+    ARG_BITS = 24
+
+    def __init__(self, values):
+        self.values = [str(v) for v in values]
+        if len(self.values) >= 255:
+            raise ValueError("binary enum tables hold at most 254 values")
+        self.index = {v: i for i, v in enumerate(self.values) if not v.endswith('#')}
+        # Longest prefix first, so "SIMP#" wins over a shorter "SIM#"
+        self.prefixes = sorted(((v[:-1], i) for i, v in enumerate(self.values) if v.endswith('#')),
+                               key=lambda p: -len(p[0]))
+        self.shift = self.ARG_BITS if self.prefixes else 0
+        self.code = 'I' if self.prefixes else 'B'
+
+    def encode(self, value) -> int:
+        value = '' if value is None else str(value).strip()
+        idx = self.index.get(value)
+        if idx is not None:
+            return idx << self.shift
+        for prefix, idx in self.prefixes:
+            arg = value[len(prefix):]
+            if value.startswith(prefix) and arg.isdigit() and int(arg) < 1 << self.ARG_BITS:
+                return idx << self.shift | int(arg)
+        return 255 << self.shift
+
+    def decode(self, raw: int) -> str:
+        idx = raw >> self.shift
+        if idx >= len(self.values):
+            return self.UNKNOWN
+        value = self.values[idx]
+        if value.endswith('#'):
+            return value[:-1] + str(raw & ((1 << self.ARG_BITS) - 1))
+        return value
+
+class BinaryCodec:
+    """Struct-based framed binary codec described by the telemetry schema.
+
+    Frame layout (little endian)::
+
+        sync (A5 5A) | length (uint16) | payload | crc16 (uint16)
+
+    The payload packs every telemetry field in schema order using the
+    struct code from the `binaryFormat` config section; fields without one
+    default to float32 for numeric fields and a 16-byte string otherwise.
+    A list instead of a struct code makes the field an `EnumField` (one
+    byte, or a uint32 when entries take an argument).
+    The CRC is CRC-16/CCITT (crc_hqx, seed 0xFFFF) over the length
+    and payload. `feed` unpacks frames straight out of the receive buffer
+    with `struct.unpack_from` and returns one list of values per frame,
+    already converted (floats for numeric fields, str for the rest).
+    """
+    name = 'binary'
+    binary = True
+
+    SYNC = b'\xa5\x5a'
+    HEADER = struct.Struct('<2sH')
+    CRC = struct.Struct('<H')
+
+    def __init__(self, telemetry_fields: dict, binary_format: dict | None = None, max_buffer=65536):
+        binary_format = binary_format or {}
+        self.headers = list(telemetry_fields.keys())
+        codes = []
+        self.enums = []
+        for name, unit in telemetry_fields.items():
+            spec = binary_format.get(name) or ('f' if unit else '16s')
+            enum = EnumField(spec) if isinstance(spec, (list, tuple)) else None
+            self.enums.append(enum)
+            codes.append(enum.code if enum else spec)
+        self.codes = codes
+        self.struct = struct.Struct('<' + ''.join(codes))
+        self.payload_size = self.struct.size
+        # Whole frame in one struct so a packet is unpacked with a single call
+        self.frame = struct.Struct('<2sH' + ''.join(codes) + 'H')
+        self.frame_size = self.frame.size
+        if self.payload_size > 0xFFFF:
+            raise ValueError("binary telemetry payload does not fit a uint16 length")
+        # Post-unpack conversion fixed per column: decode strings and enums,
+        # floats for numeric fields, str() for integer-coded text fields
+        self._fixups = []
+        for idx, ((name, unit), code, enum) in enumerate(zip(telemetry_fields.items(), codes, self.enums)):
+            kind = code[-1]
+            if enum is not None:
+                self._fixups.append((idx, enum.decode))
+            elif kind == 's':
+                self._fixups.append((idx, _decode_text))
+            elif unit and kind not in 'fde':
+                self._fixups.append((idx, float))
+            elif not unit and kind not in 's':
+                self._fixups.append((idx, str))
+        self.buffer = bytearray()
+        self.max_buffer = max_buffer
+        self.crc_errors = 0
+        self.length_errors = 0
+        self._errors_taken = 0
+
+    def feed(self, data):
+        buf = self.buffer
+        buf += data
+        frames = []
+        append = frames.append
+        frame = self.frame
+        size = self.frame_size
+        sync = self.SYNC
+        fixups = self._fixups
+        pos = 0
+        n = len(buf)
+        view = memoryview(buf)
+        try:
+            while True:
+                if not buf.startswith(sync, pos):
+                    # Out of step: skip to the next sync word
+                    start = buf.find(sync, pos)
+                    if start < 0:
+                        # Keep a trailing byte that may be the first half of a sync word
+                        pos = max(pos, n - 1)
+                        break
+                    pos = start
+                if pos + size > n:
+                    if pos + self.HEADER.size <= n and self.HEADER.unpack_from(buf, pos)[1] != self.payload_size:
+                        self.length_errors += 1
+                        pos += 1
+                        continue
+                    break
+                fields = frame.unpack_from(buf, pos)
+                if fields[1] != self.payload_size:
+                    self.length_errors += 1
+                    pos += 1
+                    continue
+                if crc_hqx(view[pos + 2:pos + size - 2], 0xFFFF) != fields[-1]:
+                    self.crc_errors += 1
+                    pos += 1
+                    continue
+                values = list(fields[2:-1])
+                for idx, fix in fixups:
+                    values[idx] = fix(values[idx])
+                append(values)
+                pos += size
+        finally:
+            view.release()
+        del buf[:pos]
+        if len(buf) > self.max_buffer:
+            logging.warning(f"Binary receive buffer overflow, discarding {len(buf)} bytes")
+            buf.clear()
+        return frames
+
+    def reset(self):
+        self.buffer.clear()
+
+    def take_errors(self):
+        """Frames rejected (bad length or CRC) since the previous call."""
+        n = self.crc_errors + self.length_errors - self._errors_taken
+        self._errors_taken += n
+        return n
+
+    def encode(self, values) -> bytes:
+        """Pack one packet (values in schema order) into a complete frame."""
+        packed = []
+        for code, enum, val in zip(self.codes, self.enums, values):
+            kind = code[-1]
+            if enum is not None:
+                packed.append(enum.encode(val))
+            elif kind == 's':
+                packed.append(str(val if val is not None else '').encode('utf-8'))
+            elif kind in 'fde':
+                packed.append(float(val or 0))
+            else:
+                packed.append(int(float(val or 0)))
+        body = self.HEADER.pack(self.SYNC, self.payload_size) + self.struct.pack(*packed)
+        crc = crc_hqx(body[2:], 0xFFFF)
+        return body + self.CRC.pack(crc)
+
+def _decode_text(raw: bytes) -> str:
+    return raw.rstrip(b'\x00').decode('utf-8', errors='ignore')
+
+def make_codec(name: str, telemetry_fields: dict, binary_format: dict | None = None):
+    """Build the packet codec selected for a session."""
+    if name == 'csv':
+        return CsvCodec(telemetry_fields)
+    if name == 'binary':
+        return BinaryCodec(telemetry_fields, binary_format)
+    raise ValueError(f"Unknown codec {name!r}, expected one of {CODECS}")
@@ -0,0 +1,200 @@
+import csv
+import json
+import os
+import time
+import logging
+import numpy as np
+from replay import parse_mission_time
+
+COLUMN_DTYPE = np.dtype('<f8')
+COLUMN_SUFFIX = '.f64'
+SCHEMA_FILE = 'schema.json'
+TEXT_FILE = 'text.csv'
+# MISSION_TIME is also stored as seconds so time windows can be found without text parsing
+TIME_FIELD = 'MISSION_TIME'
+TIME_COLUMN = 'MISSION_TIME_S'
+
+def _to_float(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return np.nan
+
+class ColumnStore:
+    """Columnar recording sink: one directory per session, one file per column.
+
+    Each numeric (unit-bearing) telemetry field is appended as raw
+    little-endian float64 to `<FIELD>.f64`, so a reader can memory-map a
+    single column of a long mission without touching the others. Text
+    fields go to `text.csv` in the same directory, which keeps the session
+    lossless. `schema.json` records the field order, units and row count.
+
+    Every `open` starts a new session directory under `base_dir`; nothing
+    is ever overwritten because the telemetry header changed. Used as a
+    sink of `CsvLogWriter`, so all methods run on the writer thread.
+    """
+
+    def __init__(self, base_dir, telemetry_fields: dict):
+        self.base_dir = base_dir
+        self.telemetry_fields = dict(telemetry_fields)
+        headers = list(self.telemetry_fields.keys())
+        self.numeric_fields = [f for f, unit in self.telemetry_fields.items() if unit]
+        self.numeric_indices = [headers.index(f) for f in self.numeric_fields]
+        self.text_fields = [f for f, unit in self.telemetry_fields.items() if not unit]
+        self.text_indices = [headers.index(f) for f in self.text_fields]
+        self.time_index = headers.index(TIME_FIELD) if TIME_FIELD in headers else None
+        self.session_dir = None
+        self.rows = 0
+        self._files = {}
+        self._text_file = None
+        self._text_writer = None
+
+    @property
+    def columns(self):
+        """Names of the float64 column files, in schema order."""
+        extra = [TIME_COLUMN] if self.time_index is not None else []
+        return self.numeric_fields + extra
+
+    ## Sink interface ##
+
+    def open(self):
+        name = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self.base_dir, name)
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.base_dir, f"{name}-{suffix}")
+        os.makedirs(path)
+        self.session_dir = path
+        self.rows = 0
+        self.started = time.time()
+        self._open_files('wb')
+        self._write_schema()
+        logging.info(f"Recording columnar session to {path}")
+
+    def _open_files(self, mode):
+        self._files = {name: open(os.path.join(self.session_dir, name + COLUMN_SUFFIX), mode)
+                       for name in self.columns}
+        self._text_file = open(os.path.join(self.session_dir, TEXT_FILE), mode[0], newline='')
+        self._text_writer = csv.writer(self._text_file)
+        if mode[0] == 'w':
+            self._text_writer.writerow(self.text_fields)
+
+    def write_rows(self, rows):
+        if not rows or self.session_dir is None:
+            return
+        idx = self.numeric_indices
+        block = [[row[i] for i in idx] for row in rows]
+        try:
+            values = np.array(block, dtype=COLUMN_DTYPE)
+        except (ValueError, TypeError):
+            # A bad value somewhere in the batch: convert one cell at a time
+            values = np.array([[_to_float(v) for v in r] for r in block], dtype=COLUMN_DTYPE)
+        values = values.reshape(len(rows), len(idx))
+        for j, name in enumerate(self.numeric_fields):
+            self._files[name].write(values[:, j].tobytes())
+        if self.time_index is not None:
+            seconds = [parse_mission_time(str(row[self.time_index])) for row in rows]
+            times = np.array([np.nan if s is None else s for s in seconds], dtype=COLUMN_DTYPE)
+            self._files[TIME_COLUMN].write(times.tobytes())
+        self._text_writer.writerows([row[i] for i in self.text_indices] for row in rows)
+        self.rows += len(rows)
+
+    def flush(self, sync=False):
+        if self.session_dir is None:
+            return
+        for f in self._all_files():
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        self._write_schema()
+
+    def reset(self):
+        """Discard the rows recorded so far in the current session."""
+        if self.session_dir is None:
+            return
+        is_open = bool(self._files)
+        self._close_files()
+        self.rows = 0
+        self._open_files('wb')
+        self._write_schema()
+        if not is_open:
+            self._close_files()
+
+    def close(self):
+        if self.session_dir is None or not self._files:
+            return
+        self.flush(sync=True)
+        self._close_files()
+
+    def _all_files(self):
+        files = list(self._files.values())
+        if self._text_file is not None:
+            files.append(self._text_file)
+        return files
+
+    def _close_files(self):
+        for f in self._all_files():
+            f.close()
+        self._files = {}
+        self._text_file = None
+        self._text_writer = None
+
+    def _write_schema(self):
+        schema = {
+            "fields": self.telemetry_fields,
+            "columns": self.columns,
+            "text_fields": self.text_fields,
+            "dtype": COLUMN_DTYPE.str,
+            "rows": self.rows,
+            "started": self.started,
+            "updated": time.time(),
+        }
+        tmp = os.path.join(self.session_dir, SCHEMA_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(schema, f, indent=4)
+        os.replace(tmp, os.path.join(self.session_dir, SCHEMA_FILE))
+
+class ColumnReader:
+    """Read-only access to one recorded columnar session."""
+
+    def __init__(self, session_dir):
+        self.session_dir = session_dir
+        with open(os.path.join(session_dir, SCHEMA_FILE)) as f:
+            self.schema = json.load(f)
+        self.columns = self.schema["columns"]
+        self.fields = self.schema["fields"]
+
+    def __len__(self):
+        """Rows present in every column (a live session may be mid-append)."""
+        return min((self._rows_on_disk(name) for name in self.columns), default=0)
+
+    def _rows_on_disk(self, name):
+        path = os.path.join(self.session_dir, name + COLUMN_SUFFIX)
+        return os.path.getsize(path) // COLUMN_DTYPE.itemsize
+
+    def column(self, name):
+        """Memory-map one column without reading any other file."""
+        if name not in self.columns:
+            raise KeyError(f"{name} is not a column of {self.session_dir}")
+        rows = self._rows_on_disk(name)
+        if rows == 0:
+            return np.empty(0, dtype=COLUMN_DTYPE)
+        path = os.path.join(self.session_dir, name + COLUMN_SUFFIX)
+        return np.memmap(path, dtype=COLUMN_DTYPE, mode='r', shape=(rows,))
+
+    def text_rows(self):
+        """Iterate over the text fields, one list per row (header excluded)."""
+        with open(os.path.join(self.session_dir, TEXT_FILE), newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            yield from reader
+
+def list_sessions(base_dir):
+    """Session directories under `base_dir`, oldest first."""
+    try:
+        names = sorted(os.listdir(base_dir))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(base_dir, n) for n in names
+            if os.path.isfile(os.path.join(base_dir, n, SCHEMA_FILE))]
@@ -0,0 +1,253 @@
+import bisect
+import threading
+import time
+from collections import deque
+
+DEFAULT_ACK_TIMEOUT = 2.0  # seconds without a matching CMD_ECHO before a retry
+DEFAULT_MAX_RETRIES = 2
+# Upper bounds (ms) of the round-trip histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+def expected_echo(command):
+    """The CMD_ECHO value the payload reports for `command`:
+    "CMD,3195,CX,ON" is echoed back as "CXON"."""
+    parts = command.strip().split(',')
+    if len(parts) > 2 and parts[0] == 'CMD':
+        return ''.join(parts[2:])
+    return ','.join(parts)
+
+def command_kind(command):
+    """"CMD,3195,SIMP,101325" -> "SIMP"; a newer command of the same kind
+    supersedes an unacknowledged older one instead of both being retried."""
+    parts = command.strip().split(',')
+    return parts[2] if len(parts) > 2 and parts[0] == 'CMD' else command.strip()
+
+class TrackedCommand:
+    """One command from queueing to acknowledgement (or giving up)."""
+
+    __slots__ = ('id', 'command', 'expected', 'kind', 'state', 'queued_at', 'sent_at',
+                 'attempts', 'echo_at_send', 'rtt', 'ambiguous')
+
+    def __init__(self, tag, command, queued_at):
+        self.id = tag
+        self.command = command
+        self.expected = expected_echo(command)
+        self.kind = command_kind(command)
+        self.state = 'queued'      # queued -> sent -> acked / failed / superseded
+        self.queued_at = queued_at
+        self.sent_at = None
+        self.attempts = 0
+        self.echo_at_send = None
+        self.rtt = None            # seconds from the last write to the matching echo
+        self.ambiguous = False
+
+    def as_dict(self):
+        return {'id': self.id, 'command': self.command, 'expected': self.expected,
+                'state': self.state, 'attempts': self.attempts,
+                'rtt_ms': None if self.rtt is None else self.rtt * 1e3,
+                'ambiguous': self.ambiguous}
+
+class CommandTracker:
+    """Matches sent commands against the CMD_ECHO telemetry field.
+
+    Communication tags each command when it is queued (`queued`), stamps
+    it when it is written (`sent`) and feeds the CMD_ECHO of every packet
+    to `observe`. The oldest outstanding command whose expected echo
+    matches is acknowledged and its round trip (write to echo) goes into a
+    fixed-bucket latency histogram. `expire` returns the commands that
+    waited longer than `timeout` to be written again, up to `max_retries`
+    times, after which they count as failed.
+
+    CMD_ECHO keeps its value until the next command, so a command equal to
+    the one the payload last echoed cannot be told apart from the old echo:
+    it is acknowledged by the first packet after the write and flagged
+    `ambiguous`, and its round trip is left out of the histogram.
+
+    All methods are thread-safe (commands are queued from the GUI, written
+    by the sender and acknowledged by the reader).
+    """
+
+    def __init__(self, timeout=DEFAULT_ACK_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 buckets_ms=LATENCY_BUCKETS_MS):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending = deque()  # TrackedCommand in queue order, not yet acked/failed
+        self.echo = None         # last CMD_ECHO value seen
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.histogram = [0] * (len(self.buckets_ms) + 1)
+        self.acked = 0
+        self.failed = 0
+        self.retries = 0
+        self.superseded = 0
+        self.ambiguous = 0
+        self.rtt_min = None
+        self.rtt_max = None
+        self.rtt_last = None
+        self._rtt_total = 0.0
+
+    ## Command side ##
+
+    def queued(self, command, now=None):
+        """Tag a command that was just put on the send queue."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._next_id += 1
+            tracked = TrackedCommand(self._next_id, command, now)
+            self._pending.append(tracked)
+            return tracked
+
+    def sent(self, command, now=None):
+        """Stamp the oldest queued entry for `command` as written to the port
+        (a write that failed is retried like any unacknowledged command)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for tracked in self._pending:
+                if tracked.state == 'queued' and tracked.command == command:
+                    break
+            else:
+                return None  # not queued through the tracker
+            tracked.state = 'sent'
+            tracked.sent_at = now
+            tracked.attempts += 1
+            tracked.echo_at_send = self.echo
+            # An unacknowledged older command of the same kind is obsolete now
+            for older in self._pending:
+                if older is tracked:
+                    break
+                if older.state == 'sent' and older.kind == tracked.kind:
+                    older.state = 'superseded'
+                    self.superseded += 1
+            self._prune()
+            return tracked
+
+    def dropped(self, command, newest=True):
+        """A queued entry for `command` was never written: it did not fit on the
+        queue (the newest entry), or the queue was cleared or the write failed
+        (newest=False, the oldest entry). Counted as failed."""
+        with self._lock:
+            for tracked in (reversed(self._pending) if newest else list(self._pending)):
+                if tracked.state == 'queued' and tracked.command == command:
+                    tracked.state = 'failed'
+                    self.failed += 1
+                    self._prune()
+                    return tracked
+        return None
+
+    ## Telemetry side ##
+
+    def observe(self, echo, now=None):
+        """Feed one packet's CMD_ECHO; returns the commands it acknowledged."""
+        if echo is None:
+            return []
+        echo = str(echo).strip()
+        with self._lock:
+            changed = echo != self.echo
+            self.echo = echo
+            if not self._pending:
+                return []
+            now = time.monotonic() if now is None else now
+            acked = []
+            for tracked in self._pending:
+                if tracked.state != 'sent' or tracked.expected != echo:
+                    continue
+                if not changed and tracked.echo_at_send != echo:
+                    continue  # already-acked echo still showing; not this write's answer
+                tracked.state = 'acked'
+                tracked.rtt = now - tracked.sent_at
+                tracked.ambiguous = tracked.echo_at_send == echo
+                self._record(tracked)
+                acked.append(tracked)
+                break  # one echo acknowledges one command
+            if acked:
+                self._prune()
+            return acked
+
+    def expire(self, now=None):
+        """Handle commands whose echo is overdue.
+
+        Returns (retry, failed): commands to write again, and commands that
+        ran out of retries.
+        """
+        now = time.monotonic() if now is None else now
+        retry, failed = [], []
+        with self._lock:
+            for tracked in self._pending:
+                if tracked.state != 'sent' or now - tracked.sent_at < self.timeout:
+                    continue
+                if tracked.attempts > self.max_retries:
+                    tracked.state = 'failed'
+                    self.failed += 1
+                    failed.append(tracked)
+                else:
+                    tracked.state = 'queued'
+                    self.retries += 1
+                    retry.append(tracked)
+            if failed:
+                self._prune()
+        return retry, failed
+
+    def _record(self, tracked):
+        self.acked += 1
+        if tracked.ambiguous:
+            self.ambiguous += 1
+            return
+        rtt = tracked.rtt
+        self.histogram[bisect.bisect_left(self.buckets_ms, rtt * 1e3)] += 1
+        self._rtt_total += rtt
+        self.rtt_last = rtt
+        self.rtt_min = rtt if self.rtt_min is None else min(self.rtt_min, rtt)
+        self.rtt_max = rtt if self.rtt_max is None else max(self.rtt_max, rtt)
+
+    def _prune(self):
+        while self._pending and self._pending[0].state in ('acked', 'failed', 'superseded'):
+            self._pending.popleft()
+        if any(t.state in ('acked', 'failed', 'superseded') for t in self._pending):
+            self._pending = deque(t for t in self._pending if t.state in ('queued', 'sent'))
+
+    ## Reporting ##
+
+    @property
+    def outstanding(self):
+        """Commands queued or sent and not yet acknowledged."""
+        with self._lock:
+            return len(self._pending)
+
+    def percentile(self, fraction):
+        """Approximate round-trip percentile (ms) from the histogram: the upper
+        bound of the bucket holding it, None if nothing was measured or it
+        falls in the open last bucket."""
+        total = sum(self.histogram)
+        if not total:
+            return None
+        target = fraction * total
+        seen = 0
+        for bound, count in zip(self.buckets_ms, self.histogram):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            measured = sum(self.histogram)
+            return {
+                'outstanding': len(self._pending),
+                'awaiting_ack': sum(1 for t in self._pending if t.state == 'sent'),
+                'acked': self.acked,
+                'failed': self.failed,
+                'retries': self.retries,
+                'superseded': self.superseded,
+                'ambiguous': self.ambiguous,
+                'rtt_last_ms': None if self.rtt_last is None else self.rtt_last * 1e3,
+                'rtt_mean_ms': self._rtt_total / measured * 1e3 if measured else None,
+                'rtt_min_ms': None if self.rtt_min is None else self.rtt_min * 1e3,
+                'rtt_max_ms': None if self.rtt_max is None else self.rtt_max * 1e3,
+                'rtt_p50_ms': self.percentile(0.5),
+                'rtt_p95_ms': self.percentile(0.95),
+                'histogram': list(zip(self.buckets_ms + (None,), self.histogram)),
+            }
@@ -5,17 +5,82 @@ import threading
 import queue
 import logging
 import shutil
+import os
 from data import Data
+from packetParser import PacketParser
+from csvLogger import CsvLogWriter, NullLogWriter
+from columnStore import ColumnStore
+from logRotation import RotatingCsvSink, export_segments
+from replay import ReplaySource
+from codec import make_codec, resync_csv, CODECS
+from linkStats import LinkStats
+from commandTracker import CommandTracker, DEFAULT_ACK_TIMEOUT, DEFAULT_MAX_RETRIES
+from linkSupervisor import (LinkSupervisor, port_present, CONNECTED, RECONNECTING,
+                            DEFAULT_RECONNECT_INITIAL, DEFAULT_RECONNECT_MAX)
+from transport import open_transport
+from asyncCore import AsyncIOCore
 from PyQt5.QtCore import QObject, pyqtSignal
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+READ_MODES = ('readline', 'chunked')
+IO_BACKENDS = ('threads', 'asyncio')
+
+# Queued by stop_communication to wake a sender blocked on an empty queue
+_STOP_SENDING = object()
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, up to `burst` saved up."""
+
+    def __init__(self, rate=1.0, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def delay(self):
+        """Seconds until one token is available (0 if one is available now)."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
 class Communication(QObject):
-    telemetry_received = pyqtSignal(dict)
+    telemetry_received = pyqtSignal(object)  # dict, tuple or TelemetryRecord (see record_format)
     lastPacketRecieved = pyqtSignal(str)
+    telemetry_batch = pyqtSignal(list, list)  # packets, receive timestamps
+    link_stats = pyqtSignal(dict)  # LinkStats.snapshot(), every stats_interval seconds
+    link_state = pyqtSignal(str, str)  # port, 'connected' / 'disconnected' / 'reconnecting'
+    link_outage = pyqtSignal(dict)  # Outage.as_dict() once a dropped link is back
+    command_status = pyqtSignal(dict)  # TrackedCommand.as_dict() when acknowledged or given up
+    replay_finished = pyqtSignal(str)  # log file, when a replay without loop reaches its end
+    # asyncio backend: everything one loop iteration produced, as [(signal name, args)],
+    # re-emitted on the GUI thread by _dispatch_events
+    io_events = pyqtSignal(list)
 
-    def __init__(self, serial_port, baud_rate=115200, timeout=4, csv_filename='data.csv'):
+    def __init__(self, serial_port, baud_rate=115200, timeout=4, csv_filename='data.csv',
+                 read_mode='readline', read_chunk_size=4096, record_format='dict',
+                 log_flush_rows=100, log_flush_interval=1.0, log_queue_size=10000,
+                 command_rate=1.0, command_burst=1, batch_interval=0, batch_size=50,
+                 codec='csv', stats_interval=1.0, stats_summary_interval=10.0,
+                 column_store=None, log_dir=None, log_rotate_mb=None, log_rotate_minutes=None,
+                 log_compression=None, io_backend='threads', extra_ports=(), reconnect=True,
+                 reconnect_initial=DEFAULT_RECONNECT_INITIAL, reconnect_max=DEFAULT_RECONNECT_MAX,
+                 command_ack_timeout=DEFAULT_ACK_TIMEOUT, command_retries=DEFAULT_MAX_RETRIES):
         QObject.__init__(self)
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unknown read mode {read_mode!r}, expected one of {READ_MODES}")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}, expected one of {CODECS}")
+        if io_backend not in IO_BACKENDS:
+            raise ValueError(f"Unknown I/O backend {io_backend!r}, expected one of {IO_BACKENDS}")
         self.sim_thread = None
         self.serial_port = serial_port
         self.baud_rate = baud_rate
@@ -25,47 +90,150 @@ class Communication(QObject):
         self.csv_filename = csv_filename
         self.receivedPacketCount = 0
         self.lastPacket = ""
+        self._last_values = None  # newest binary packet not yet formatted into lastPacket
+        self._partial_line = b''  # readline mode: start of a line cut short by the read timeout
         self.command_queue = queue.Queue(maxsize=100)
         self.read_thread = None
         self.send_thread = None
         self.simulation = False
         self.simEnabled = False
         self.simulation_state_callback = lambda state: None
+        # 'readline' reads one packet per call; 'chunked' drains in_waiting
+        # in bulk and frames lines itself (much cheaper at high packet rates)
+        self.read_mode = read_mode
+        self.read_chunk_size = read_chunk_size
+        self.record_format = record_format
+        # Packet codec for the session: 'csv' lines or framed 'binary' packets
+        # (binary frames have no newline, so they are always read chunked)
+        self.codec_name = codec
+        if codec == 'binary':
+            self.read_mode = 'chunked'
+        # Outgoing commands are paced by a token bucket (commands/sec + burst)
+        self.command_rate = command_rate
+        self.command_burst = command_burst
+        # Sent commands are matched against the CMD_ECHO field for round-trip
+        # latency, and written again if no echo arrives in time
+        self.command_tracker = CommandTracker(command_ack_timeout, command_retries)
+        self._stop_event = threading.Event()
+        # Optional batched delivery: when batch_interval (seconds) is set, packets
+        # are collected and emitted through telemetry_batch at most once per
+        # interval, or as soon as batch_size packets are waiting
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self._batch = []
+        self._batch_times = []
+        self._batch_emitted_at = 0.0
+        # Link quality counters; bad packets are reported in rate-limited
+        # summaries instead of one log line each
+        self.stats = LinkStats(summary_interval=stats_summary_interval)
+        self.stats_interval = stats_interval
+        self._stats_emitted_at = 0.0
+        self._team_id = None  # TEAM_ID of the last good packet, used to resync
+        # Rows are not logged while replaying a recorded file
+        self.log_enabled = True
+        self.replay = None
+        # Deliver (packet, raw row) pairs instead of packets, so whoever merges
+        # this link's output (IngestManager) can log exactly what was received
+        self.deliver_rows = False
+        # 'threads' runs the reader/sender thread pair; 'asyncio' runs every link,
+        # the command queue and the log writer in one event loop (asyncCore.py)
+        self.io_backend = io_backend
+        self.io_core = None
+        # Further links (e.g. a second radio or a relay socket) read alongside
+        # `ser`; the asyncio backend opens them on start and closes them on stop
+        self.extra_ports = list(extra_ports)
+        self._events = None    # set by the asyncio backend to collect signal emissions
+        # A port that fails while reading (e.g. an unplugged USB radio) is
+        # reopened with exponential backoff instead of ending the session
+        self.reconnect = reconnect
+        self.reconnect_initial = reconnect_initial
+        self.reconnect_max = reconnect_max
+        self.supervisor = LinkSupervisor(reconnect_initial, reconnect_max)
+        try:
+            # Emitted from the loop thread, so Qt queues it to this object's (GUI) thread
+            self.io_events.connect(self._dispatch_events)
+        except Exception:
+            pass
 
         # Load telemetry fields using Data interface
         self.data_manager = Data()
         self.loadTelemetryFields()
 
         try:
-            self.ser = serial.Serial(self.serial_port, self.baud_rate, timeout=self.timeout)
-            # Set a short write timeout to prevent blocking
-            self.ser.write_timeout = 0.1
+            self.open_port()
         except serial.SerialException as e:
             logging.error(f"Failed to open serial port {self.serial_port}: {e}")
             self.ser = None
 
-        # Ensure CSV header matches current telemetry headers. If the existing
-        # header differs (or file is missing/empty), reset the CSV with the
-        # correct header so subsequent runs use the updated format.
-        existing_header = None
-        try:
-            with open(self.csv_filename, mode='r', newline='') as f:
-                reader = csv.reader(f)
-                existing_header = next(reader, None)
-        except FileNotFoundError:
+        # With a log_dir, rows go to rotating (optionally compressed) segment
+        # files listed in log_dir/index.json instead of the single csv_filename
+        self.log_dir = log_dir
+        primary = None
+        if log_dir:
+            primary = RotatingCsvSink(log_dir, self.telemetryHeaders,
+                                      max_bytes=int(log_rotate_mb * 1e6) if log_rotate_mb else None,
+                                      max_seconds=log_rotate_minutes * 60 if log_rotate_minutes else None,
+                                      compression=log_compression)
+        elif csv_filename:
+            # Ensure CSV header matches current telemetry headers. If the existing
+            # header differs (or file is missing/empty), reset the CSV with the
+            # correct header so subsequent runs use the updated format.
             existing_header = None
+            try:
+                with open(self.csv_filename, mode='r', newline='') as f:
+                    reader = csv.reader(f)
+                    existing_header = next(reader, None)
+            except FileNotFoundError:
+                existing_header = None
+
+            if existing_header != self.telemetryHeaders:
+                # Overwrite the file with the new header (this resets data.csv)
+                with open(self.csv_filename, mode='w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(self.telemetryHeaders)
 
-        if existing_header != self.telemetryHeaders:
-            # Overwrite the file with the new header (this resets data.csv)
-            with open(self.csv_filename, mode='w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(self.telemetryHeaders)
+        # Optional typed recording: one directory per session under column_store,
+        # one float64 file per numeric field (see columnStore.py)
+        self.column_store = None
+        sinks = []
+        if column_store:
+            self.column_store = ColumnStore(column_store, self.data_manager.getTelemetryFields())
+            sinks.append(self.column_store)
+
+        # Rows are written by a dedicated thread so file I/O stays off the receive path
+        if csv_filename or log_dir:
+            self.log_writer = CsvLogWriter(self.csv_filename, self.telemetryHeaders,
+                                           max_queue=log_queue_size, flush_rows=log_flush_rows,
+                                           flush_interval=log_flush_interval, sinks=sinks,
+                                           primary=primary)
+        else:
+            # csv_filename=None: a link that logs nothing (see IngestManager)
+            self.log_writer = NullLogWriter()
+            self.log_enabled = False
+
+    def open_port(self):
+        """Open `serial_port`: a serial device, or a tcp://, udp://, pty:// or
+        loop:// URL (see transport.py). Raises serial.SerialException."""
+        self.ser = open_transport(self.serial_port, self.baud_rate, self.timeout,
+                                  telemetry_fields=self.data_manager.getTelemetryFields(),
+                                  encode=self.codec.encode if self.codec.binary else None)
+        # Set a short write timeout to prevent blocking
+        self.ser.write_timeout = 0.1
+        return self.ser
 
     def start_communication(self, signal_emitter):
         if self.ser is None:
             print("Serial port is not available.")
             return
         self.reading = True
+        self._stop_event.clear()
+        if self.io_backend == 'asyncio':
+            self.io_core = AsyncIOCore(self)
+            self.io_core.start()
+            return
+        if self.extra_ports:
+            logging.warning("extra_ports are only read by the asyncio I/O backend")
+        self.log_writer.start()
         self.read_thread = threading.Thread(target=self.read, args=(signal_emitter,))
         self.send_thread = threading.Thread(target=self.send_commands)
         self.read_thread.start()
@@ -74,129 +242,451 @@ class Communication(QObject):
     def read(self, signal_emitter):
         print(f"Serial port {self.serial_port} opened successfully.")
         expected_fields = len(self.telemetryHeaders)  # Fixed number of expected CSV columns
-        
-        with open(self.csv_filename, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            while self.reading:
-                try:
-                    # Read a full newline-terminated line (blocks until \n or timeout)
-                    raw_line = self.ser.readline()
-                    if not raw_line:
-                        # Timeout occurred (no data for 'timeout' seconds)
-                        logging.warning("Read timeout - no data received")
-                        continue
-                    # Decode to string and strip whitespace/newlines
-                    line = raw_line.decode('utf-8', errors='ignore').strip()
-                    if not line:
-                        continue  # Empty line, skip
-                    self.lastPacket = line
-                    try:
-                        self.lastPacketRecieved.emit(line)
-                    except Exception:
-                        pass
-                    csv_data = line.split(',')
-                    if len(csv_data) != expected_fields:
-                        logging.warning(f"Incomplete/malformed packet (expected {expected_fields} fields, got {len(csv_data)}): {line}")
-                        continue  # Drop invalid packets
-                    self.receivedPacketCount += 1
-                    packet = self.parse_csv_data(line)
-                    try:
-                        if packet is not None:
-                            self.telemetry_received.emit(packet)
-                    except Exception:
-                        pass
-                    # Write raw row to CSV
-                    writer.writerow(csv_data)
-                    
-                except serial.SerialException as e:
-                    print(f"Serial error: {e}")
-                    break  # Or handle reconnection if needed
-                except Exception as e:
-                    print(f"Error: {e}")
+        self.codec.reset()
+        self.stats.reset()
+        self._partial_line = b''
+        saved_timeout = self._bound_read_timeout()
+        last_rx = time.monotonic()
+
+        while self.reading:
+            try:
+                frames = self._read_frames()
+                if frames is None and self._replay_done():
+                    self._finish_replay(self.codec, expected_fields)
+                    break
+                if frames is None:
+                    # Nothing arrived within the (batch-bounded) read timeout:
+                    # deliver the pending batch now instead of on the next byte
+                    if self._batch:
+                        self._emit_batch()
+                    if time.monotonic() - last_rx >= self.timeout:
+                        # Reported in the rate-limited LinkStats summary
+                        self.stats.timeouts += 1
+                        logging.debug("Read timeout - no data received")
+                        last_rx = time.monotonic()
+                    self._check_commands()
+                    self._report_link_stats()
+                    continue
+                last_rx = time.monotonic()
+                self._process_frames(frames, self.codec, expected_fields)
+
+            except serial.SerialException as e:
+                print(f"Serial error: {e}")
+                if not self.reconnect or self.replay is not None or not self._reconnect(e):
+                    break
+                saved_timeout = self._bound_read_timeout()
+                last_rx = time.monotonic()
+            except Exception as e:
+                print(f"Error: {e}")
+        self._emit_batch()
+        self._report_link_stats(force=True)
+        if self.ser is not None and saved_timeout is not None:
+            self.ser.timeout = saved_timeout
+
+    def _replay_done(self):
+        """True once a replay without loop has handed out its last line; the
+        GUI then calls stop_replay (from the replay_finished signal)."""
+        replay = self.replay
+        return replay is not None and self.ser is replay and replay.finished and not replay.loop
+
+    def _finish_replay(self, codec, expected_fields):
+        """Deliver the log's last line if it has no trailing newline (held by
+        the codec or, in readline mode, in _partial_line), then signal the end."""
+        if not codec.binary:
+            frames = codec.feed(self._partial_line + b'\n')
+            self._partial_line = b''
+            self._process_frames(frames, codec, expected_fields)
+        self._emit('replay_finished', self.replay.filename)
+
+    def _bound_read_timeout(self):
+        """With batching on, cap the port's read timeout at batch_interval so a
+        batch is delivered on time even when the link goes quiet. Returns the
+        port's own timeout, restored when reading ends."""
+        saved = getattr(self.ser, 'timeout', None)
+        if self.batch_interval and saved is not None and saved > self.batch_interval:
+            self.ser.timeout = self.batch_interval
+        return saved
+
+    def _reconnect(self, error):
+        """Reopen the port with exponential backoff after `error`.
+
+        Returns True once the port is open again, False if reading was
+        stopped first. The log writer keeps running throughout, so rows
+        resume in the same log session, and the missed PACKET_COUNTs show
+        up as `missing` in the link stats.
+        """
+        supervisor = self.supervisor
+        port = self.serial_port
+        supervisor.disconnected(port, error)
+        self._emit('link_state', port, supervisor.state)
+        self._emit_batch()
+        self._report_link_stats(force=True)
+        try:
+            self.ser.close()
+        except Exception:
+            pass
+        while self.reading:
+            if self._stop_event.wait(supervisor.next_delay()):
+                return False
+            if not port_present(port):
+                continue  # device not back yet
+            if supervisor.state != RECONNECTING:
+                supervisor.state = RECONNECTING
+                self._emit('link_state', port, supervisor.state)
+            try:
+                self.open_port()
+            except serial.SerialException as e:
+                logging.debug(f"Reopening {port} failed: {e}")
+                continue
+            self.codec.reset()  # drop the partial frame from before the outage
+            self._partial_line = b''
+            outage = supervisor.reconnected()
+            logging.warning(f"Link {port} reconnected after {outage.duration:.1f}s "
+                            f"({outage.attempts} attempts)")
+            self._emit('link_state', port, CONNECTED)
+            self._emit('link_outage', outage.as_dict())
+            return True
+        return False
+
+    def _read_frames(self):
+        """Return the complete frames available from the port, or None on timeout.
+
+        CSV frames are raw lines (bytes); binary frames are decoded value tuples.
+        """
+        if self.read_mode == 'chunked':
+            feed_to = getattr(self.ser, 'feed_to', None)
+            if feed_to is not None:
+                # Socket/pty transports hand the codec their receive buffer
+                n, frames = feed_to(self.codec)
+                return frames if n else None
+            # Block for the first byte (up to 'timeout'), then drain whatever
+            # the driver has buffered in one call instead of byte-by-byte.
+            data = self.ser.read(max(self.ser.in_waiting, 1))
+            if not data:
+                return None
+            waiting = self.ser.in_waiting
+            if waiting:
+                data += self.ser.read(min(waiting, self.read_chunk_size))
+            return self.codec.feed(data)
+        # Read a full newline-terminated line (blocks until \n or timeout)
+        raw_line = self.ser.readline()
+        if not raw_line:
+            return None
+        if not raw_line.endswith(b'\n'):
+            # The timeout cut the line short: keep it for the next read
+            self._partial_line += raw_line
+            return []
+        if self._partial_line:
+            raw_line, self._partial_line = self._partial_line + raw_line, b''
+        return [raw_line]
+
+    def _process_frames(self, frames, codec, expected_fields):
+        """Handle the frames from one read, then flush the batch/stats if due."""
+        if codec.binary:
+            for values in frames:
+                self._handle_values(values)
+        else:
+            for raw_line in frames:
+                self._handle_line(raw_line, expected_fields)
+        self.stats.malformed += codec.take_errors()
+        if self._batch and time.monotonic() - self._batch_emitted_at >= self.batch_interval:
+            self._emit_batch()
+        self._check_commands()
+        self._report_link_stats()
+
+    def _handle_line(self, raw_line, expected_fields):
+        # Decode to string and strip whitespace/newlines
+        line = raw_line.decode('utf-8', errors='ignore').strip()
+        if not line:
+            return  # Empty line, skip
+        self.lastPacket = line
+        self._last_values = None
+        if not self.batch_interval:
+            self._emit('lastPacketRecieved', line)
+        csv_data = line.split(',')
+        if len(csv_data) != expected_fields:
+            self._resync_line(line, csv_data, expected_fields)
+            return
+        self._accept_fields(csv_data)
+
+    def _resync_line(self, line, csv_data, expected_fields):
+        """Recover packets from a line with the wrong field count, or count it malformed."""
+        if len(csv_data) < expected_fields or not self._resync:
+            self.stats.malformed += 1
+            return
+        anchor = self._team_id or csv_data[self._team_id_index]
+        if not anchor:
+            self.stats.malformed += 1
+            return
+        packets, skipped = resync_csv(line, anchor, expected_fields)
+        self.stats.malformed += skipped
+        for packet in packets:
+            self.stats.recovered += 1
+            self._accept_fields(packet.split(','))
+
+    def _accept_fields(self, csv_data):
+        """Count, log, sequence-check and deliver one well-formed CSV packet."""
+        self.receivedPacketCount += 1
+        # Hand the raw row to the CSV log writer thread; the log keeps
+        # everything received, repeats included
+        if self.log_enabled:
+            self.log_writer.write(csv_data)
+        if not self._check_sequence(csv_data):
+            return  # duplicate: counted in LinkStats, not delivered
+        self.stats.valid += 1
+        if self._team_id_index is not None:
+            self._team_id = csv_data[self._team_id_index]
+        if self._cmd_echo_index is not None:
+            self._observe_echo(csv_data[self._cmd_echo_index])
+        packet = self.parse_csv_data(csv_data)
+        if packet is not None:
+            self._deliver((packet, csv_data) if self.deliver_rows else packet)
+
+    def _check_sequence(self, values):
+        """Track PACKET_COUNT continuity; False if the packet is a duplicate."""
+        if self._packet_count_index is None:
+            return True
+        try:
+            return self.stats.check_sequence(int(float(values[self._packet_count_index])))
+        except (ValueError, TypeError):
+            return True
+
+    def _observe_echo(self, echo):
+        for tracked in self.command_tracker.observe(echo):
+            logging.info(f"Command acknowledged: {tracked.command} "
+                         f"({tracked.rtt * 1e3:.0f} ms, {tracked.attempts} attempt(s))")
+            self._emit('command_status', tracked.as_dict())
+
+    def _check_commands(self):
+        """Write unacknowledged commands again once their echo is overdue."""
+        retry, failed = self.command_tracker.expire()
+        for tracked in retry:
+            logging.warning(f"No echo for {tracked.command} after {tracked.attempts} attempt(s), resending")
+            if not self._enqueue(tracked.command):
+                self._command_dropped(tracked.command)
+        for tracked in failed:
+            logging.error(f"Command {tracked.command} not acknowledged after {tracked.attempts} attempts")
+            self._emit('command_status', tracked.as_dict())
+
+    def _report_link_stats(self, force=False):
+        """Emit link_stats and log a summary, at most once per stats_interval."""
+        now = time.monotonic()
+        if not force and now - self._stats_emitted_at < self.stats_interval:
+            return
+        self._stats_emitted_at = now
+        self.stats.log_summary(force)
+        stats = self.stats.snapshot()
+        stats['commands'] = self.command_tracker.snapshot()
+        self._emit('link_stats', stats)
+
+    def _handle_values(self, values):
+        """Handle one decoded binary frame (values already converted by the codec)."""
+        if self.batch_interval:
+            # Formatting the display string is left for the batch flush
+            self._last_values = values
+        else:
+            self.lastPacket = ','.join(str(v) for v in values)
+            self._emit('lastPacketRecieved', self.lastPacket)
+        self.receivedPacketCount += 1
+        if self.log_enabled:
+            self.log_writer.write(values)
+        if not self._check_sequence(values):
+            return  # duplicate: counted in LinkStats, not delivered
+        self.stats.valid += 1
+        if self._cmd_echo_index is not None:
+            self._observe_echo(values[self._cmd_echo_index])
+        self.data_list.append(values)
+        if len(self.data_list) > 20:
+            del self.data_list[0]
+        packet = self.parser.build(values)
+        self._deliver((packet, values) if self.deliver_rows else packet)
+
+    def _deliver(self, packet):
+        if packet is None:
+            return
+        if self.batch_interval:
+            self._batch.append(packet)
+            self._batch_times.append(time.time())
+            if len(self._batch) >= self.batch_size:
+                self._emit_batch()
+        else:
+            self._emit('telemetry_received', packet)
+
+    def _emit_batch(self):
+        """Deliver the pending batch with one telemetry_batch signal."""
+        self._batch_emitted_at = time.monotonic()
+        if not self._batch:
+            return
+        packets, times = self._batch, self._batch_times
+        self._batch, self._batch_times = [], []
+        if self._last_values is not None:
+            self.lastPacket = ','.join(str(v) for v in self._last_values)
+            self._last_values = None
+        self._emit('lastPacketRecieved', self.lastPacket)
+        self._emit('telemetry_batch', packets, times)
+
+    def _emit(self, name, *args):
+        """Emit signal `name`, or collect it for the asyncio backend's single io_events."""
+        if self._events is not None:
+            self._events.append((name, args))
+            return
+        try:
+            getattr(self, name).emit(*args)
+        except Exception:
+            pass
+
+    def _dispatch_events(self, events):
+        """GUI-thread side of io_events: emit the collected signals in order."""
+        for name, args in events:
+            try:
+                getattr(self, name).emit(*args)
+            except Exception:
+                pass
 
     def send_commands(self):
-        """Process commands from the queue and send them at 1-second intervals."""
-        last_send_time = time.time()
+        """Send queued commands in FIFO order, paced by the command token bucket."""
+        bucket = TokenBucket(self.command_rate, self.command_burst)
         while self.reading:
             try:
-                # Try to get a command without blocking
-                command = self.command_queue.get_nowait()
-                current_time = time.time()
-                # Ensure 1-second interval between sends
-                if current_time - last_send_time >= 1.0:
-                    start_write_time = time.time()
-                    self._write_serial(command)
-                    write_duration = time.time() - start_write_time
-                    last_send_time = current_time
+                # Sleep on the queue until a command (or the stop marker) arrives
+                command = self.command_queue.get()
+                if command is _STOP_SENDING:
                     self.command_queue.task_done()
-                    logging.debug(f"Command sent, queue size: {self.command_queue.qsize()}, write took: {write_duration:.3f}s")
-                else:
-                    # Put the command back if it's too soon to send
-                    self.command_queue.put(command)
-                    time.sleep(0.01)  # Brief sleep to prevent busy-waiting
-            except queue.Empty:
-                time.sleep(0.01)  # Brief sleep to prevent busy-waiting
+                    continue
+                # Hold on to the command until a token is free so order is kept
+                delay = bucket.delay()
+                if delay > 0 and self._stop_event.wait(delay):
+                    self.command_queue.task_done()
+                    break
+                bucket.consume()
+                start_write_time = time.time()
+                self._write_serial(command)
+                write_duration = time.time() - start_write_time
+                self.command_queue.task_done()
+                logging.debug(f"Command sent, queue size: {self.command_queue.qsize()}, write took: {write_duration:.3f}s")
             except Exception as e:
                 logging.error(f"Error in send_commands: {e}")
-                time.sleep(0.01)
 
     def _write_serial(self, command):
-        """Helper method to write to serial port with error handling."""
+        """Helper method to write to serial port with error handling.
+
+        The command tracker starts timing the echo once the write succeeded;
+        a command that could not be written is reported as failed.
+        """
+        sent = False
         if self.ser is None or not self.ser.is_open:
             logging.error("Serial port is not available or closed")
-            return
-        try:
-            command_to_send = f"{command}\n"
-            bytes_written = self.ser.write(command_to_send.encode('utf-8'))
-            if bytes_written == len(command_to_send):
-                self.ser.flush()  # Ensure the command is sent
-                logging.info(f"Command sent: {command}")
-            else:
-                logging.warning(f"Partial write for command: {command}, only {bytes_written} bytes written")
-        except serial.SerialTimeoutException:
-            logging.warning(f"Write timeout for command: {command}")
-        except serial.SerialException as e:
-            logging.error(f"Failed to send command: {e}")
-        except Exception as e:
-            logging.error(f"Unexpected error in _write_serial: {e}")
+        else:
+            try:
+                command_to_send = f"{command}\n"
+                bytes_written = self.ser.write(command_to_send.encode('utf-8'))
+                if bytes_written == len(command_to_send):
+                    self.ser.flush()  # Ensure the command is sent
+                    logging.info(f"Command sent: {command}")
+                    sent = True
+                else:
+                    logging.warning(f"Partial write for command: {command}, only {bytes_written} bytes written")
+            except serial.SerialTimeoutException:
+                logging.warning(f"Write timeout for command: {command}")
+            except serial.SerialException as e:
+                logging.error(f"Failed to send command: {e}")
+            except Exception as e:
+                logging.error(f"Unexpected error in _write_serial: {e}")
+        if sent:
+            self.command_tracker.sent(command)
+        else:
+            self._command_dropped(command, newest=False)
+        return sent
+
+    def _command_dropped(self, command, newest=True):
+        tracked = self.command_tracker.dropped(command, newest)
+        if tracked is not None:
+            self._emit('command_status', tracked.as_dict())
 
     def send_command(self, command):
-        """Add a command to the queue."""
+        """Add a command to the queue (tracked until its CMD_ECHO arrives)."""
+        self.command_tracker.queued(command)
+        if not self._enqueue(command):
+            self._command_dropped(command)
+
+    def _enqueue(self, command):
+        """Put a command on the send queue without blocking (this also runs on
+        the reader thread, for retries). Returns False if it was dropped."""
+        if self.io_core is not None:
+            return self.io_core.send_command(command)
         try:
-            self.command_queue.put(command, timeout=0.1)
+            self.command_queue.put_nowait(command)
             logging.debug(f"Command queued: {command}, queue size: {self.command_queue.qsize()}")
+            return True
         except queue.Full:
             logging.warning("Command queue is full, dropping command")
+            return False
 
     def flush_csv(self):
-        """Flush and close the CSV file temporarily to ensure all data is written."""
-        with open(self.csv_filename, mode='a', newline='') as file:
-            pass
+        """Block until every row logged so far has been written to disk."""
+        if not self.log_writer.flush():
+            logging.warning(f"Timed out flushing {self.csv_filename}")
+
+    def export_logs(self, destination_folder, start=None, end=None, sessions=None, done=None):
+        """Copy the rotated log segments overlapping [start, end] (wall-clock
+        seconds) and/or belonging to `sessions` on a background thread.
+
+        `done(ok, files)` is called from the worker when the copy finishes.
+        Returns the worker thread, or None when log rotation is not enabled.
+        """
+        if not self.log_dir:
+            return None
+        self.flush_csv()  # Segments on disk must hold every row logged so far
+        index = self.log_writer.primary.index
+        return export_segments(index, destination_folder, index.select(start, end, sessions), done)
 
     def copy_csv(self, destination_folder):
-        """Copy the CSV file to the specified destination folder."""
+        """Copy the CSV file to the specified destination folder.
+
+        With log rotation the segments are exported in the background and
+        True means the export has started.
+        """
         if not destination_folder:
             return False
+        if self.log_dir:
+            return self.export_logs(destination_folder) is not None
         try:
-            destination_file = f"{destination_folder}/{self.csv_filename}"
+            destination_file = os.path.join(destination_folder, os.path.basename(self.csv_filename))
             self.flush_csv()  # Ensure all data is flushed before copying
             shutil.copy(self.csv_filename, destination_file)
             logging.info(f"File copied to {destination_file}")
+            session_dir = self.column_store.session_dir if self.column_store else None
+            if session_dir and os.path.isdir(session_dir):
+                destination_dir = os.path.join(destination_folder, os.path.basename(session_dir))
+                shutil.copytree(session_dir, destination_dir, dirs_exist_ok=True)
+                logging.info(f"Column store session copied to {destination_dir}")
             return True
         except Exception as e:
             logging.error(f"Error copying file: {e}")
             return False
-            return False
 
-    def stop_communication(self):
+    def stop_communication(self, keep_log=False):
+        """Stop reading and sending and close the port. With keep_log the log
+        writer keeps running, for a caller with rows still to log (IngestManager)."""
         self.reading = False
+        self._stop_event.set()
+        if self.send_thread and self.send_thread.is_alive():
+            # Wake the sender if it is blocked waiting for a command
+            try:
+                self.command_queue.put_nowait(_STOP_SENDING)
+            except queue.Full:
+                pass  # A queued command will wake it instead
         if self.read_thread:
             self.read_thread.join()
         if self.send_thread:
             self.send_thread.join()
+        if self.io_core is not None:
+            self.io_core.stop(keep_log=keep_log)
+            self.io_core = None
         if self.ser:
             self.ser.close()
-        self.flush_csv()
+        if not keep_log:
+            self.log_writer.stop()
         print("Communication stopped.")
 
     def change_baud_rate(self, new_baud_rate):
@@ -205,12 +695,42 @@ class Communication(QObject):
             self.ser.close()
         self.baud_rate = new_baud_rate
         try:
-            self.ser = serial.Serial(self.serial_port, self.baud_rate, timeout=self.timeout)
+            self.open_port()
             print(f"Baud rate changed to {self.baud_rate}")
         except serial.SerialException as e:
             print(f"Failed to reopen serial port with new baud rate: {e}")
             self.ser = None
 
+    def start_replay(self, log_filename, speed=1.0, log=False):
+        """Play a recorded CSV log through the live pipeline instead of the serial port.
+
+        The log stands in for `ser`, so packets go through the normal reader
+        thread, parser and signals. `speed` scales MISSION_TIME spacing
+        (0 = as fast as possible). Replayed rows are not logged unless `log`.
+        """
+        self.stop_communication()
+        self.replay = ReplaySource(log_filename, speed=speed, timeout=min(self.timeout, 1.0))
+        self.ser = self.replay
+        self.log_enabled = log
+        self.start_communication(None)
+
+    def stop_replay(self):
+        """Stop a running replay; the serial port is reopened on the next start."""
+        if self.replay is None:
+            return
+        self.stop_communication()
+        self.replay = None
+        self.ser = None
+        self.log_enabled = True
+
+    def seek_replay(self, mission_time):
+        if self.replay is not None:
+            self.replay.seek(mission_time)
+
+    def set_replay_speed(self, speed):
+        if self.replay is not None:
+            self.replay.set_speed(speed)
+
     def simulation_mode(self, csv_filename):
         self.simulation = True
         self.sim_thread = threading.Thread(target=self._run_simulation, args=(csv_filename,), daemon=True)
@@ -255,36 +775,29 @@ class Communication(QObject):
         self.simulation = False
         if getattr(self, 'sim_thread', None) is not None and self.sim_thread.is_alive():
             self.sim_thread.join()
-        self.command_queue.queue.clear()
+        # Discard the commands still waiting to be sent
+        while True:
+            try:
+                command = self.command_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.command_queue.task_done()
+            if command is not _STOP_SENDING:
+                self._command_dropped(command, newest=False)
 
     def stop_reading(self):
         self.reading = False
         print("Reading stopped.")
 
     def parse_csv_data(self, data):
-        csv_data = data.split(',')
+        """Parse a packet given as a raw CSV line or an already-split field list."""
+        csv_data = data.split(',') if isinstance(data, str) else data
         self.data_list.append(csv_data)
-        self.data_list = self.data_list[-20:]
+        if len(self.data_list) > 20:
+            del self.data_list[0]
 
-        # Map telemetryHeaders to the values in this line
         try:
-            result = {}
-            for idx, name in enumerate(self.telemetryHeaders):
-                try:
-                    val = csv_data[idx]
-                except IndexError:
-                    val = None
-                if val is None:
-                    result[name] = None
-                else:
-                    if name in self.numericFields:
-                        try:
-                            result[name] = float(val)
-                        except Exception:
-                            result[name] = None
-                    else:
-                        result[name] = val
-            return result
+            return self.parser.parse_fields(csv_data)
         except Exception:
             return None
 
@@ -296,9 +809,12 @@ class Communication(QObject):
         return getattr(self, 'lastPacket', '')
 
     def reset_csv(self):
-        with open(self.csv_filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(self.telemetryHeaders)
+        """Clear the log (with log rotation: close the segment and start a new session)."""
+        self.log_writer.reset()
+
+    def log_queue_depth(self):
+        """Number of rows waiting to be written by the CSV log writer."""
+        return self.log_writer.queue_depth
     
     ## Telemetry field accessors ##
 
@@ -314,6 +830,19 @@ class Communication(QObject):
             self.numericFields = {
                 field for field, unit in telemetry_data.items() if unit
             }
+
+            # Compile the numeric column indices once for the packet hot path
+            self.parser = PacketParser(telemetry_data, self.record_format)
+            self.codec = make_codec(self.codec_name, telemetry_data,
+                                    self.data_manager.getBinaryFormat())
+            # Columns used for resynchronisation and gap detection
+            self._team_id_index = self.parser.field_index.get('TEAM_ID')
+            self._packet_count_index = self.parser.field_index.get('PACKET_COUNT')
+            self._cmd_echo_index = self.parser.field_index.get('CMD_ECHO')
+            # Run-together packets can only be split when TEAM_ID comes first (see resync_csv)
+            self._resync = self._team_id_index == 0
+            if self._team_id_index is not None and not self._resync:
+                logging.info("TEAM_ID is not the first telemetry field, packet resync is disabled")
             
             logging.info(f"Loaded {len(self.telemetryHeaders)} telemetry headers from Data manager")
             logging.debug(f"Numeric fields: {self.numericFields}")
@@ -322,6 +851,12 @@ class Communication(QObject):
             # Fallback to empty lists
             self.telemetryHeaders = []
             self.numericFields = set()
+            self.parser = PacketParser({}, self.record_format)
+            self.codec = make_codec('csv', {})
+            self._team_id_index = None
+            self._packet_count_index = None
+            self._cmd_echo_index = None
+            self._resync = False
 
     def ensureFieldIndex(self):
         # build a mapping from field name to index based on telemetryHeaders
@@ -0,0 +1,280 @@
+import csv
+import os
+import queue
+import threading
+import time
+import logging
+
+class _Control:
+    """Marker queued behind data rows so flush/reset/stop happen in order."""
+    __slots__ = ('kind', 'done')
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.done = threading.Event()
+
+class CsvSink:
+    """Appends rows to a single CSV file (the historical data.csv log)."""
+
+    def __init__(self, filename, header):
+        self.filename = filename
+        self.header = list(header)
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        self._file = open(self.filename, mode='a', newline='')
+        self._writer = csv.writer(self._file)
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def flush(self, sync=False):
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def reset(self):
+        """Truncate the file to just the header (works whether open or not)."""
+        is_open = self._file is not None
+        if is_open:
+            self._file.close()
+        with open(self.filename, mode='w', newline='') as f:
+            csv.writer(f).writerow(self.header)
+        if is_open:
+            self.open()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+class CsvLogWriter:
+    """Background telemetry logger fed by a bounded queue.
+
+    The serial reader only enqueues rows (`write` never blocks); a dedicated
+    thread batches them and hands each batch to every sink (the CSV file,
+    plus any extra sinks such as a ColumnStore) once `flush_rows` rows are
+    pending or `flush_interval` seconds have passed since the oldest pending
+    row, whichever comes first. `flush`, `reset` and `stop` are queued
+    behind the data so they apply to exactly the rows written before the
+    call.
+
+    With `start(threaded=False)` no thread is started and an event loop
+    calls `pump` instead (see asyncCore.py).
+
+    A sink provides open(), write_rows(rows), flush(sync), reset() and
+    close(). The `primary` sink (data.csv unless given, e.g. a
+    RotatingCsvSink) must succeed; a failing extra sink is logged and
+    dropped without stopping the log.
+    """
+
+    def __init__(self, filename, header, max_queue=10000, flush_rows=100, flush_interval=1.0,
+                 sinks=(), primary=None):
+        self.filename = filename
+        self.header = list(header)
+        self.primary = primary or CsvSink(filename, header)
+        self.sinks = [self.primary] + list(sinks)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self._thread = None
+        self._external = False  # driven by pump() from an event loop instead of a thread
+        self._pending = []
+        self._deadline = None
+
+    @property
+    def running(self):
+        return self._external or (self._thread is not None and self._thread.is_alive())
+
+    @property
+    def queue_depth(self):
+        """Number of rows (and control markers) waiting for the writer thread."""
+        return self.queue.qsize()
+
+    def start(self, threaded=True):
+        """Start the writer thread, or with threaded=False open the sinks and
+        leave the batching to whoever calls `pump` (e.g. an asyncio loop)."""
+        if self.running:
+            return
+        if not threaded:
+            self._pending, self._deadline = [], None
+            self._each('open')
+            self._external = True
+            return
+        self._thread = threading.Thread(target=self._run, name="csv-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, row):
+        """Queue one row without blocking the caller. Returns False if dropped."""
+        try:
+            self.queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.rows_dropped += 1
+            return False
+
+    def flush(self, timeout=5.0):
+        """Block until every row queued so far is written and synced to disk."""
+        return self._control('flush', timeout)
+
+    def reset(self, timeout=5.0):
+        """Truncate the log to just the header, discarding rows queued so far."""
+        return self._control('reset', timeout)
+
+    def stop(self, timeout=5.0):
+        """Write out everything queued so far and end the writer thread."""
+        if self._external:
+            # The event loop has stopped pumping; finish the queue here
+            self.pump()
+            ctl = _Control('stop')
+            self.queue.put(ctl, timeout=timeout)
+            self.pump()
+            return ctl.done.is_set()
+        done = self._control('stop', timeout)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        return done
+
+    def pump(self):
+        """Process everything queued so far without blocking (external mode).
+
+        Returns the seconds until the pending rows are due to be written, or
+        None when nothing is pending.
+        """
+        if not self._external:
+            return None
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if self._process(items):
+                self._external = False
+                self._close_sinks()
+        except Exception as e:
+            logging.error(f"CSV log writer failed: {e}")
+            self._external = False
+            self._close_sinks()
+        return None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+
+    def _control(self, kind, timeout):
+        if not self.running:
+            # No writer thread owns the sinks; apply the operation directly
+            if kind == 'reset':
+                self._each('reset')
+            return True
+        ctl = _Control(kind)
+        try:
+            self.queue.put(ctl, timeout=timeout)
+        except queue.Full:
+            logging.error(f"CSV log queue is full, could not {kind} {self.filename}")
+            return False
+        return ctl.done.wait(timeout)
+
+    def _each(self, method, *args):
+        """Call `method` on every sink; extra sinks that fail are dropped."""
+        for sink in list(self.sinks):
+            try:
+                getattr(sink, method)(*args)
+            except Exception as e:
+                if sink is self.primary:
+                    raise
+                logging.error(f"Log sink {type(sink).__name__} failed in {method}: {e}")
+                self.sinks.remove(sink)
+
+    def _write_pending(self):
+        if self._pending:
+            self._each('write_rows', self._pending)
+            self.rows_written += len(self._pending)
+            self._pending = []
+        self._each('flush', False)
+        self._deadline = None
+
+    def _process(self, items):
+        """Apply queued rows and control markers; True once 'stop' is reached."""
+        for item in items:
+            if not isinstance(item, _Control):
+                self._pending.append(item)
+                if self._deadline is None:
+                    self._deadline = time.monotonic() + self.flush_interval
+                continue
+            if item.kind == 'reset':
+                self._pending = []
+                self._each('reset')
+                self._deadline = None
+            else:
+                self._write_pending()
+                self._each('flush', True)
+            item.done.set()
+            if item.kind == 'stop':
+                return True
+
+        if self._pending and (len(self._pending) >= self.flush_rows or time.monotonic() >= self._deadline):
+            self._write_pending()
+        return False
+
+    def _close_sinks(self):
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logging.error(f"Failed to close log sink {type(sink).__name__}: {e}")
+
+    def _run(self):
+        self._pending, self._deadline = [], None
+        try:
+            self._each('open')
+            while True:
+                timeout = None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+                try:
+                    items = [self.queue.get(timeout=timeout)]
+                except queue.Empty:
+                    items = []
+                # Drain whatever else is already queued into the same batch
+                while len(items) < self.flush_rows:
+                    try:
+                        items.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self._process(items):
+                    return
+        except Exception as e:
+            logging.error(f"CSV log writer failed: {e}")
+        finally:
+            self._close_sinks()
+
+class NullLogWriter:
+    """Stand-in for CsvLogWriter on a link that logs nothing (csv_filename=None),
+    e.g. a redundant link whose rows are logged by the IngestManager."""
+
+    filename = None
+    primary = None
+    running = False
+    queue_depth = 0
+    rows_written = 0
+    rows_dropped = 0
+
+    def start(self, threaded=True):
+        pass
+
+    def write(self, row):
+        return False
+
+    def flush(self, timeout=5.0):
+        return True
+
+    def reset(self, timeout=5.0):
+        return True
+
+    def stop(self, timeout=5.0):
+        return True
+
+    def pump(self):
+        return None
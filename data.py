@@ -21,6 +21,7 @@ class Data:
         self.preferences = self.config.get("preferences", {})
         self.telemetryFields = self.config.get("telemetryFields", {})
         self.commands = self.config.get("commands", {})
+        self.binaryFormat = self.config.get("binaryFormat", {})
 
     def _save_config(self):
         """Save all config data to the single config.json file."""
@@ -83,6 +84,10 @@ class Data:
         self.telemetryFields[key] = value
         self._save_config()
     
+    def getBinaryFormat(self):
+        """Return the struct code (or enum table) per telemetry field used by the binary codec."""
+        return self.binaryFormat
+
     def saveTelemetryFields(self):
         self._save_config()
 
@@ -0,0 +1,107 @@
+import numpy as np
+
+def minmax_buckets(x, y, bucket_size: int):
+    """Reduce every `bucket_size` samples to their min and max points.
+
+    `len(x)` must be a multiple of `bucket_size`. The two points of each
+    bucket are kept in their original order, so spikes keep their shape.
+    Returns interleaved (x, y) arrays with two points per bucket.
+    """
+    n = len(y)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    rows = y.reshape(-1, bucket_size)
+    imin = rows.argmin(axis=1)
+    imax = rows.argmax(axis=1)
+    base = np.arange(rows.shape[0]) * bucket_size
+    first = base + np.minimum(imin, imax)
+    second = base + np.maximum(imin, imax)
+    idx = np.empty(2 * rows.shape[0], dtype=np.intp)
+    idx[0::2] = first
+    idx[1::2] = second
+    return x[idx], y[idx]
+
+def _minmax_span(x, y):
+    """Min and max points of a short span (a partial bucket), in order."""
+    if len(y) <= 2:
+        return x, y
+    i, j = sorted((int(y.argmin()), int(y.argmax())))
+    return x[[i, j]], y[[i, j]]
+
+class MinMaxDecimator:
+    """Incremental min/max-per-bucket decimation of a growing series.
+
+    Buckets are aligned to the absolute sample index (see RingBuffer.total),
+    so a bucket's result never changes once it is complete. Completed
+    buckets are cached; each call only reduces the samples appended since
+    the previous call plus the partial buckets at both ends. The bucket size
+    is a power of two chosen so the output has roughly two points per pixel,
+    which means the cache is only rebuilt when the history doubles or the
+    plot width changes a lot.
+    """
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        self.bucket_size = 0
+        self._k0 = 0  # first cached bucket id
+        self._k1 = 0  # one past the last cached bucket id
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+    @property
+    def nbytes(self):
+        return self._x.nbytes + self._y.nbytes
+
+    @staticmethod
+    def bucket_size_for(n: int, pixels: int) -> int:
+        if n <= 2 * pixels:
+            return 1
+        return 1 << int(np.ceil(np.log2(n / pixels)))
+
+    def decimate(self, x, y, total: int, pixels: int):
+        """Return (x, y) reduced for a plot `pixels` wide.
+
+        `x` and `y` hold the newest `len(y)` of `total` samples ever appended.
+        """
+        n = len(y)
+        size = self.bucket_size_for(n, max(1, pixels))
+        if size == 1:
+            self.invalidate()
+            return x, y
+        first = total - n  # absolute index of x[0]
+        if size != self.bucket_size or total < self._k1 * size:
+            # Bucket size changed or the series was reset: start over
+            self.invalidate()
+            self.bucket_size = size
+
+        k_start = -(-first // size)  # first complete bucket still in view
+        k_end = total // size        # one past the last complete bucket
+
+        # Drop buckets that scrolled out of the window
+        if self._k1 <= k_start or self._k0 > k_start:
+            self._x = self._x[:0]
+            self._y = self._y[:0]
+            self._k0 = self._k1 = k_start
+        elif self._k0 < k_start:
+            cut = 2 * (k_start - self._k0)
+            self._x = self._x[cut:]
+            self._y = self._y[cut:]
+            self._k0 = k_start
+
+        # Reduce only buckets completed since the last call
+        if k_end > self._k1:
+            lo = self._k1 * size - first
+            hi = k_end * size - first
+            nx, ny = minmax_buckets(x[lo:hi], y[lo:hi], size)
+            self._x = np.concatenate((self._x, nx))
+            self._y = np.concatenate((self._y, ny))
+            self._k1 = k_end
+
+        # Partial buckets at either end are reduced fresh on every call
+        head = k_start * size - first
+        tail = k_end * size - first
+        hx, hy = _minmax_span(x[:head], y[:head])
+        tx, ty = _minmax_span(x[tail:], y[tail:])
+        return np.concatenate((hx, self._x, tx)), np.concatenate((hy, self._y, ty))
@@ -0,0 +1,270 @@
+import csv
+import os
+import threading
+import logging
+from replay import parse_mission_time
+from logRotation import copy_segments, open_segment, segment_file
+from PyQt5.QtCore import QObject, pyqtSignal
+
+CHUNK_SIZE = 8 << 20  # bytes per zero-copy call, also the progress/cancel granularity
+
+class ExportCancelled(Exception):
+    pass
+
+class ExportService(QObject):
+    """Copies and filters telemetry logs on a worker thread.
+
+    Whole files are copied with `os.copy_file_range` (or `os.sendfile`)
+    when the platform has them, so the data never passes through Python.
+    A time window and/or a subset of columns is exported by streaming the
+    CSV line by line. Only one export runs at a time; `cancel` stops it and
+    removes the partial output.
+
+    `export_logs` and `export_log_subset` take the Communication whose log
+    is exported and flush it on the worker, so the GUI never waits on the
+    fsync.
+    """
+    progress = pyqtSignal(int)             # percent done
+    finished = pyqtSignal(bool, str)       # success, message
+
+    def __init__(self):
+        QObject.__init__(self)
+        self._thread = None
+        self._cancel = threading.Event()
+        self._done = 0
+        self._total = 0
+        self._percent = -1
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+
+    ## Public jobs ##
+
+    def export_files(self, sources, destination_folder):
+        """Copy whole files (e.g. data.csv or log segments) into `destination_folder`."""
+        jobs = [(src, os.path.join(destination_folder, os.path.basename(src))) for src in sources]
+        return self._start(self._copy_files, jobs)
+
+    def export_logs(self, comm, destination_folder):
+        """Copy everything `comm` has logged: data.csv, or with log rotation the
+        segments and their index.json, plus the column-store session directory."""
+        return self._start(self._copy_logs, comm, destination_folder)
+
+    def export_subset(self, source, destination, columns=None, start=None, end=None,
+                      time_field='MISSION_TIME'):
+        """Write the rows of `source` whose `time_field` lies in [start, end]
+        (seconds, None = open), keeping only `columns` (None = all)."""
+        return self._start(self._copy_subset, [source], destination, columns, start, end, time_field)
+
+    def export_log_subset(self, comm, destination, columns=None, start=None, end=None,
+                          time_field='MISSION_TIME'):
+        """`export_subset` over the whole log of `comm` (every rotated segment
+        that can hold rows in the window, compressed or not)."""
+        return self._start(self._copy_log_subset, comm, destination, columns, start, end, time_field)
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    ## Worker ##
+
+    def _start(self, job, *args):
+        if self.busy:
+            logging.warning("An export is already running")
+            return False
+        self._cancel.clear()
+        self._done = self._total = 0
+        self._percent = -1
+        self._thread = threading.Thread(target=self._run, args=(job,) + args,
+                                        name="export", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self, job, *args):
+        try:
+            message = job(*args)
+            ok = True
+        except ExportCancelled:
+            ok, message = False, "Export cancelled"
+        except Exception as e:
+            ok, message = False, f"Export failed: {e}"
+        if ok:
+            logging.info(message)
+        else:
+            logging.warning(message)
+        try:
+            self.finished.emit(ok, message)
+        except Exception:
+            pass
+
+    def _advance(self, nbytes):
+        if self._cancel.is_set():
+            raise ExportCancelled()
+        self._done += nbytes
+        percent = int(100 * self._done / self._total) if self._total else 100
+        if percent != self._percent:
+            # Only emit when the visible value changes
+            self._percent = percent
+            try:
+                self.progress.emit(percent)
+            except Exception:
+                pass
+
+    def _copy_one(self, src, dst):
+        try:
+            _copy_file(src, dst, self._advance)
+        except ExportCancelled:
+            _remove(dst)
+            raise
+
+    def _copy_files(self, jobs):
+        self._total = sum(_size(src) for src, _ in jobs)
+        for src, dst in jobs:
+            self._copy_one(src, dst)
+        return f"Exported {len(jobs)} file(s) to {os.path.dirname(jobs[0][1]) if jobs else ''}"
+
+    def _copy_logs(self, comm, destination_folder):
+        comm.flush_csv()  # Ensure all data is on disk before copying
+        session_dir = comm.column_store.session_dir if comm.column_store else None
+        column_files = []
+        if session_dir and os.path.isdir(session_dir):
+            target = os.path.join(destination_folder, os.path.basename(session_dir))
+            column_files = [(os.path.join(session_dir, name), os.path.join(target, name))
+                            for name in sorted(os.listdir(session_dir))]
+        self._total = sum(_size(src) for src, _ in column_files)
+        if comm.log_dir:
+            index = comm.log_writer.primary.index
+            segments = index.select()
+            self._total += sum(entry.get("compressed_bytes") or entry.get("bytes") or 0
+                               for entry in segments)
+            # Segments compressed during the export are copied under their new name
+            copied = copy_segments(index, destination_folder, segments, copy=self._copy_one)
+            message = f"Exported {len(copied)} log segment(s)"
+        else:
+            self._total += _size(comm.csv_filename)
+            self._copy_one(comm.csv_filename,
+                           os.path.join(destination_folder, os.path.basename(comm.csv_filename)))
+            message = f"Exported {os.path.basename(comm.csv_filename)}"
+        if column_files:
+            os.makedirs(os.path.dirname(column_files[0][1]), exist_ok=True)
+            for src, dst in column_files:
+                self._copy_one(src, dst)
+            message += f" and column store session {os.path.basename(session_dir)}"
+        return f"{message} to {destination_folder}"
+
+    def _copy_log_subset(self, comm, destination, columns, start, end, time_field):
+        comm.flush_csv()
+        if not comm.log_dir:
+            return self._copy_subset([comm.csv_filename], destination, columns, start, end, time_field)
+        index = comm.log_writer.primary.index
+        segments = [entry for entry in index.select() if _may_overlap(entry, start, end)]
+        # Each source opens its segment when it is reached, under its current name
+        sources = [(lambda entry=entry: segment_file(index, entry, open_segment)[0], entry.get("bytes") or 0)
+                   for entry in segments]
+        return self._copy_subset(sources, destination, columns, start, end, time_field)
+
+    def _copy_subset(self, sources, destination, columns, start, end, time_field):
+        """Stream the rows of `sources` (paths, or (open function, size) pairs)
+        in [start, end] into one CSV. Columns are matched by name, so
+        sources written with different headers line up."""
+        sources = [(lambda path=src: open(path, 'rb'), _size(src)) if isinstance(src, str) else src
+                   for src in sources]
+        self._total = sum(size for _, size in sources)
+        rows = 0
+        windowed = start is not None or end is not None
+        try:
+            with open(destination, 'w', newline='') as dst:
+                writer = csv.writer(dst)
+                out_header = None
+                for opener, _ in sources:
+                    with opener() as src:
+                        header_line = src.readline()
+                        self._advance(len(header_line))
+                        header = header_line.decode('utf-8', errors='ignore').strip().split(',')
+                        if out_header is None:
+                            out_header = list(columns) if columns else header
+                            writer.writerow(out_header)
+                        keep = [header.index(c) if c in header else None for c in out_header]
+                        if keep == list(range(len(header))):
+                            keep = None  # same layout: write the fields as they are
+                        time_col = header.index(time_field) if time_field in header else None
+                        if windowed and time_col is None:
+                            raise ValueError(f"Log has no {time_field} column")
+                        pending = 0
+                        for raw in src:
+                            pending += len(raw)
+                            if pending >= (1 << 20):
+                                self._advance(pending)
+                                pending = 0
+                            fields = raw.decode('utf-8', errors='ignore').rstrip('\r\n').split(',')
+                            if windowed:
+                                t = parse_mission_time(fields[time_col]) if time_col < len(fields) else None
+                                if t is None or (start is not None and t < start):
+                                    continue
+                                if end is not None and t > end:
+                                    continue
+                            if keep:
+                                fields = [fields[i] if i is not None and i < len(fields) else '' for i in keep]
+                            writer.writerow(fields)
+                            rows += 1
+                        self._advance(pending)
+        except ExportCancelled:
+            _remove(destination)
+            raise
+        return f"Exported {rows} rows to {destination}"
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0  # only used for progress
+
+def _may_overlap(entry, start, end):
+    """False if the segment's recorded MISSION_TIME range lies outside [start, end]."""
+    first = parse_mission_time(entry.get("first_time") or '')
+    last = parse_mission_time(entry.get("last_time") or '')
+    if first is None or last is None or first > last:
+        return True  # unknown (or wrapped) range: read it
+    if start is not None and last < start:
+        return False
+    return end is None or first <= end
+
+def _copy_file(src, dst, advance):
+    """Copy `src` to `dst` in CHUNK_SIZE steps, zero-copy when the OS allows."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copy = _zero_copy_function()
+        offset = 0
+        while offset < size:
+            n = 0
+            if copy is not None:
+                try:
+                    n = copy(fsrc.fileno(), fdst.fileno(), offset, min(CHUNK_SIZE, size - offset))
+                except OSError:
+                    copy = None  # e.g. across filesystems: fall back to read/write
+                    fdst.seek(offset)
+            if copy is None:
+                fsrc.seek(offset)
+                data = fsrc.read(min(CHUNK_SIZE, size - offset))
+                n = fdst.write(data)
+            if n == 0:
+                break  # source shrank while copying
+            offset += n
+            advance(n)
+
+def _zero_copy_function():
+    if hasattr(os, 'copy_file_range'):
+        return lambda fin, fout, offset, count: os.copy_file_range(fin, fout, count, offset)
+    if hasattr(os, 'sendfile'):
+        return lambda fin, fout, offset, count: os.sendfile(fout, fin, offset, count)
+    return None
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,12 +1,74 @@
 import sys
 import time
 from PyQt5 import QtCore, QtWidgets
+import numpy as np
 import pyqtgraph as pg
+from ringBuffer import RingBuffer
+from decimation import MinMaxDecimator
+
+DEFAULT_CAPACITY = 50  # samples kept per graph unless configured otherwise
+DEFAULT_FPS = 20
+SYMBOL_THRESHOLD = 500  # markers are hidden once a graph holds more points than this
+
+class RenderScheduler(QtCore.QObject):
+    """One shared frame timer for a set of graphs.
+
+    Each frame repaints only the graphs that received data since they were
+    last drawn. `frames_rendered` and `frames_skipped` count per-graph
+    frames, so their ratio shows how much redundant repainting is avoided.
+    """
+
+    def __init__(self, fps: float = DEFAULT_FPS):
+        super().__init__()
+        self.graphs = []
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self._render_frame)
+        self.set_fps(fps)
+
+    def set_fps(self, fps: float):
+        self.fps = fps
+        self.timer.setInterval(max(1, int(1000 / fps)))
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def register(self, graph):
+        if graph not in self.graphs:
+            self.graphs.append(graph)
+
+    def unregister(self, graph):
+        if graph in self.graphs:
+            self.graphs.remove(graph)
+
+    def stats(self) -> dict:
+        return {
+            'fps': self.fps,
+            'graphs': len(self.graphs),
+            'frames_rendered': self.frames_rendered,
+            'frames_skipped': self.frames_skipped,
+        }
+
+    def _render_frame(self):
+        for graph in self.graphs:
+            if graph.dirty:
+                graph.render()
+                self.frames_rendered += 1
+            else:
+                self.frames_skipped += 1
 
 class Graph(QtCore.QObject):
     newData = QtCore.pyqtSignal(float, float) # value, timestamp
+    newBatch = QtCore.pyqtSignal(list, list) # values, timestamps
+
+    _columns = 2  # timestamps, values
 
-    def __init__(self, name: str, units: str):
+    def __init__(self, name: str, units: str, capacity: int = DEFAULT_CAPACITY,
+                 scheduler: RenderScheduler | None = None, decimate: bool = True):
         super().__init__()
         self.name = name
         self.units = units
@@ -24,36 +86,86 @@ class Graph(QtCore.QObject):
             symbol='o', symbolSize=8, symbolBrush='#1e8d12'
         )
 
-        self.data = []
-        self.timestamps = []
+        # Column 0 holds elapsed timestamps, the rest hold sample values
+        self.buffer = RingBuffer(capacity, columns=self._columns)
         self.start_time = time.time()
+        self.dirty = False  # new samples since the last render
+        # Level-of-detail: the samples in the visible X range are reduced to
+        # min/max per pixel bucket (one cached decimator per value column)
+        self.decimate = decimate
+        self._decimators = [MinMaxDecimator() for _ in range(self._columns - 1)]
+        self._symbols_shown = True
+        # The X range follows the newest samples until the user pans or zooms;
+        # the view box's auto-range button resumes following
+        self.follow = True
+        viewbox = self.plot.getViewBox()
+        viewbox.sigRangeChangedManually.connect(self._view_changed)
+        viewbox.sigStateChanged.connect(self._view_state_changed)
 
         self.plot.setLabel('left', name, units)
         self.plot.setLabel('bottom', 'Time (s)')
         self.plot.setYRange(0, 600)
 
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self._update_gui)
-        self.timer.start(50)
+        # Repaints are driven by a shared scheduler when one is given,
+        # otherwise by a private timer
+        self.scheduler = scheduler
+        self.timer = None
+        if scheduler is not None:
+            scheduler.register(self)
+        else:
+            self.timer = QtCore.QTimer()
+            self.timer.timeout.connect(self._update_gui)
+            self.timer.start(int(1000 / DEFAULT_FPS))
 
         self.newData.connect(self._handle_data)
+        self.newBatch.connect(self._handle_batch)
+
+    @property
+    def timestamps(self):
+        return self.buffer.view(0)
+
+    @property
+    def data(self):
+        return self.buffer.view(1)
+
+    @property
+    def capacity(self):
+        return self.buffer.capacity
+
+    def set_capacity(self, capacity: int):
+        """Change how many samples this graph keeps (newest samples are kept)."""
+        self.buffer.resize(capacity)
+        self.dirty = True
+
+    def memory_usage(self) -> int:
+        """Bytes held by the sample buffer and the decimation caches."""
+        return self.buffer.nbytes + sum(d.nbytes for d in self._decimators)
 
     def update(self, value: float, timestamp: float | None = None):
         if timestamp is None:
             timestamp = time.time()
         self.newData.emit(value, timestamp)
 
+    def update_batch(self, values: list, timestamps: list):
+        """Push several samples at once (one signal for the whole batch)."""
+        if values:
+            self.newBatch.emit(values, timestamps)
+
     def show(self):
         self.win.show()
 
     def close(self):
-        self.timer.stop()
+        if self.scheduler is not None:
+            self.scheduler.unregister(self)
+        if self.timer is not None:
+            self.timer.stop()
         self.win.close()
 
     def reset(self):
-        self.data.clear()
-        self.timestamps.clear()
+        self.buffer.clear()
         self.start_time = time.time()
+        self.follow = True
+        self.dirty = True
 
     def toggle_dark_mode(self, enabled: bool):
         if enabled:
@@ -80,25 +192,85 @@ class Graph(QtCore.QObject):
 
     @QtCore.pyqtSlot(float, float)
     def _handle_data(self, value: float, timestamp: float):
-        elapsed = timestamp - self.start_time
-        self.data.append(value)
-        self.timestamps.append(elapsed)
+        self.buffer.append(timestamp - self.start_time, value)
+        self.dirty = True
 
-        self.data = self.data[-50:]
-        self.timestamps = self.timestamps[-50:]
+    @QtCore.pyqtSlot(list, list)
+    def _handle_batch(self, values: list, timestamps: list):
+        self.buffer.extend(np.asarray(timestamps) - self.start_time, values)
+        self.dirty = True
 
     def _update_gui(self):
-        if not self.timestamps:
+        if self.dirty:
+            self.render()
+
+    def _view_changed(self, *_):
+        self.follow = False
+        self.dirty = True  # re-decimate for the new range
+
+    def _view_state_changed(self, viewbox):
+        if not self.follow and viewbox.autoRangeEnabled()[0]:
+            self.follow = True
+            self.dirty = True
+
+    def _curves(self):
+        """Plot curves in value-column order."""
+        return [self.curve]
+
+    def _visible(self, timestamps):
+        """Index range [i0, i1) of the samples inside the visible X range, one
+        sample wider on each side so the line runs to the plot edges."""
+        n = len(timestamps)
+        if self.follow:
+            return 0, n
+        lo, hi = self.plot.getViewBox().viewRange()[0]
+        i0 = max(0, int(np.searchsorted(timestamps, lo)) - 1)
+        i1 = min(n, int(np.searchsorted(timestamps, hi, side='right')) + 1)
+        return i0, i1
+
+    def _series(self, timestamps, column: int, i0: int, i1: int):
+        x = timestamps[i0:i1]
+        values = self.buffer.view(column)[i0:i1]
+        if not self.decimate:
+            return x, values
+        pixels = max(100, self.plot.width())
+        # Absolute index one past the slice, so cached buckets stay aligned
+        total = self.buffer.total - (len(timestamps) - i1)
+        return self._decimators[column - 1].decimate(x, values, total, pixels)
+
+    def _update_symbols(self, n: int):
+        show = n <= SYMBOL_THRESHOLD
+        if show != self._symbols_shown:
+            for curve in self._curves():
+                curve.setSymbol('o' if show else None)
+            self._symbols_shown = show
+
+    def render(self):
+        """Push the buffered samples to the plot and clear the dirty flag."""
+        self.dirty = False
+        n = len(self.buffer)
+        curves = self._curves()
+        if not n:
+            for curve in curves:
+                curve.setData([], [])
             return
-        self.curve.setData(self.timestamps, self.data)
-        if len(self.timestamps) > 1:
-            self.plot.setXRange(self.timestamps[0], self.timestamps[-1], padding=0.05)
+        timestamps = self.timestamps
+        i0, i1 = self._visible(timestamps)
+        self._update_symbols(i1 - i0)
+        for column, curve in enumerate(curves, start=1):
+            curve.setData(*self._series(timestamps, column, i0, i1))
+        if self.follow and n > 1:
+            self.plot.setXRange(timestamps[0], timestamps[-1], padding=0.05)
 
 class rpyGraph(Graph):
     newRPY = QtCore.pyqtSignal(float, float, float, float) # r, p, y, timestamp
+    newRPYBatch = QtCore.pyqtSignal(list, list, list, list) # rs, ps, ys, timestamps
+
+    _columns = 4  # timestamps, R, P, Y
 
-    def __init__(self, name: str, units: str):
-        super().__init__(name, units)
+    def __init__(self, name: str, units: str, capacity: int = DEFAULT_CAPACITY,
+                 scheduler: RenderScheduler | None = None, decimate: bool = True):
+        super().__init__(name, units, capacity, scheduler, decimate)
 
         self.plot.removeItem(self.curve)
         self.plot.addLegend()
@@ -121,12 +293,9 @@ class rpyGraph(Graph):
         self._pen_p_dark = pg.mkPen('#55ff55', width=3)
         self._pen_y_dark = pg.mkPen('#5555ff', width=3)
 
-        self.data_r = []
-        self.data_p = []
-        self.data_y = []
-
         self.plot.setYRange(-30, 30)
         self.newRPY.connect(self._handle_rpy)
+        self.newRPYBatch.connect(self._handle_rpy_batch)
 
     def update(self, r: float, p: float, y: float, timestamp: float | None = None):
         """Push a new (R, P, Y) sample."""
@@ -134,11 +303,22 @@ class rpyGraph(Graph):
             timestamp = time.time()
         self.newRPY.emit(r, p, y, timestamp)
 
-    def reset(self):
-        super().reset()
-        self.data_r.clear()
-        self.data_p.clear()
-        self.data_y.clear()
+    @property
+    def data_r(self):
+        return self.buffer.view(1)
+
+    @property
+    def data_p(self):
+        return self.buffer.view(2)
+
+    @property
+    def data_y(self):
+        return self.buffer.view(3)
+
+    def update_batch(self, rs: list, ps: list, ys: list, timestamps: list):
+        """Push several (R, P, Y) samples at once."""
+        if timestamps:
+            self.newRPYBatch.emit(rs, ps, ys, timestamps)
 
     def toggle_dark_mode(self, enabled: bool):
         super().toggle_dark_mode(enabled)
@@ -160,22 +340,13 @@ class rpyGraph(Graph):
 
     @QtCore.pyqtSlot(float, float, float, float)
     def _handle_rpy(self, r: float, p: float, y: float, ts: float):
-        elapsed = ts - self.start_time
-        self.data_r.append(r)
-        self.data_p.append(p)
-        self.data_y.append(y)
-        self.timestamps.append(elapsed)
+        self.buffer.append(ts - self.start_time, r, p, y)
+        self.dirty = True
 
-        self.data_r = self.data_r[-50:]
-        self.data_p = self.data_p[-50:]
-        self.data_y = self.data_y[-50:]
-        self.timestamps = self.timestamps[-50:]
+    @QtCore.pyqtSlot(list, list, list, list)
+    def _handle_rpy_batch(self, rs: list, ps: list, ys: list, timestamps: list):
+        self.buffer.extend(np.asarray(timestamps) - self.start_time, rs, ps, ys)
+        self.dirty = True
 
-    def _update_gui(self):
-        if not self.timestamps:
-            return
-        self.curve_r.setData(self.timestamps, self.data_r)
-        self.curve_p.setData(self.timestamps, self.data_p)
-        self.curve_y.setData(self.timestamps, self.data_y)
-        if len(self.timestamps) > 1:
-            self.plot.setXRange(self.timestamps[0], self.timestamps[-1], padding=0.05)
\ No newline at end of file
+    def _curves(self):
+        return [self.curve_r, self.curve_p, self.curve_y]
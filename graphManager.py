@@ -1,8 +1,7 @@
 import sys
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QSizePolicy
 from PyQt5.QtCore import QObject, pyqtSignal
-from graph import Graph, rpyGraph
-from collections import deque
+from graph import Graph, rpyGraph, RenderScheduler
 import logging
 
 # Configure logging for the module
@@ -11,54 +10,98 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 class GraphManager(QObject):
     graphs_changed = pyqtSignal()  # Emitted when graphs are added/removed/relaid out
 
-    def __init__(self, grid_layout, telemetry_fields):
+    def __init__(self, grid_layout, telemetry_fields, scheduler=None):
         super().__init__()
         self.grid = grid_layout
         self.telemetry_fields = telemetry_fields  # Dict of field: units for graph creation
         self.graphs = {}  # name: (graph_obj, container)
-        self._max_data_points = 1000  # Configurable buffer size for graphs
+        self._max_data_points = 1000  # Default history capacity (samples) for graphs
+        self._capacities = {}  # name: per-graph capacity overriding the default
+        # Shared render scheduler; created (and owned) here unless one is passed in
+        if scheduler is None:
+            scheduler = RenderScheduler()
+            scheduler.start()
+        self.scheduler = scheduler
 
     def create_graphs_for_fields(self, fields: list[str]):
+        created = 0
         for field in fields:
-            if field in self.graphs:
-                logging.warning(f"Graph for {field} already exists; skipping.")
+            # R/P/Y components share one rpyGraph named after their prefix
+            prefix = self._rpy_prefix(field)
+            name = prefix or field
+            if name in self.graphs:
+                if not prefix:
+                    logging.warning(f"Graph for {field} already exists; skipping.")
                 continue
 
             units = self.telemetry_fields.get(field, "")
-            is_rpy = self._is_rpy_field(field)
-            if is_rpy:
-                # Create rpyGraph for roll/pitch/yaw triplet
-                graph_obj = rpyGraph(field, units)
-                # Update with triplet
-                graph_obj.update = lambda r, p, y: graph_obj.update(r, p, y)  # Bind for main.py calls
+            if prefix:
+                graph_obj = rpyGraph(name, units, scheduler=self.scheduler)
             else:
-                graph_obj = Graph(field, units)
+                graph_obj = Graph(name, units, scheduler=self.scheduler)
 
             # Limit data buffer
-            self._configure_buffer(graph_obj)
+            self._configure_buffer(name, graph_obj)
 
             container = self._create_graph_container(graph_obj)
-            self.graphs[field] = (graph_obj, container)
+            self.graphs[name] = (graph_obj, container)
             self._add_to_grid(container)
+            created += 1
 
         self.rebuild_layout()
         self.graphs_changed.emit()
-        logging.info(f"Created {len(fields)} graphs.")
-
-    def is_rpy_field(self, field: str) -> bool:
-        return any(axis in field for axis in ['_R', '_P', '_Y']) and field in self.telemetry_fields
-
-    def configure_buffer(self, graph_obj):
-        if hasattr(graph_obj, 'data'):
-            graph_obj.data = deque(maxlen=self._max_data_points)
-        if hasattr(graph_obj, 'timestamps'):
-            graph_obj.timestamps = deque(maxlen=self._max_data_points)
-        if hasattr(graph_obj, 'data_r'):
-            graph_obj.data_r = deque(maxlen=self._max_data_points)
-            graph_obj.data_p = deque(maxlen=self._max_data_points)
-            graph_obj.data_y = deque(maxlen=self._max_data_points)
-
-    def create_graph_container(self, graph_obj):
+        logging.info(f"Created {created} graphs.")
+
+    def _rpy_prefix(self, field: str):
+        """Return the prefix of an R/P/Y component field (e.g. GYRO for GYRO_R), else None."""
+        if '_' not in field:
+            return None
+        prefix, axis = field.rsplit('_', 1)
+        if axis not in ('R', 'P', 'Y'):
+            return None
+        if all(f"{prefix}_{a}" in self.telemetry_fields for a in ('R', 'P', 'Y')):
+            return prefix
+        return None
+
+    def _configure_buffer(self, name: str, graph_obj):
+        # Graphs keep their samples in a preallocated ring buffer
+        graph_obj.set_capacity(self._capacities.get(name, self._max_data_points))
+
+    ## History capacity ##
+
+    @property
+    def max_data_points(self) -> int:
+        return self._max_data_points
+
+    def history_capacity(self, name: str) -> int:
+        return self._capacities.get(name, self._max_data_points)
+
+    def set_history_capacity(self, capacity: int, name: str | None = None):
+        """Set how many samples graphs keep, taking effect immediately.
+
+        With `name`, only that graph is changed (and keeps the setting if it
+        is recreated); otherwise the default changes and is applied to every
+        graph without its own override.
+        """
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if name is not None:
+            self._capacities[name] = capacity
+            entry = self.graphs.get(name)
+            if entry:
+                entry[0].set_capacity(capacity)
+            return
+        self._max_data_points = capacity
+        for gname, (graph_obj, _) in self.graphs.items():
+            if gname not in self._capacities:
+                graph_obj.set_capacity(capacity)
+
+    def memory_usage(self) -> dict:
+        """Bytes held by each graph's sample buffers, keyed by graph name."""
+        return {name: graph_obj.memory_usage() for name, (graph_obj, _) in self.graphs.items()}
+
+    def _create_graph_container(self, graph_obj):
         container = QWidget()
         layout = QVBoxLayout()
         layout.setSpacing(0)
@@ -87,11 +130,11 @@ class GraphManager(QObject):
         for name in list(self.graphs.keys()):
             self.remove_graph(name)
 
-    def add_to_grid(self, container):
+    def _add_to_grid(self, container):
         # For incremental adds, but we rebuild anyway
         pass
 
-    def remove_from_grid(self, widget):
+    def _remove_from_grid(self, widget):
         for i in range(self.grid.count()):
             item = self.grid.itemAt(i)
             if item and item.widget() == widget:
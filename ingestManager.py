@@ -0,0 +1,264 @@
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+
+import serial
+
+from linkStats import LinkStats
+from PyQt5.QtCore import QObject, pyqtSignal
+
+DEFAULT_WINDOW = 1024        # packet keys remembered for de-duplication
+DEFAULT_REORDER_DELAY = 0.25  # seconds a packet may wait for a lower PACKET_COUNT
+LAG_SMOOTHING = 0.05          # weight of a new sample in the per-link lag average
+LATE_WINDOW = 100             # a PACKET_COUNT this far below the next one is late, not a restart
+
+class LinkInfo:
+    """Per-link counters kept by IngestManager (on top of the link's own LinkStats)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.first = 0       # packets this link delivered before any other link
+        self.redundant = 0   # copies of packets another link had already delivered
+        self.lag = 0.0       # smoothed seconds behind the fastest link
+        self.max_lag = 0.0
+
+    def add_lag(self, lag):
+        self.lag += LAG_SMOOTHING * (lag - self.lag)
+        self.max_lag = max(self.max_lag, lag)
+
+class IngestManager(QObject):
+    """Merges several redundant telemetry links into one de-duplicated stream.
+
+    Every link is a regular Communication (own port, reader thread, codec
+    and LinkStats). Their packets are keyed by (PACKET_COUNT, MISSION_TIME);
+    a key seen within the last `window` packets is a redundant copy and is
+    dropped after crediting the link's lag. New packets wait at most
+    `reorder_delay` in a small heap so the merged stream comes out in
+    PACKET_COUNT order even when the links interleave. Each check is O(1)
+    (a dict plus a bounded deque), so the cost grows with the packet rate
+    times the number of copies, and the GUI sees each packet once.
+
+    Exposes the same signals as Communication, so GroundStation connects
+    to it in the same way. The links deliver (packet, raw row) pairs and log
+    nothing themselves; the merged stream's raw rows are logged once,
+    through the primary link's log writer, exactly as they were received.
+    """
+    telemetry_received = pyqtSignal(object)
+    lastPacketRecieved = pyqtSignal(str)
+    telemetry_batch = pyqtSignal(list, list)
+    link_stats = pyqtSignal(dict)  # merged counters plus a 'links' list, see snapshot()
+    link_state = pyqtSignal(str, str)  # forwarded from each link
+    link_outage = pyqtSignal(dict)
+    command_status = pyqtSignal(dict)  # from the primary link, which sends the commands
+    replay_finished = pyqtSignal(str)  # replays run on the primary link
+
+    def __init__(self, links, window=DEFAULT_WINDOW, reorder_delay=DEFAULT_REORDER_DELAY):
+        QObject.__init__(self)
+        if not links:
+            raise ValueError("IngestManager needs at least one link")
+        self.links = list(links)
+        self.primary = self.links[0]
+        self.window = window
+        self.reorder_delay = reorder_delay
+        self.log_enabled = True
+        self.log_writer = self.primary.log_writer
+        headers = self.primary.telemetryHeaders
+        self._count_index = headers.index('PACKET_COUNT') if 'PACKET_COUNT' in headers else None
+        self._time_index = headers.index('MISSION_TIME') if 'MISSION_TIME' in headers else None
+        self.info = [LinkInfo(link.serial_port or f"link {i}") for i, link in enumerate(self.links)]
+        self.stats = LinkStats()  # sequence of the merged stream
+        self.redundant = 0
+        self.late = 0             # packets released after a higher PACKET_COUNT
+        self._lock = threading.RLock()
+        self._stats_emitted_at = 0.0
+        self._seen = {}           # key -> first receive time
+        self._order = deque()     # keys in arrival order, evicted past `window`
+        self._heap = []           # (PACKET_COUNT, seq, packet, raw row, receive time)
+        self._seq = 0
+        self._next = None         # PACKET_COUNT the merged stream expects next
+        for i, link in enumerate(self.links):
+            link.log_enabled = False
+            link.deliver_rows = True
+            link.telemetry_received.connect(partial(self._on_packet, i))
+            link.telemetry_batch.connect(partial(self._on_batch, i))
+            link.lastPacketRecieved.connect(self.lastPacketRecieved.emit)
+            link.link_stats.connect(partial(self._on_link_stats, i))
+            link.link_state.connect(self.link_state.emit)
+            link.link_outage.connect(self.link_outage.emit)
+        self.primary.command_status.connect(self.command_status.emit)
+        self.primary.replay_finished.connect(self.replay_finished.emit)
+
+    ## Control ##
+
+    def start(self):
+        """Start every link. The primary's port is opened by the caller, the
+        redundant links' ports are reopened here if they were closed."""
+        for link in self.links[1:]:
+            if link.ser is not None and link.ser.is_open:
+                continue
+            try:
+                link.open_port()
+            except serial.SerialException as e:
+                logging.error(f"Failed to open redundant link {link.serial_port}: {e}")
+                link.ser = None
+        for link in self.links:
+            link.start_communication(None)
+
+    def stop(self):
+        # The primary's log writer outlives its reader so the packets still
+        # held for reordering are logged too
+        for link in self.links:
+            link.stop_communication(keep_log=link is self.primary)
+        self.flush()
+        self.primary.log_writer.stop()
+
+    def flush(self):
+        """Release every packet still held for reordering."""
+        with self._lock:
+            released = []
+            self._release(float('inf'), released)
+            if released:
+                self._emit(released, self.primary.batch_interval > 0)
+
+    def start_replay(self, log_filename, speed=1.0, log=False):
+        """Replay a log through the primary link only (see Communication.start_replay)."""
+        self.stop()
+        self.reset()
+        self.log_enabled = log
+        self.primary.start_replay(log_filename, speed, log=False)
+
+    def stop_replay(self):
+        self.primary.stop_replay()
+        self.primary.log_enabled = False  # stop_replay re-enables the link's own log
+        self.log_enabled = True
+        self.flush()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._seen.clear()
+            self._order.clear()
+            self._heap = []
+            self._next = None
+            self.stats.reset()
+            self.redundant = self.late = 0
+            self.info = [LinkInfo(info.name) for info in self.info]
+
+    ## Ingest ##
+
+    def _on_packet(self, link, item):
+        self._ingest(link, [item], [time.time()], batched=False)
+
+    def _on_batch(self, link, packets, timestamps):
+        self._ingest(link, packets, timestamps, batched=True)
+
+    def _on_link_stats(self, link, _stats):
+        # Arrives every stats_interval even on an idle link, so packets held
+        # for reordering are released and the merged counters reported
+        self._ingest(link, [], [], batched=self.primary.batch_interval > 0)
+        now = time.monotonic()
+        if now - self._stats_emitted_at >= self.primary.stats_interval:
+            self._stats_emitted_at = now
+            try:
+                self.link_stats.emit(self.snapshot())
+            except Exception:
+                pass
+
+    def _key(self, packet):
+        if isinstance(packet, dict):
+            count = packet.get('PACKET_COUNT')
+            mission_time = packet.get('MISSION_TIME')
+        else:
+            count = packet[self._count_index] if self._count_index is not None else None
+            mission_time = packet[self._time_index] if self._time_index is not None else None
+        try:
+            count = int(float(count))
+        except (TypeError, ValueError):
+            count = None
+        return count, mission_time
+
+    def _ingest(self, link, packets, timestamps, batched):
+        """De-duplicate and reorder one delivery from `link`, then log and emit
+        the packets that are due (under the lock, so the merged order holds
+        across reader threads)."""
+        info = self.info[link]
+        with self._lock:
+            released = []
+            for (packet, row), t in zip(packets, timestamps):
+                key = self._key(packet)
+                first = self._seen.get(key)
+                if first is not None:
+                    info.redundant += 1
+                    info.add_lag(max(0.0, t - first))
+                    self.redundant += 1
+                    continue
+                self._seen[key] = t
+                self._order.append(key)
+                if len(self._order) > self.window:
+                    del self._seen[self._order.popleft()]
+                info.first += 1
+                info.add_lag(0.0)
+                if key[0] is None:
+                    released.append((packet, row, t))  # nothing to order by
+                else:
+                    self._seq += 1
+                    heapq.heappush(self._heap, (key[0], self._seq, packet, row, t))
+            self._release(time.time(), released)
+            if released:
+                self._emit(released, batched)
+
+    def _release(self, now, released):
+        heap = self._heap
+        while heap:
+            count, _, packet, row, t = heap[0]
+            if self._next is not None and count > self._next and now - t < self.reorder_delay:
+                break  # still waiting for the gap to be filled by another link
+            heapq.heappop(heap)
+            if self._next is not None and self._next - LATE_WINDOW < count < self._next:
+                self.late += 1
+            else:
+                self.stats.check_sequence(count)
+                self._next = count + 1
+            self.stats.valid += 1
+            released.append((packet, row, t))
+
+    def _emit(self, released, batched):
+        if self.log_enabled:
+            for _, row, _ in released:
+                self.log_writer.write(row)
+        try:
+            if batched:
+                self.telemetry_batch.emit([p for p, _, _ in released], [t for _, _, t in released])
+            else:
+                for packet, _, _ in released:
+                    self.telemetry_received.emit(packet)
+        except Exception:
+            pass
+
+    ## Reporting ##
+
+    def snapshot(self):
+        """Merged-stream counters in LinkStats.snapshot() form, plus per-link detail.
+
+        `missing` counts packets no link delivered. Each entry of 'links' has
+        the link's own LinkStats snapshot plus `first` (packets it delivered
+        first), `redundant` and `lag_ms`/`max_lag_ms` behind the fastest link.
+        """
+        with self._lock:
+            stats = self.stats.snapshot()
+            stats['malformed'] = sum(link.stats.malformed for link in self.links)
+            stats['recovered'] = sum(link.stats.recovered for link in self.links)
+            stats['timeouts'] = sum(link.stats.timeouts for link in self.links)
+            stats['redundant'] = self.redundant
+            stats['late'] = self.late
+            stats['commands'] = self.primary.command_tracker.snapshot()
+            stats['links'] = []
+            for link, info in zip(self.links, self.info):
+                entry = link.stats.snapshot()
+                entry.update(name=info.name, first=info.first, redundant=info.redundant,
+                             lag_ms=info.lag * 1e3, max_lag_ms=info.max_lag * 1e3)
+                stats['links'].append(entry)
+        return stats
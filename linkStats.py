@@ -0,0 +1,85 @@
+import time
+import logging
+from collections import deque
+
+class LinkStats:
+    """Rolling link-quality counters for one telemetry link.
+
+    Counts valid, malformed, recovered (split out of run-together lines),
+    missing (PACKET_COUNT gaps) and duplicate packets, and read timeouts
+    (`timeout` seconds without data). Instead of logging every bad packet
+    or timeout, `summary` returns a one-line report of the counts since
+    the previous summary, at most once per `summary_interval`.
+    """
+
+    COUNTERS = ('valid', 'malformed', 'recovered', 'missing', 'duplicate', 'resets', 'timeouts')
+    # Only a repeat of one of this many recent PACKET_COUNTs is a duplicate;
+    # any other backwards jump means the payload restarted its counter
+    RECENT_COUNTS = 16
+
+    def __init__(self, summary_interval=5.0):
+        self.summary_interval = summary_interval
+        self.reset()
+
+    def reset(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.last_packet_count = None
+        self._recent = deque(maxlen=self.RECENT_COUNTS)
+        self.started = time.monotonic()
+        self._window_start = self.started
+        self._window_base = dict.fromkeys(self.COUNTERS, 0)
+
+    def check_sequence(self, packet_count):
+        """Track PACKET_COUNT continuity; returns False for a duplicate."""
+        last = self.last_packet_count
+        if last is not None and (packet_count == last or packet_count in self._recent):
+            self.duplicate += 1
+            return False
+        if last is None or packet_count == last + 1:
+            pass
+        elif packet_count > last:
+            self.missing += packet_count - last - 1
+        else:
+            # Counter went backwards to a count not seen lately: the payload restarted
+            self.resets += 1
+            self._recent.clear()
+        self.last_packet_count = packet_count
+        self._recent.append(packet_count)
+        return True
+
+    @property
+    def loss(self):
+        """Fraction of expected packets that never arrived."""
+        expected = self.valid + self.missing
+        return self.missing / expected if expected else 0.0
+
+    def snapshot(self):
+        stats = {name: getattr(self, name) for name in self.COUNTERS}
+        stats['loss'] = self.loss
+        stats['last_packet_count'] = self.last_packet_count
+        stats['elapsed'] = time.monotonic() - self.started
+        return stats
+
+    def summary(self, force=False):
+        """Counts since the previous summary as a log line, or None if not due."""
+        now = time.monotonic()
+        span = now - self._window_start
+        if not force and span < self.summary_interval:
+            return None
+        delta = {name: getattr(self, name) - self._window_base[name] for name in self.COUNTERS}
+        self._window_start = now
+        self._window_base = {name: getattr(self, name) for name in self.COUNTERS}
+        if not any(delta.values()):
+            return None
+        parts = ', '.join(f"{delta[name]} {name}" for name in self.COUNTERS if delta[name] or name == 'valid')
+        return f"Link stats (last {span:.1f}s): {parts}; total loss {self.loss:.1%}"
+
+    def log_summary(self, force=False):
+        """Log the summary: WARNING if packets were lost or damaged, else DEBUG."""
+        base = dict(self._window_base)
+        line = self.summary(force)
+        if line is None:
+            return
+        bad = any(getattr(self, name) != base[name] for name in self.COUNTERS if name != 'valid')
+        logging.log(logging.WARNING if bad else logging.DEBUG, line)
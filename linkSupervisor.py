@@ -0,0 +1,101 @@
+import os
+import time
+
+from serial.tools import list_ports
+
+# Link states reported through Communication.link_state
+CONNECTED = 'connected'
+DISCONNECTED = 'disconnected'
+RECONNECTING = 'reconnecting'
+
+DEFAULT_RECONNECT_INITIAL = 0.5  # seconds before the first reopen attempt
+DEFAULT_RECONNECT_MAX = 10.0     # upper bound on the wait between attempts
+
+def port_present(port):
+    """True if `port` is listed by list_ports.comports() (always True for a
+    URL such as tcp:// or udp://, which can only be checked by opening it)."""
+    if not port or '://' in port:
+        return True
+    try:
+        devices = list_ports.comports()
+    except Exception:
+        return True  # enumeration failed; let the open attempt decide
+    target = os.path.realpath(port)  # /dev/serial/by-id/... links to /dev/ttyACM0
+    return any(p.device in (port, target) for p in devices)
+
+class Backoff:
+    """Exponential backoff: initial, initial*factor, ... capped at `maximum`."""
+
+    def __init__(self, initial=DEFAULT_RECONNECT_INITIAL, maximum=DEFAULT_RECONNECT_MAX, factor=2.0):
+        if initial <= 0:
+            raise ValueError("initial delay must be positive")
+        self.initial = initial
+        self.maximum = max(initial, maximum)
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        self.attempts = 0
+
+    def next_delay(self):
+        delay = min(self.maximum, self.initial * self.factor ** self.attempts)
+        self.attempts += 1
+        return delay
+
+class Outage:
+    """One period a link was down, from the error to the successful reopen."""
+
+    def __init__(self, port, error):
+        self.port = port
+        self.error = str(error)
+        self.started = time.time()
+        self._started = time.monotonic()
+        self.ended = None
+        self.duration = None
+        self.attempts = 0
+
+    def close(self, attempts):
+        self.ended = time.time()
+        self.duration = time.monotonic() - self._started
+        self.attempts = attempts
+
+    def as_dict(self):
+        return {'port': self.port, 'error': self.error, 'started': self.started,
+                'ended': self.ended, 'duration': self.duration, 'attempts': self.attempts}
+
+class LinkSupervisor:
+    """Reconnect bookkeeping for one link.
+
+    The reader calls `disconnected` when the port fails, waits `next_delay`
+    seconds between reopen attempts (skipping the attempt while the device
+    is not listed by the OS) and calls `reconnected` once the port is open
+    again. Finished outages are kept in `outages`.
+    """
+
+    def __init__(self, initial=DEFAULT_RECONNECT_INITIAL, maximum=DEFAULT_RECONNECT_MAX):
+        self.backoff = Backoff(initial, maximum)
+        self.state = CONNECTED
+        self.outage = None   # the outage in progress
+        self.outages = []
+
+    def disconnected(self, port, error):
+        self.state = DISCONNECTED
+        self.outage = Outage(port, error)
+        self.backoff.reset()
+
+    def next_delay(self):
+        return self.backoff.next_delay()
+
+    def reconnected(self):
+        """Close the current outage and return it."""
+        outage = self.outage
+        outage.close(self.backoff.attempts)
+        self.outages.append(outage)
+        self.outage = None
+        self.state = CONNECTED
+        return outage
+
+    @property
+    def downtime(self):
+        """Total seconds of finished outages."""
+        return sum(outage.duration for outage in self.outages)
@@ -0,0 +1,306 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import logging
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+INDEX_FILE = 'index.json'
+_SUFFIX = {'gzip': '.gz', 'zstd': '.zst'}
+
+def compress_file(path, compression):
+    """Stream-compress `path` next to itself and delete the original.
+
+    Returns the compressed file name.
+    """
+    target = path + _SUFFIX[compression]
+    tmp = target + '.tmp'
+    with open(path, 'rb') as src:
+        if compression == 'gzip':
+            with gzip.open(tmp, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        else:
+            with open(tmp, 'wb') as raw:
+                with zstandard.ZstdCompressor().stream_writer(raw) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(tmp, target)
+    os.remove(path)
+    return target
+
+def open_segment(path):
+    """Open a (possibly compressed) log segment for reading as bytes."""
+    if path.endswith(_SUFFIX['gzip']):
+        return gzip.open(path, 'rb')
+    if path.endswith(_SUFFIX['zstd']):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is not installed, cannot read {path}")
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, 'rb')
+
+class SegmentIndex:
+    """The `index.json` listing every log segment and its time range.
+
+    Entries are dicts with the segment `file` (relative to the log
+    directory), `session`, `seq`, `rows`, `bytes`, wall-clock `started` /
+    `ended` and the first/last MISSION_TIME. Updated from the writer thread
+    and the compression threads, so every change goes through one lock and
+    is written atomically.
+    """
+
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        self.path = os.path.join(log_dir, INDEX_FILE)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self.segments = json.load(f).get("segments", [])
+        except (FileNotFoundError, ValueError):
+            self.segments = []
+
+    def add(self, entry):
+        with self._lock:
+            self.segments.append(entry)
+            self._save()
+
+    def update(self, session, seq, **changes):
+        with self._lock:
+            for entry in self.segments:
+                if entry["session"] == session and entry["seq"] == seq:
+                    entry.update(changes)
+                    break
+            self._save()
+
+    def select(self, start=None, end=None, sessions=None):
+        """Segments overlapping the wall-clock window [start, end] (and in `sessions`)."""
+        with self._lock:
+            chosen = []
+            for entry in self.segments:
+                if sessions is not None and entry["session"] not in sessions:
+                    continue
+                if start is not None and (entry.get("ended") or time.time()) < start:
+                    continue
+                if end is not None and entry["started"] > end:
+                    continue
+                chosen.append(dict(entry))
+            return chosen
+
+    def find(self, session, seq):
+        with self._lock:
+            for entry in self.segments:
+                if entry["session"] == session and entry["seq"] == seq:
+                    return dict(entry)
+        return None
+
+    def sessions(self):
+        with self._lock:
+            return list(dict.fromkeys(entry["session"] for entry in self.segments))
+
+    def _save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({"segments": self.segments}, f, indent=4)
+        os.replace(tmp, self.path)
+
+class RotatingCsvSink:
+    """CSV log sink that writes one segment file at a time.
+
+    A new segment starts with every session (each `open`), when the
+    current one reaches `max_bytes`, or after `max_seconds`. Closed
+    segments are compressed in the background (`compression` 'gzip' or
+    'zstd') and every segment is listed in `index.json`. Used as the primary
+    sink of `CsvLogWriter` in place of the single data.csv file.
+    """
+
+    def __init__(self, log_dir, header, max_bytes=None, max_seconds=None, compression=None,
+                 time_field='MISSION_TIME', prefix='telemetry'):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}, expected one of {COMPRESSIONS}")
+        if compression == 'zstd' and zstandard is None:
+            logging.warning("zstandard is not installed, compressing log segments with gzip")
+            compression = 'gzip'
+        self.log_dir = log_dir
+        self.header = list(header)
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.compression = compression
+        self.prefix = prefix
+        self.time_index = self.header.index(time_field) if time_field in self.header else None
+        os.makedirs(log_dir, exist_ok=True)
+        self.index = SegmentIndex(log_dir)
+        self.session = None
+        self.seq = 0
+        self._file = None
+        self._writer = None
+        self._entry = None
+        self._compressors = []
+
+    @property
+    def current_file(self):
+        return os.path.join(self.log_dir, self._entry["file"]) if self._entry else None
+
+    ## Sink interface ##
+
+    def open(self):
+        name = time.strftime('%Y%m%d-%H%M%S')
+        session, suffix = name, 1
+        known = set(self.index.sessions())
+        while session in known:
+            suffix += 1
+            session = f"{name}-{suffix}"
+        self.session = session
+        self.seq = 0
+        self._start_segment()
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        self._writer.writerows(rows)
+        entry = self._entry
+        if self.time_index is not None:
+            if entry["first_time"] is None:
+                entry["first_time"] = str(rows[0][self.time_index])
+            entry["last_time"] = str(rows[-1][self.time_index])
+        entry["rows"] += len(rows)
+
+    def flush(self, sync=False):
+        self._file.flush()
+        size = self._file.tell()
+        if sync:
+            os.fsync(self._file.fileno())
+            # Explicit flushes (before an export) also bring the index up to date
+            entry = self._entry
+            self.index.update(entry["session"], entry["seq"], rows=entry["rows"], bytes=size,
+                              first_time=entry["first_time"], last_time=entry["last_time"])
+        age = time.time() - self._entry["started"]
+        if ((self.max_bytes and size >= self.max_bytes)
+                or (self.max_seconds and age >= self.max_seconds)):
+            self._finish_segment()
+            self._start_segment()
+
+    def reset(self):
+        """Close the current segment and continue in a fresh session."""
+        if self._file is None:
+            return
+        self._finish_segment()
+        self.open()
+
+    def close(self):
+        if self._file is not None:
+            self._finish_segment()
+        self.wait_compressed()
+
+    ## Segments ##
+
+    def _start_segment(self):
+        self.seq += 1
+        name = f"{self.prefix}-{self.session}-{self.seq:04d}.csv"
+        path = os.path.join(self.log_dir, name)
+        self._file = open(path, mode='w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.header)
+        self._entry = {
+            "file": name,
+            "session": self.session,
+            "seq": self.seq,
+            "rows": 0,
+            "bytes": None,
+            "started": time.time(),
+            "ended": None,
+            "first_time": None,
+            "last_time": None,
+            "compression": None,
+        }
+        self.index.add(dict(self._entry))
+
+    def _finish_segment(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        size = self._file.tell()
+        self._file.close()
+        self._file = None
+        self._writer = None
+        entry = self._entry
+        self._entry = None
+        self.index.update(entry["session"], entry["seq"], rows=entry["rows"], bytes=size,
+                          ended=time.time(), first_time=entry["first_time"],
+                          last_time=entry["last_time"])
+        if self.compression:
+            # Compress off the writer thread so logging never waits on it
+            self._compressors = [t for t in self._compressors if t.is_alive()]
+            t = threading.Thread(target=self._compress, args=(entry,),
+                                 name="log-compressor", daemon=True)
+            t.start()
+            self._compressors.append(t)
+
+    def _compress(self, entry):
+        try:
+            target = compress_file(os.path.join(self.log_dir, entry["file"]), self.compression)
+            self.index.update(entry["session"], entry["seq"], file=os.path.basename(target),
+                              compression=self.compression, compressed_bytes=os.path.getsize(target))
+        except Exception as e:
+            logging.error(f"Failed to compress log segment {entry['file']}: {e}")
+
+    def wait_compressed(self, timeout=None):
+        for t in self._compressors:
+            t.join(timeout)
+        self._compressors = [t for t in self._compressors if t.is_alive()]
+
+def segment_file(index, entry, opener):
+    """Call `opener(path)` on the segment of `entry`. A segment compressed in
+    the background since `entry` was read is looked up again under its new
+    name. Returns (opener result, current entry)."""
+    try:
+        return opener(os.path.join(index.log_dir, entry["file"])), entry
+    except FileNotFoundError:
+        entry = index.find(entry["session"], entry["seq"]) or entry
+        return opener(os.path.join(index.log_dir, entry["file"])), entry
+
+def copy_segments(index, destination_folder, segments=None, copy=shutil.copy):
+    """Copy the given index entries (default: all) to `destination_folder`
+    with `copy(src, dst)`, then write a matching index.json there.
+
+    Returns the copied entries (with their file names at the time of the copy).
+    """
+    if segments is None:
+        segments = index.select()
+    os.makedirs(destination_folder, exist_ok=True)
+    copied = []
+    for entry in segments:
+        _, entry = segment_file(index, entry,
+                                lambda src: copy(src, os.path.join(destination_folder, os.path.basename(src))))
+        copied.append(entry)
+    with open(os.path.join(destination_folder, INDEX_FILE), 'w') as f:
+        json.dump({"segments": copied}, f, indent=4)
+    return copied
+
+def export_segments(index, destination_folder, segments=None, done=None):
+    """`copy_segments` on a background thread.
+
+    `done(ok, copied_files)` is called from the worker thread when finished.
+    Returns the started thread.
+    """
+    def run():
+        copied = []
+        ok = True
+        try:
+            copied = copy_segments(index, destination_folder, segments)
+            logging.info(f"Exported {len(copied)} log segments to {destination_folder}")
+        except Exception as e:
+            logging.error(f"Error exporting log segments: {e}")
+            ok = False
+        if done is not None:
+            done(ok, [e["file"] for e in copied])
+
+    t = threading.Thread(target=run, name="log-export", daemon=True)
+    t.start()
+    return t
@@ -6,11 +6,17 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QVBoxLa
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer, QPropertyAnimation
 from communication import Communication
+from ingestManager import IngestManager, DEFAULT_WINDOW
 from serial.tools import list_ports
 from typing import Iterable
-from map import GPSMap
+from map import GPSMap, register_tile_scheme
+from tileCache import TileCache, DEFAULT_TILE_URL
 from data import Data
-from graph import Graph, rpyGraph
+from graph import Graph, rpyGraph, RenderScheduler, DEFAULT_CAPACITY, DEFAULT_FPS
+from exportService import ExportService
+from sidebar import SidebarModel, SidebarView, DEFAULT_REFRESH_HZ
+from telemetryRouter import TelemetryRouter
+from replay import parse_mission_time
 import serial
 import time
 
@@ -128,12 +134,45 @@ class GroundStation(QMainWindow):
         screen_geometry = QApplication.desktop().screenGeometry()
 
         self.data = Data() # Get preferences and other data
-        self.comm = Communication(self.data.getPreference("port")) # Initialize communication
+        comm_options = dict(read_mode=self.data.getPreference("read_mode") or 'readline',
+                            codec=self.data.getPreference("codec") or 'csv',
+                            io_backend=self.data.getPreference("io_backend") or 'threads',
+                            reconnect=self.data.getPreference("reconnect") is not False,
+                            reconnect_max=self.data.getPreference("reconnect_max_s") or 10.0,
+                            command_rate=self.data.getPreference("command_rate") or 1.0,
+                            command_burst=self.data.getPreference("command_burst") or 1,
+                            batch_interval=(self.data.getPreference("telemetry_batch_ms") or 0) / 1000.0,
+                            batch_size=self.data.getPreference("telemetry_batch_size") or 50)
+        command_retries = self.data.getPreference("command_retries")  # 0 disables retries
+        self.comm = Communication(self.data.getPreference("port"),
+                                  extra_ports=self.data.getPreference("extra_ports") or (),
+                                  column_store=self.data.getPreference("column_store") or None,
+                                  log_dir=self.data.getPreference("log_dir") or None,
+                                  log_rotate_mb=self.data.getPreference("log_rotate_mb") or None,
+                                  log_rotate_minutes=self.data.getPreference("log_rotate_minutes") or None,
+                                  log_compression=self.data.getPreference("log_compression") or None,
+                                  command_ack_timeout=self.data.getPreference("command_ack_timeout_s") or 2.0,
+                                  command_retries=2 if command_retries is None else command_retries,
+                                  **comm_options) # Initialize communication
+        # Redundant links (e.g. a second radio) each get their own Communication;
+        # the IngestManager merges them into one de-duplicated stream, logged
+        # once through self.comm. Without any, the GUI listens to self.comm.
+        self.ingest = None
+        redundant_ports = self.data.getPreference("redundant_ports") or []
+        if redundant_ports:
+            links = [self.comm] + [Communication(port, csv_filename=None, **comm_options)
+                                   for port in redundant_ports]
+            self.ingest = IngestManager(links,
+                                        window=self.data.getPreference("ingest_window") or DEFAULT_WINDOW,
+                                        reorder_delay=(self.data.getPreference("ingest_reorder_ms") or 250) / 1000.0)
+        self.telemetry_source = self.ingest or self.comm
         # track whether we're currently reading data from serial
         self.reading_data = False
-        # connect Communication's telemetry dict signal to handler
+        # connect Communication's telemetry signals to handlers (batched
+        # delivery is used when telemetry_batch_ms is set)
         try:
-            self.comm.telemetry_received.connect(self.handle_telemetry)
+            self.telemetry_source.telemetry_received.connect(self.handle_telemetry)
+            self.telemetry_source.telemetry_batch.connect(self.handle_telemetry_batch)
         except Exception:
             pass
 
@@ -208,7 +247,14 @@ class GroundStation(QMainWindow):
             self.sidebar_fields = set(pref)
         except Exception:
             self.sidebar_fields = set()
-        self.sidebar_labels = {}
+        # latest values are shown through a model that only repaints changed
+        # cells, at its own refresh rate rather than once per packet
+        self.sidebar_model = SidebarModel(self.data.getTelemetryFields(),
+                                          precision=self.data.getPreference("sidebar_precision"),
+                                          refresh_hz=self.data.getPreference("sidebar_refresh_hz") or DEFAULT_REFRESH_HZ,
+                                          parent=self)
+        self.sidebar_view = SidebarView(self.sidebar_model)
+        self.sidebar_groupbox_layout.addWidget(self.sidebar_view)
         try:
             self.rebuild_sidebar_groupbox()
         except Exception:
@@ -227,6 +273,28 @@ class GroundStation(QMainWindow):
         self.footer_label.setStyleSheet("color: white;")
         self.footer_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         footer_layout.addWidget(self.footer_label)
+        # Link quality counters from Communication.link_stats
+        self.link_stats_label = QLabel("Link: ")
+        self.link_stats_label.setStyleSheet("color: white;")
+        self.link_stats_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        footer_layout.addWidget(self.link_stats_label)
+        # Export progress (hidden unless an export is running)
+        export_row = QHBoxLayout()
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setStyleSheet("color: white;")
+        self.export_cancel_button = QPushButton("Cancel Export")
+        self.export_cancel_button.setStyleSheet('background-color:#505050; color:white; padding:2px;')
+        export_row.addWidget(self.export_progress)
+        export_row.addWidget(self.export_cancel_button)
+        footer_layout.addLayout(export_row)
+        self.export_progress.hide()
+        self.export_cancel_button.hide()
+        # Log exports run on a worker thread so the GUI keeps updating
+        self.export_service = ExportService()
+        self.export_service.progress.connect(self.export_progress.setValue)
+        self.export_service.finished.connect(self.on_export_finished)
+        self.export_cancel_button.clicked.connect(self.export_service.cancel)
 
         ### Graphs layout ###
 
@@ -235,6 +303,16 @@ class GroundStation(QMainWindow):
         self.graphs_widget.setLayout(graphs_layout)
         # GPS map may be optional; keep reference on self
         self.gps_map = None
+        # on-disk MBTiles cache so the map works without internet at the launch site
+        self.tile_cache = None
+        if self.data.getPreference("map_tile_cache"):
+            try:
+                self.tile_cache = TileCache(self.data.getPreference("map_tile_cache"),
+                                            max_bytes=int((self.data.getPreference("map_tile_cache_mb") or 500) * 1e6),
+                                            tile_url=self.data.getPreference("map_tile_url") or DEFAULT_TILE_URL,
+                                            online=self.data.getPreference("map_online") is not False)
+            except Exception as e:
+                print(f"Failed to open tile cache: {e}")
 
         graphs_grid = QGridLayout()
         graphs_grid.setSpacing(2)
@@ -246,12 +324,18 @@ class GroundStation(QMainWindow):
         self.graphs_grid = graphs_grid
         self.graphs = {}  # name -> (graph_obj, container)
         self._graph_grid_pos = 0
+        # column -> graph dispatch table, rebuilt whenever the grid is rebuilt
+        self.router = TelemetryRouter(self.comm.telemetryHeaders)
+        # samples of history kept by each graph's ring buffer
+        self.graph_capacity = self.data.getPreference("graph_history") or DEFAULT_CAPACITY
+        # one shared frame timer repaints only graphs that received new data
+        self.render_scheduler = RenderScheduler(self.data.getPreference("graph_fps") or DEFAULT_FPS)
+        self.render_scheduler.start()
 
         # If GPS preference enabled, create map and add its container into the grid
         if (self.data.getPreference("GPS")):
             self.graphs_widget.setStyleSheet("background-color: #e6e6e6;")
-            self.gps_map = GPSMap()
-            self.gps_map.location_updated.connect(self.gps_map.update_map)
+            self.gps_map = GPSMap(self.tile_cache, follow=self.data.getPreference("map_follow") is not False)
             gps_container = QWidget()
             gps_layout = QVBoxLayout()
             gps_layout.setSpacing(0)
@@ -280,10 +364,28 @@ class GroundStation(QMainWindow):
 
         # Connect communication's last-packet signal for live updates
         try:
-            self.comm.lastPacketRecieved.connect(self.on_last_packet)
+            self.telemetry_source.lastPacketRecieved.connect(self.on_last_packet)
+            self.telemetry_source.link_stats.connect(self.on_link_stats)
+            self.telemetry_source.link_state.connect(self.on_link_state)
+            self.telemetry_source.link_outage.connect(self.on_link_outage)
+            self.telemetry_source.command_status.connect(self.on_command_status)
+            self.telemetry_source.replay_finished.connect(self.on_replay_finished)
         except Exception:
             pass
     
+    def start_links(self):
+        """Start reading the ground station port (and any redundant links)."""
+        if self.ingest is not None:
+            self.ingest.start()
+        else:
+            self.comm.start_communication(None)
+
+    def stop_links(self):
+        if self.ingest is not None:
+            self.ingest.stop()
+        else:
+            self.comm.stop_communication()
+
     def toggle_communication(self):
         """Toggle communication on/off from UI button."""
         try:
@@ -291,21 +393,23 @@ class GroundStation(QMainWindow):
                 # Try to open serial port if needed
                 if self.comm.ser is None and getattr(self.comm, 'serial_port', None):
                     try:
-                        self.comm.ser = serial.Serial(self.comm.serial_port, self.comm.baud_rate, timeout=self.comm.timeout)
+                        self.comm.open_port()
                     except Exception as e:
                         QMessageBox.warning(self, "Serial Error", f"Failed to open serial port {self.comm.serial_port}: {e}")
                         return
                 # start threads
-                self.comm.start_communication(None)
+                self.start_links()
                 self.reading_data = True
                 try:
                     self.start_stop_button.setText("Comm: ON")
                 except Exception:
                     pass
+            elif self.comm.replay is not None:
+                self.stop_replay()
             else:
                 # stop threads
                 try:
-                    self.comm.stop_communication()
+                    self.stop_links()
                 except Exception:
                     pass
                 self.reading_data = False
@@ -319,7 +423,7 @@ class GroundStation(QMainWindow):
     def change_serial_port(self):
         selected_port = self.serial_port_dropdown.currentText()
         if selected_port != self.comm.serial_port:
-            self.comm.stop_communication()
+            self.stop_links()
             self.comm.serial_port = selected_port
             # persist selected port
             try:
@@ -327,10 +431,10 @@ class GroundStation(QMainWindow):
             except Exception:
                 pass
             try:
-                self.comm.ser = serial.Serial(selected_port, self.comm.baud_rate, timeout=self.comm.timeout)
+                self.comm.open_port()
                 print(f"Serial port changed to {selected_port}")
                 if self.reading_data:
-                    self.comm.start_communication(None)
+                    self.start_links()
             except serial.SerialException as e:
                 print(f"Failed to open serial port {selected_port}: {e}")
                 self.comm.ser = None
@@ -343,7 +447,7 @@ class GroundStation(QMainWindow):
         if current_port in available_ports:
             self.serial_port_dropdown.setCurrentText(current_port)
         else:
-            self.comm.stop_communication()
+            self.stop_links()
             self.reading_data = False
             try:
                 self.start_stop_button.setText("Comm: OFF")
@@ -362,15 +466,20 @@ class GroundStation(QMainWindow):
         print(f"Baud rate changed to {selected_baud_rate}")
 
     def change_serial_port_dialog(self):
-        """Open a dialog to let the user pick from available serial ports."""
+        """Open a dialog to let the user pick from available serial ports.
+
+        The field is editable so a tcp://, udp://, pty:// or loop:// port
+        (see transport.py) can be typed in as well.
+        """
         ports = list(get_available_serial_ports())
-        if not ports:
-            QMessageBox.information(self, "No ports", "No serial ports found.")
-            return
-        port, valid = QInputDialog.getItem(self, "Select serial port", "Serial port:", ports, 0, False)
+        current = self.comm.serial_port or ''
+        if '://' in current and current not in ports:
+            ports.insert(0, current)
+        port, valid = QInputDialog.getItem(self, "Select serial port", "Serial port or URL:", ports, 0, True)
+        port = port.strip() if port else port
         if valid and port:
             if port != self.comm.serial_port:
-                self.comm.stop_communication()
+                self.stop_links()
                 self.comm.serial_port = port
                 # persist selected port
                 try:
@@ -378,10 +487,10 @@ class GroundStation(QMainWindow):
                 except Exception:
                     pass
                 try:
-                    self.comm.ser = serial.Serial(port, self.comm.baud_rate, timeout=self.comm.timeout)
+                    self.comm.open_port()
                     print(f"Serial port changed to {port}")
                     if getattr(self, 'reading_data', False):
-                        self.comm.start_communication(None)
+                        self.start_links()
                 except serial.SerialException as e:
                     QMessageBox.warning(self, "Serial Error", f"Failed to open serial port {port}: {e}")
                     self.comm.ser = None
@@ -405,6 +514,41 @@ class GroundStation(QMainWindow):
                 pass
             print(f"Baud rate changed to {selected_baud_rate}")
 
+    def open_replay_dialog(self):
+        """Pick a recorded CSV log and a speed, then play it through the live pipeline."""
+        filename, _ = QFileDialog.getOpenFileName(self, "Select telemetry log", "", "CSV files (*.csv);;All files (*)")
+        if not filename:
+            return
+        speeds = {"1x": 1.0, "10x": 10.0, "As fast as possible": 0}
+        speed, valid = QInputDialog.getItem(self, "Replay speed", "Speed:", list(speeds), 0, False)
+        if not valid:
+            return
+        try:
+            self.telemetry_source.start_replay(filename, speeds[speed])
+        except Exception as e:
+            QMessageBox.warning(self, "Replay Error", f"Failed to replay {filename}: {e}")
+            return
+        self.reading_data = True
+        try:
+            self.start_stop_button.setText("Comm: REPLAY")
+        except Exception:
+            pass
+
+    def on_replay_finished(self, filename: str):
+        """Handler called by `Communication.replay_finished` at the end of the log."""
+        print(f"Replay of {filename} finished")
+        self.stop_replay()
+
+    def stop_replay(self):
+        if self.comm.replay is None:
+            return
+        self.telemetry_source.stop_replay()
+        self.reading_data = False
+        try:
+            self.start_stop_button.setText("Comm: OFF")
+        except Exception:
+            pass
+
     # Close Ground Station
     def closeEvent(self, event):
         try:
@@ -418,7 +562,14 @@ class GroundStation(QMainWindow):
             # stop communication threads and close serial
             try:
                 if hasattr(self, 'comm'):
-                    self.comm.stop_communication()
+                    self.stop_links()
+            except Exception:
+                pass
+
+            # write batched tile access times
+            try:
+                if getattr(self, 'tile_cache', None) is not None:
+                    self.tile_cache.close()
             except Exception:
                 pass
 
@@ -469,6 +620,19 @@ class GroundStation(QMainWindow):
         change_baud_action.triggered.connect(self.change_baud_rate_dialog)
         edit_menu.addAction(change_baud_action)
 
+        replay_action = QAction("Replay Log...", self)
+        replay_action.setShortcut("Ctrl+R")
+        replay_action.triggered.connect(self.open_replay_dialog)
+        edit_menu.addAction(replay_action)
+
+        stop_replay_action = QAction("Stop Replay", self)
+        stop_replay_action.triggered.connect(self.stop_replay)
+        edit_menu.addAction(stop_replay_action)
+
+        export_subset_action = QAction("Export Subset...", self)
+        export_subset_action.triggered.connect(self.export_subset_action)
+        edit_menu.addAction(export_subset_action)
+
         # View menu
         view_menu = menubar.addMenu("&View")
 
@@ -482,20 +646,29 @@ class GroundStation(QMainWindow):
         manage_sidebar_action.triggered.connect(self.open_manage_sidebar_dialog)
         view_menu.addAction(manage_sidebar_action)
 
+        graph_history_action = QAction("Graph History...", self)
+        graph_history_action.triggered.connect(self.open_graph_history_dialog)
+        view_menu.addAction(graph_history_action)
+
         toggle_gps_action = QAction("Toggle GPS Map", self)
         toggle_gps_action.setShortcut("Ctrl+M")
         toggle_gps_action.setCheckable(True)
         toggle_gps_action.setChecked(bool(self.gps_map))
         toggle_gps_action.triggered.connect(self.toggle_gps_map)
         view_menu.addAction(toggle_gps_action)
+
+        follow_gps_action = QAction("Follow GPS Position", self)
+        follow_gps_action.setCheckable(True)
+        follow_gps_action.setChecked(self.data.getPreference("map_follow") is not False)
+        follow_gps_action.triggered.connect(self.set_map_follow)
+        view_menu.addAction(follow_gps_action)
         
         # previously separate create/remove actions; merged into Manage Graphs
 
     def toggle_gps_map(self, checked: bool):
         if checked and self.gps_map is None:
             # create and add GPS map container into grid
-            self.gps_map = GPSMap()
-            self.gps_map.location_updated.connect(self.gps_map.update_map)
+            self.gps_map = GPSMap(self.tile_cache, follow=self.data.getPreference("map_follow") is not False)
             gps_container = QWidget()
             gps_layout = QVBoxLayout()
             gps_layout.setSpacing(0)
@@ -524,6 +697,11 @@ class GroundStation(QMainWindow):
             self.gps_map = None
             self.data.setPreference("GPS", False)
 
+    def set_map_follow(self, checked: bool):
+        self.data.setPreference("map_follow", bool(checked))
+        if self.gps_map is not None:
+            self.gps_map.set_follow(checked)
+
     def open_graph_selector(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Select telemetry fields to graph")
@@ -708,6 +886,27 @@ class GroundStation(QMainWindow):
         dialog.setLayout(layout)
         dialog.exec_()
 
+    def open_graph_history_dialog(self):
+        """Let the user change how many samples each graph keeps."""
+        capacity, valid = QInputDialog.getInt(self, "Graph history", "Samples kept per graph:",
+                                              self.graph_capacity, 10, 1000000, 100)
+        if not valid:
+            return
+        self.set_graph_history(capacity)
+        used = sum(g.memory_usage() for g, _ in self.graphs.values() if g is not None)
+        print(f"Graph history set to {capacity} samples ({used / 1e6:.1f} MB across {len(self.graphs)} graphs)")
+
+    def set_graph_history(self, capacity: int):
+        """Apply a new history capacity to every graph and persist it."""
+        self.graph_capacity = capacity
+        for gobj, _ in self.graphs.values():
+            if gobj is not None:
+                gobj.set_capacity(capacity)
+        try:
+            self.data.setPreference("graph_history", capacity)
+        except Exception:
+            pass
+
     def open_manage_sidebar_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Manage Sidebar")
@@ -765,26 +964,8 @@ class GroundStation(QMainWindow):
         dialog.exec_()
 
     def rebuild_sidebar_groupbox(self):
-        # clear previous widgets
-        try:
-            while self.sidebar_groupbox_layout.count():
-                item = self.sidebar_groupbox_layout.takeAt(0)
-                w = item.widget()
-                if w is not None:
-                    w.setParent(None)
-        except Exception:
-            pass
-
-        # add labels for selected sidebar fields
-        self.sidebar_labels = {}
-        for name in sorted(getattr(self, 'sidebar_fields', set())):
-            lbl = QLabel(f"{name}: ")
-            # ensure the label background matches the groupbox background
-            lbl.setStyleSheet("color: black; font-weight: bold; background-color: #d1d1f0;")
-            lbl.setWordWrap(True)
-            lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.sidebar_groupbox_layout.addWidget(lbl)
-            self.sidebar_labels[name] = lbl
+        # show the selected sidebar fields in the sidebar table
+        self.sidebar_model.set_fields(getattr(self, 'sidebar_fields', set()))
 
     def create_graphs_for_fields(self, selected_fields, fields_units):
         # Only consider numeric fields (those with units)
@@ -812,7 +993,8 @@ class GroundStation(QMainWindow):
                 units = fields_units.get(prefix + '_R', '')
                 if not units:
                     continue
-                g = rpyGraph(graph_name, units)
+                g = rpyGraph(graph_name, units, capacity=self.graph_capacity,
+                             scheduler=self.render_scheduler)
                 container = self.create_graph_container(graph_name, g)
                 self.graphs[graph_name] = (g, container)
                 self._graph_grid_pos += 1
@@ -828,7 +1010,7 @@ class GroundStation(QMainWindow):
             units = fields_units.get(name, '')
             if not units:
                 continue
-            g = Graph(name, units)
+            g = Graph(name, units, capacity=self.graph_capacity, scheduler=self.render_scheduler)
             container = self.create_graph_container(name, g)
             self.graphs[name] = (g, container)
             self._graph_grid_pos += 1
@@ -840,57 +1022,35 @@ class GroundStation(QMainWindow):
         """Route a parsed telemetry `packet` (dict) into graphs and map."""
         if not isinstance(packet, dict):
             return
+        self.handle_telemetry_batch([packet], [time.time()])
 
-        # GPS
-        try:
-            lat = packet.get('GPS_LATITUDE')
-            lon = packet.get('GPS_LONGITUDE')
-            if lat is not None and lon is not None and self.gps_map:
-                try:
-                    self.gps_map.location_updated.emit(float(lat), float(lon))
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    def handle_telemetry_batch(self, packets: list, timestamps: list):
+        """Route a batch of parsed telemetry packets into graphs, map and sidebar.
 
-        # Route values to individual graphs or grouped RPY graphs
-        for key, (gobj, container) in list(self.graphs.items()):
+        Graphs and the map track receive every sample in one call; the sidebar
+        only needs the most recent values.
+        """
+        if not packets:
+            return
+        latest = packets[-1]
+
+        # GPS: the whole batch extends the track; the map draws it on its next frame
+        if self.gps_map:
             try:
-                if isinstance(gobj, rpyGraph):
-                    r = packet.get(f"{key}_R")
-                    p = packet.get(f"{key}_P")
-                    y = packet.get(f"{key}_Y")
-                    if r is None and p is None and y is None:
-                        continue
-                    try:
-                        rr = float(r) if r is not None else 0.0
-                        pp = float(p) if p is not None else 0.0
-                        yy = float(y) if y is not None else 0.0
-                        gobj.update(rr, pp, yy)
-                    except Exception:
-                        pass
-                else:
-                    val = packet.get(key)
-                    if val is None:
-                        continue
-                    try:
-                        gobj.update(float(val))
-                    except Exception:
-                        pass
+                self.gps_map.add_points([(p.get('GPS_LATITUDE'), p.get('GPS_LONGITUDE')) for p in packets
+                                         if p.get('GPS_LATITUDE') is not None and p.get('GPS_LONGITUDE') is not None])
             except Exception:
-                continue
+                pass
 
-        # update sidebar labels for any selected fields
+        # Route values to individual graphs or grouped RPY graphs
         try:
-            for name, lbl in getattr(self, 'sidebar_labels', {}).items():
-                v = packet.get(name)
-                if v is None:
-                    lbl.setText(f"{name}: ")
-                else:
-                    lbl.setText(f"{name}: {v}")
+            self.router.dispatch(packets, timestamps)
         except Exception:
             pass
 
+        # the sidebar model only keeps the newest packet until its next refresh
+        self.sidebar_model.update(latest)
+
     def toggle_fullscreen(self):
         if self.isFullScreen():
             self.showNormal()
@@ -903,12 +1063,65 @@ class GroundStation(QMainWindow):
         print("CSV file has been reset.")
 
     def download_csv_action(self):
-        """Open a file dialog and save the CSV file to the selected location."""
+        """Open a file dialog and export the telemetry log there in the background."""
+        if self.export_service.busy:
+            QMessageBox.information(self, "Export", "An export is already running.")
+            return
         destination_folder = QFileDialog.getExistingDirectory(self, "Select Destination Folder")
-        if self.comm.copy_csv(destination_folder):
-            print(f"CSV file has been downloaded to {destination_folder}")
-        else:
-            print("Failed to download CSV file.")
+        if not destination_folder:
+            return
+        # The worker flushes the log, then copies data.csv or the rotated
+        # segments (with index.json) and the column-store session
+        if self.export_service.export_logs(self.comm, destination_folder):
+            self._show_export_progress()
+
+    def export_subset_action(self):
+        """Export a MISSION_TIME window and/or a subset of columns of the log
+        (every rotated segment that can hold rows in the window)."""
+        if self.export_service.busy:
+            QMessageBox.information(self, "Export", "An export is already running.")
+            return
+        window, ok = QInputDialog.getText(self, "Export Subset",
+                                          "MISSION_TIME window (start-end, e.g. 00:01:00-00:05:00; blank = all):")
+        if not ok:
+            return
+        start = end = None
+        if window.strip():
+            try:
+                first, last = window.split('-', 1)
+                start, end = parse_mission_time(first), parse_mission_time(last)
+            except ValueError:
+                start = end = None
+            if start is None and end is None:
+                QMessageBox.warning(self, "Export Subset", f"Invalid time window: {window}")
+                return
+        columns_text, ok = QInputDialog.getText(self, "Export Subset",
+                                                "Columns (comma separated, blank = all):")
+        if not ok:
+            return
+        columns = [c.strip() for c in columns_text.split(',') if c.strip()] or None
+        unknown = [c for c in columns or [] if c not in self.comm.telemetryHeaders]
+        if unknown:
+            QMessageBox.warning(self, "Export Subset", f"Unknown columns: {', '.join(unknown)}")
+            return
+        destination, _ = QFileDialog.getSaveFileName(self, "Save subset as", "subset.csv", "CSV files (*.csv)")
+        if not destination:
+            return
+        if self.export_service.export_log_subset(self.comm, destination, columns, start, end):
+            self._show_export_progress()
+
+    def _show_export_progress(self):
+        self.export_progress.setValue(0)
+        self.export_progress.show()
+        self.export_cancel_button.show()
+
+    def on_export_finished(self, ok: bool, message: str):
+        """Handler called by `ExportService.finished` from the worker thread."""
+        self.export_progress.hide()
+        self.export_cancel_button.hide()
+        print(message)
+        if not ok:
+            QMessageBox.warning(self, "Export", message)
 
     def load_command_buttons(self):
         """Load commands from commands.json and create buttons in the sidebar."""
@@ -1063,6 +1276,8 @@ class GroundStation(QMainWindow):
             layout.addWidget(container, row, col)
             idx += 1
         self._graph_grid_pos = idx
+        # graphs were added or removed: recompute the packet routing table
+        self.router.rebuild(self.graphs)
 
     def on_last_packet(self, txt: str):
         """Handler called by `Communication.lastPacketRecieved` with raw packet text."""
@@ -1071,8 +1286,54 @@ class GroundStation(QMainWindow):
         except Exception:
             pass
 
+    def on_link_stats(self, stats: dict):
+        """Handler called by `Communication.link_stats` (or `IngestManager.link_stats`,
+        which adds a 'links' list) with the link counters."""
+        try:
+            text = (f"Link: {stats['valid']} valid | {stats['malformed']} malformed | "
+                    f"{stats['recovered']} recovered | {stats['missing']} missing | "
+                    f"{stats['duplicate']} duplicate | loss {stats['loss']:.1%}")
+            commands = stats.get('commands')
+            if commands:
+                p50 = commands['rtt_p50_ms']
+                text += (f" | cmd: {commands['outstanding']} outstanding, {commands['acked']} acked, "
+                         f"{commands['failed']} failed, RTT p50 {'-' if p50 is None else f'≤{p50} ms'}")
+            for link in stats.get('links', ()):
+                text += (f" || {link['name']}: loss {link['loss']:.1%}, "
+                         f"first {link['first']}, lag {link['lag_ms']:.0f} ms")
+            self.link_stats_label.setText(text)
+        except Exception:
+            pass
+
+    def on_link_state(self, port: str, state: str):
+        """Handler called by `Communication.link_state` when a link drops or comes back."""
+        print(f"Link {port}: {state}")
+        if port != self.comm.serial_port or not getattr(self, 'reading_data', False):
+            return
+        try:
+            self.start_stop_button.setText("Comm: ON" if state == 'connected' else f"Comm: {state.upper()}")
+        except Exception:
+            pass
+
+    def on_link_outage(self, outage: dict):
+        """Handler called by `Communication.link_outage` once a dropped link is back."""
+        print(f"Link {outage['port']} was down for {outage['duration']:.1f}s ({outage['error']})")
+
+    def on_command_status(self, command: dict):
+        """Handler called by `Communication.command_status` when a command is
+        acknowledged through CMD_ECHO or given up on."""
+        if command['state'] == 'acked':
+            print(f"Command {command['command']} acknowledged in {command['rtt_ms']:.0f} ms")
+        else:
+            print(f"Command {command['command']} not acknowledged after {command['attempts']} attempts")
+
 # Run the application
 if __name__ == "__main__":
+    # custom URL schemes (offline map tiles) must be registered before the app exists
+    try:
+        register_tile_scheme()
+    except Exception as e:
+        print(f"Could not register the map tile scheme: {e}")
     app = QApplication(sys.argv)
     main_window = GroundStation()
     main_window.hide()
@@ -1,14 +1,208 @@
 import sys
 import os
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject, QBuffer, QIODevice
+from PyQt5.QtWebEngineCore import (QWebEngineUrlScheme, QWebEngineUrlSchemeHandler,
+                                   QWebEngineUrlRequestJob)
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+from PyQt5.QtWebChannel import QWebChannel
+
+from trackSimplify import TrackSimplifier
+
+TILE_SCHEME = b"gstiles"
+ONLINE_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+CACHED_TILE_URL = "gstiles://tile/{z}/{x}/{y}.png"
+LEAFLET_DIR = Path(__file__).resolve().parent / "leaflet"
+DEFAULT_FPS = 30  # max trajectory pushes to the page per second
+INITIAL_ZOOM = 17
+
+def register_tile_scheme():
+    """Register the gstiles:// scheme. Must run before QApplication is created."""
+    scheme = QWebEngineUrlScheme(TILE_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.LocalScheme | QWebEngineUrlScheme.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+class TileSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves gstiles://tile/z/x/y.png from a TileCache.
+
+    Cached tiles are answered immediately; misses are downloaded (when the
+    cache is online) on a small worker pool and answered from the GUI
+    thread once they arrive. Batched access times are written on the same
+    pool.
+    """
+    _tile_ready = pyqtSignal(object, object)  # job, tile bytes or None
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tile-fetch")
+        self._pending = set()
+        self._tile_ready.connect(self._reply)
+
+    def requestStarted(self, job):
+        try:
+            z, x, y = job.requestUrl().path().strip('/').split('.')[0].split('/')
+            z, x, y = int(z), int(x), int(y)
+        except ValueError:
+            job.fail(QWebEngineUrlRequestJob.UrlInvalid)
+            return
+        data = self.cache.get(z, x, y)
+        if data is not None:
+            self._send(job, data)
+            if self.cache.access_due:
+                self.pool.submit(self.cache.flush_access)
+        elif not self.cache.online:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+        else:
+            # The job may be destroyed (page reloaded) before the download ends
+            self._pending.add(job)
+            job.destroyed.connect(lambda *_: self._pending.discard(job))
+            self.pool.submit(self._download, job, z, x, y)
+
+    def _download(self, job, z, x, y):
+        try:
+            data = self.cache.download(z, x, y)
+            self.cache.put(z, x, y, data)
+        except Exception:
+            data = None
+        self._tile_ready.emit(job, data)
+
+    def _reply(self, job, data):
+        if job not in self._pending:
+            return
+        self._pending.discard(job)
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+        else:
+            self._send(job, data)
+
+    def _send(self, job, data):
+        buf = QBuffer(job)  # owned by the job, freed with it
+        buf.setData(data)
+        buf.open(QIODevice.ReadOnly)
+        job.reply(b"image/png", buf)
+
+def install_tile_handler(cache):
+    """Serve gstiles:// from `cache` for every page of the default profile (once)."""
+    profile = QWebEngineProfile.defaultProfile()
+    handler = profile.urlSchemeHandler(TILE_SCHEME)
+    if handler is None:
+        handler = TileSchemeHandler(cache, profile)
+        profile.installUrlSchemeHandler(TILE_SCHEME, handler)
+    return handler
+
+def map_html(latitude, longitude, tile_url, zoom=INITIAL_ZOOM):
+    """The persistent map page (Leaflet is loaded from the bundled leaflet/ folder)."""
+    leaflet_css = (LEAFLET_DIR / "leaflet.css").as_uri()
+    leaflet_js = (LEAFLET_DIR / "leaflet.js").as_uri()
+    return f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+            <meta charset="utf-8" />
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <link rel="stylesheet" href="{leaflet_css}"/>
+            <style>html, body, #map {{ height:100%; margin:0; padding:0; }}</style>
+            </head>
+            <body>
+            <div id="map"></div>
+            <script src="{leaflet_js}"></script>
+            <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+            <script>
+                var map = L.map('map').setView([{latitude}, {longitude}], {zoom});
+                L.tileLayer('{tile_url}', {{ maxZoom: 19 }}).addTo(map);
+
+                // Create a single marker that we'll move later (a circle marker
+                // needs no icon images, which are not bundled)
+                var marker = L.circleMarker([{latitude}, {longitude}], {{ radius: 7 }}).addTo(map);
+                // Flight path, simplified by Python for the overview zoom: final
+                // vertices plus a provisional tail that is replaced on every update
+                var base = [], tail = [];
+                var track = L.polyline([], {{ color: '#d03030', weight: 3 }}).addTo(map);
+                // Finer line for the visible area when zoomed in past the overview
+                var detail = L.polyline([], {{ color: '#d03030', weight: 3 }});
+
+                // Python is told about every view change through the web channel
+                var bridge = null;
+                function reportView() {{
+                    if (!bridge) return;
+                    var b = map.getBounds();
+                    bridge.viewChanged(map.getZoom(), b.getSouth(), b.getWest(), b.getNorth(), b.getEast());
+                }}
+                if (typeof qt !== 'undefined') {{
+                    new QWebChannel(qt.webChannelTransport, function (channel) {{
+                        bridge = channel.objects.bridge;
+                        reportView();
+                    }});
+                }}
+                map.on('moveend', reportView);
+
+                // Exposed functions for Python to call via runJavaScript
+                function setTrack(points, tailPoints) {{
+                    base = points;
+                    tail = tailPoints;
+                    track.setLatLngs(base.concat(tail));
+                }}
+
+                function appendTrack(points, tailPoints, last, follow) {{
+                try {{
+                    for (var i = 0; i < points.length; i++) base.push(points[i]);
+                    tail = tailPoints;
+                    track.setLatLngs(base.concat(tail));  // one redraw for the whole batch
+                    marker.setLatLng(last);
+                    if (follow) map.panTo(last, {{ animate: false }});
+                }} catch (e) {{
+                    console.error('appendTrack error:', e);
+                }}
+                }}
+
+                function setDetail(segments) {{
+                    if (segments === null) {{
+                        map.removeLayer(detail);
+                        track.addTo(map);
+                    }} else {{
+                        detail.setLatLngs(segments);
+                        detail.addTo(map);
+                        map.removeLayer(track);
+                    }}
+                }}
+            </script>
+            </body>
+            </html>
+            """
+
+class MapBridge(QObject):
+    """Web channel object the page calls when the view is zoomed or panned."""
+
+    view_changed = pyqtSignal(int, float, float, float, float)  # zoom, south, west, north, east
+
+    @pyqtSlot(int, float, float, float, float)
+    def viewChanged(self, zoom, south, west, north, east):
+        self.view_changed.emit(zoom, south, west, north, east)
 
 class GPSMap(QWidget, QObject):
+    """Live GPS map with the flight path drawn as a polyline.
+
+    Positions are buffered on the Python side and pushed to the page at
+    most once per frame; repeated positions are dropped. With `follow` the
+    view pans to the newest fix.
+
+    The full-resolution track stays in `self.track` (a TrackSimplifier).
+    The page gets a Douglas-Peucker simplified overview for the zoom it was
+    last built at, extended incrementally as points arrive; zooming out
+    rebuilds it coarser, zooming in swaps in a finer line for just the
+    visible area.
+    """
 
     location_updated = QtCore.pyqtSignal(float, float)
 
-    def __init__(self):
+    def __init__(self, tile_cache=None, follow=True, fps=DEFAULT_FPS):
         super().__init__()
         self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
         self.setMinimumSize(600, 600)
@@ -23,86 +217,144 @@ class GPSMap(QWidget, QObject):
         self.browser = QtWebEngineWidgets.QWebEngineView()
         self.layout.addWidget(self.browser)
 
+        # Tiles come from the on-disk cache when one is given (works offline),
+        # otherwise straight from the tile server
+        self.tile_cache = tile_cache
+        self.tile_url = ONLINE_TILE_URL
+        if tile_cache is not None:
+            try:
+                install_tile_handler(tile_cache)
+                self.tile_url = CACHED_TILE_URL
+            except Exception as e:
+                print(f"Tile cache unavailable, loading tiles online: {e}")
+
+        # The page reports zoom/pan back to us through a web channel
+        self.bridge = MapBridge()
+        self.bridge.view_changed.connect(self.on_view_changed)
+        self.channel = QWebChannel(self.browser.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.browser.page().setWebChannel(self.channel)
+
         # Placeholder for telemetry data
         self.latitude = None
         self.longitude = None
+        self.follow = follow
+        self.track = TrackSimplifier(zoom=INITIAL_ZOOM)
+        self._new_points = False
+        self._page_ready = False
+        self._view = None          # (zoom, south, west, north, east) last reported by the page
+        self._view_dirty = False
+        self._detail = False       # page is showing the zoomed-in detail line
         self.map_file = "live_gps_map.html"
         self.location_updated.connect(self.update_map)
+        self.browser.loadFinished.connect(self._on_load_finished)
 
-        # Timer for periodic updates (drives update_gui)
+        # Frame timer: sends whatever changed since the last frame
         self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_gui)
-        self.timer.start(1000)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(int(1000 / max(1, fps)))
 
         # Create and load the initial persistent map page
         self.create_initial_map()
 
     @pyqtSlot(float, float)
     def update_map(self, latitude: float, longitude: float):
-        try:
-            self.latitude = latitude
-            self.longitude = longitude
+        """Queue one position; it is drawn on the next frame."""
+        self.add_points([(latitude, longitude)])
+
+    def add_points(self, points):
+        """Queue a batch of (lat, lon) positions, skipping repeats of the last one."""
+        last = self.track.last()
+        accepted = []
+        for lat, lon in points:
+            try:
+                point = (float(lat), float(lon))
+            except (TypeError, ValueError):
+                continue
+            if point == last or not (math.isfinite(point[0]) and math.isfinite(point[1])):
+                continue
+            accepted.append(point)
+            last = point
+        if accepted:
+            self.track.append(accepted)
+            self.latitude, self.longitude = last
+            self._new_points = True
 
-            # Run JS on the loaded page to update the marker in-place.
+    def set_follow(self, follow: bool):
+        self.follow = bool(follow)
+        if self.follow and self.latitude is not None and self._page_ready:
+            self._run_js(f"map.panTo([{self.latitude}, {self.longitude}]);")
+
+    @pyqtSlot(int, float, float, float, float)
+    def on_view_changed(self, zoom, south, west, north, east):
+        # Handled on the next frame so a burst of pan events costs one update
+        self._view = (zoom, south, west, north, east)
+        self._view_dirty = True
+
+    def flush(self):
+        """Push track changes and view-dependent detail to the page (once per frame)."""
+        if not self._page_ready:
+            return
+        view_changed, self._view_dirty = self._view_dirty, False
+        if view_changed and self._view[0] < self.track.zoom:
+            # Zoomed out past the overview: rebuild it coarser
+            self._send_track(self.track.rebuild(self._view[0]))
+        new_points, self._new_points = self._new_points, False
+        if new_points:
+            new, tail = self.track.update()
+            last = [self.latitude, self.longitude]
+            self._run_js(f"appendTrack({json.dumps(new)}, {json.dumps(tail)}, {json.dumps(last)}, "
+                         f"{'true' if self.follow else 'false'});")
+        if view_changed or (new_points and self._detail):
+            self._send_detail()
+
+    def _send_detail(self):
+        """Finer line for the visible area (plus a margin) while zoomed in."""
+        zoom, south, west, north, east = self._view
+        if zoom <= self.track.zoom:
+            if self._detail:
+                self._detail = False
+                self._run_js("setDetail(null);")
+            return
+        pad_lat, pad_lon = (north - south) / 2, (east - west) / 2
+        segments = self.track.detail(zoom, south - pad_lat, west - pad_lon, north + pad_lat, east + pad_lon)
+        self._detail = True
+        self._run_js(f"setDetail({json.dumps(segments)});")
+
+    def _send_track(self, points):
+        _, tail = self.track.update()
+        self._run_js(f"setTrack({json.dumps(points)}, {json.dumps(tail)});")
+
+    def _on_load_finished(self, ok):
+        self._page_ready = bool(ok)
+        self._detail = False
+        if ok and len(self.track):
+            # A (re)loaded page starts empty: resend the whole track
+            self._send_track(self.track.rebuild(self.track.zoom))
+            self._run_js(f"marker.setLatLng([{self.latitude}, {self.longitude}]);")
+
+    def _run_js(self, js):
+        try:
             page = self.browser.page()
             if page is not None:
-                js = f"(function(){{ if (typeof updateMarker === 'function') updateMarker({latitude}, {longitude}); }})();"
                 page.runJavaScript(js)
         except Exception as e:
             print(f"Error updating map via JS: {e}")
 
-    def update_gui(self):
-        try:
-            if self.latitude is not None and self.longitude is not None:
-                # Call the JS update function (no full reload)
-                self.update_map(self.latitude, self.longitude)
-        except Exception as e:
-            print(f"Error updating GUI: {e}")
-
     def create_initial_map(self):
         try:
             # Default startup coords (can be changed later via location_updated)
             initial_latitude = 34.7295
             initial_longitude = -86.5853
 
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-            <meta charset="utf-8" />
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
-            <style>html, body, #map {{ height:100%; margin:0; padding:0; }}</style>
-            </head>
-            <body>
-            <div id="map"></div>
-            <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
-            <script>
-                var map = L.map('map').setView([{initial_latitude}, {initial_longitude}], 17);
-                L.tileLayer('https://tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{ maxZoom: 19 }}).addTo(map);
-
-                // Create a single marker that we'll move later
-                var marker = L.marker([{initial_latitude}, {initial_longitude}]).addTo(map);
-
-                // Exposed function for Python to call via runJavaScript
-                function updateMarker(lat, lon) {{
-                try {{
-                    marker.setLatLng([lat, lon]);
-                    map.setView([lat, lon]);
-                }} catch (e) {{
-                    console.error('updateMarker error:', e);
-                }}
-                }}
-            </script>
-            </body>
-            </html>
-            """
+            html = map_html(initial_latitude, initial_longitude, self.tile_url)
 
             # Save and load the HTML file once
             with open(self.map_file, 'w', encoding='utf-8') as f:
                 f.write(html)
 
             # Load the local file into the web view
+            self._page_ready = False
             self.browser.setUrl(QtCore.QUrl.fromLocalFile(os.path.abspath(self.map_file)))
         except Exception as e:
             print(f"Error creating initial map: {e}")
@@ -110,4 +362,4 @@ class GPSMap(QWidget, QObject):
     def start(self):
         """Show the map window and run the Qt event loop."""
         self.win.show()
-        sys.exit(self.app.exec_())
\ No newline at end of file
+        sys.exit(self.app.exec_())
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+RECORD_FORMATS = ('dict', 'tuple', 'record')
+
+def _to_float(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+class PacketParser:
+    """Telemetry packet parser compiled once from the `telemetryFields` schema.
+
+    Every numeric (unit-bearing) column gets the same float() conversion and
+    text columns pass through untouched, so the schema compiles to the list
+    of numeric column indices and parsing a packet is a single float() pass
+    over them instead of a name lookup and membership test per field.
+    Packets can be emitted as a dict (the historical format), a plain
+    tuple, or a `TelemetryRecord` namedtuple.
+    """
+
+    def __init__(self, telemetry_fields: dict, record_format: str = 'dict'):
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(f"Unknown record format {record_format!r}, expected one of {RECORD_FORMATS}")
+        self.record_format = record_format
+        self.headers = tuple(telemetry_fields.keys())
+        # numeric fields are fields with non-empty unit values
+        self.numeric_fields = frozenset(f for f, unit in telemetry_fields.items() if unit)
+        self.numeric_indices = tuple(i for i, f in enumerate(self.headers) if f in self.numeric_fields)
+        self.field_index = {name: idx for idx, name in enumerate(self.headers)}
+        # rename=True keeps the record usable even if a header is not a valid identifier
+        self.Record = namedtuple('TelemetryRecord', self.headers, rename=True)
+        self._width = len(self.headers)
+        self._build = {
+            'dict': lambda values: dict(zip(self.headers, values)),
+            'tuple': tuple,
+            'record': self.Record._make,
+        }[record_format]
+
+    def __len__(self):
+        return self._width
+
+    def convert(self, fields):
+        """Return a list of converted column values for already-split `fields`."""
+        values = list(fields[:self._width])
+        if len(values) < self._width:
+            values.extend([None] * (self._width - len(values)))
+        try:
+            # Fast path: every numeric column is well formed
+            for idx in self.numeric_indices:
+                values[idx] = float(values[idx])
+        except (ValueError, TypeError):
+            # Redo the numeric columns one at a time; bad values become None
+            for idx in self.numeric_indices:
+                values[idx] = _to_float(fields[idx] if idx < len(fields) else None)
+        return values
+
+    def parse_fields(self, fields):
+        """Parse an already-split packet into the configured record format."""
+        return self._build(self.convert(fields))
+
+    def build(self, values):
+        """Wrap values that are already converted (e.g. from a binary frame)."""
+        return self._build(values)
+
+    def parse_line(self, line: str):
+        return self.parse_fields(line.split(','))
+
+    def to_dict(self, values):
+        """Convert a tuple/record produced by this parser back to a dict."""
+        return dict(zip(self.headers, values))
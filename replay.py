@@ -0,0 +1,217 @@
+import bisect
+import mmap
+import threading
+import time
+import logging
+
+def parse_mission_time(value):
+    """Seconds from a MISSION_TIME value ('hh:mm:ss[.ss]', 'mm:ss' or plain seconds)."""
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8', errors='ignore')
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        seconds = 0.0
+        for part in value.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+class ReplaySource:
+    """Serial-port stand-in that plays back a recorded telemetry CSV log.
+
+    Exposes the subset of the pySerial API that `Communication` uses
+    (`read`, `readline`, `in_waiting`, `write`, `flush`, `close`, `is_open`),
+    so it can be assigned to `Communication.ser` and fed through the normal
+    reader thread. Lines are released according to the spacing of their
+    MISSION_TIME column divided by `speed`; a speed of 0 (or None) plays as
+    fast as the reader can consume. The file is memory-mapped and scanned
+    line by line, so large logs are never loaded into memory.
+    """
+
+    INDEX_STRIDE = 256  # lines between seek index entries
+
+    def __init__(self, filename, speed=1.0, time_field='MISSION_TIME', timeout=1.0, loop=False):
+        self.filename = filename
+        self.timeout = timeout
+        self.loop = loop
+        self._file = open(filename, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError(f"Replay log {filename} is empty")
+        self.size = len(self._mm)
+        self.is_open = True
+
+        # Header: locate the time column and the first data line
+        end = self._line_end(0)
+        header = self._mm[0:end].decode('utf-8', errors='ignore').strip().split(',')
+        self.headers = header
+        self._time_col = header.index(time_field) if time_field in header else None
+        self._data_start = min(end + 1, self.size)
+
+        self._pos = self._data_start     # next byte handed to the reader
+        self._ready_end = self._pos      # end of the lines that are due now
+        self._next = None                # (line_end, due) of the first line not yet due
+        self._anchor = None              # (wall clock, log time) pacing reference
+        self._index = None               # [(log time, offset)] built on first seek
+        self.lines_replayed = 0
+        # seek/set_speed may be called from the GUI while the reader thread reads
+        self._lock = threading.Lock()
+        self.set_speed(speed)
+
+    ## Pacing ##
+
+    def set_speed(self, speed):
+        """Change playback speed (1.0 = real time, 0/None = as fast as possible)."""
+        with self._lock:
+            self.speed = speed or 0
+            self._anchor = None
+            self._next = None
+
+    def _line_end(self, pos):
+        end = self._mm.find(b'\n', pos)
+        return self.size - 1 if end < 0 else end
+
+    def _line_time(self, pos, end):
+        if self._time_col is None:
+            return None
+        fields = self._mm[pos:end].split(b',', self._time_col + 1)
+        if len(fields) <= self._time_col:
+            return None
+        return parse_mission_time(fields[self._time_col])
+
+    def _advance_ready(self):
+        """Extend the due region over every line whose replay time has come."""
+        now = time.monotonic()
+        while self._ready_end < self.size:
+            if self._next is None:
+                end = self._line_end(self._ready_end)
+                due = now
+                if self.speed:
+                    t = self._line_time(self._ready_end, end)
+                    if t is not None:
+                        if self._anchor is None:
+                            self._anchor = (now, t)
+                        due = self._anchor[0] + (t - self._anchor[1]) / self.speed
+                self._next = (end, due)
+            end, due = self._next
+            if due > now:
+                return due
+            self._ready_end = end + 1
+            self._next = None
+            self.lines_replayed += 1
+        return None
+
+    ## pySerial-compatible API ##
+
+    @property
+    def in_waiting(self):
+        with self._lock:
+            self._advance_ready()
+            return self._ready_end - self._pos
+
+    @property
+    def finished(self):
+        return self._pos >= self.size
+
+    def read(self, size=1):
+        """Return up to `size` due bytes, waiting at most `timeout` for the next line."""
+        if not self._wait_ready():
+            return b''
+        with self._lock:
+            end = min(self._ready_end, self._pos + size)
+            data = self._mm[self._pos:end]
+            self._pos = end
+        return data
+
+    def readline(self):
+        if not self._wait_ready():
+            return b''
+        with self._lock:
+            end = min(self._line_end(self._pos) + 1, self._ready_end)
+            data = self._mm[self._pos:end]
+            self._pos = end
+        return data
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + (self.timeout or 0)
+        while self.is_open:
+            with self._lock:
+                next_due = self._advance_ready()
+                if self._ready_end > self._pos:
+                    return True
+            if self.finished:
+                if self.loop:
+                    self.seek(None)
+                    continue
+                return False  # the reader sees `finished` and ends the replay
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            time.sleep(max(0.0, min(next_due, deadline) - now))
+        return False
+
+    def write(self, data):
+        # Commands have nowhere to go during a replay
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._mm.close()
+            self._file.close()
+
+    ## Seeking ##
+
+    def _build_index(self):
+        """Record (log time, offset) every INDEX_STRIDE lines in one streaming pass."""
+        index = []
+        pos = self._data_start
+        n = 0
+        while pos < self.size:
+            end = self._line_end(pos)
+            if n % self.INDEX_STRIDE == 0:
+                t = self._line_time(pos, end)
+                if t is not None:
+                    index.append((t, pos))
+            n += 1
+            pos = end + 1
+        self._index = index
+
+    def seek(self, mission_time):
+        """Jump to the first line at or after `mission_time` seconds (None = start)."""
+        with self._lock:
+            self._seek(mission_time)
+        logging.info(f"Replay of {self.filename} positioned at byte {self._pos}")
+
+    def _seek(self, mission_time):
+        pos = self._data_start
+        if mission_time is not None and self._time_col is not None:
+            if self._index is None:
+                self._build_index()
+            i = bisect.bisect_right(self._index, (mission_time, self.size)) - 1
+            if i >= 0:
+                pos = self._index[i][1]
+            while pos < self.size:
+                end = self._line_end(pos)
+                t = self._line_time(pos, end)
+                if t is not None and t >= mission_time:
+                    break
+                pos = end + 1
+        self._pos = self._ready_end = min(pos, self.size)
+        self._next = None
+        self._anchor = None
+
+    @property
+    def progress(self):
+        """Fraction of the log handed to the reader so far."""
+        span = self.size - self._data_start
+        return 1.0 if span <= 0 else (self._pos - self._data_start) / span
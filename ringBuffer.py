@@ -0,0 +1,88 @@
+import numpy as np
+
+class RingBuffer:
+    """Preallocated ring buffer of float columns backed by a NumPy array.
+
+    Every sample is stored twice (at slot i and i + capacity), so the newest
+    `len(self)` samples of a column are always one contiguous slice and
+    `view` can hand it to pyqtgraph without copying or converting. Appending
+    costs the same no matter how large the capacity is.
+    """
+
+    def __init__(self, capacity: int, columns: int = 1, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.columns = columns
+        self.dtype = dtype
+        self._data = np.zeros((columns, 2 * self.capacity), dtype=dtype)
+        self._head = 0  # next slot to write, in [0, capacity)
+        self._size = 0
+        self.total = 0  # samples ever appended (not reduced by wrap-around)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Memory held by the backing array, in bytes."""
+        return self._data.nbytes
+
+    def append(self, *values):
+        """Append one sample (one value per column)."""
+        head = self._head
+        self._data[:, head] = values
+        self._data[:, head + self.capacity] = values
+        head += 1
+        self._head = 0 if head == self.capacity else head
+        if self._size < self.capacity:
+            self._size += 1
+        self.total += 1
+
+    def extend(self, *columns):
+        """Append several samples given as one sequence per column."""
+        block = np.asarray(columns, dtype=self.dtype).reshape(self.columns, -1)
+        n = block.shape[1]
+        if n == 0:
+            return
+        cap = self.capacity
+        if n >= cap:
+            block = block[:, -cap:]
+            self._data[:, :cap] = block
+            self._data[:, cap:] = block
+            self._head = 0
+            self._size = cap
+        else:
+            slots = (self._head + np.arange(n)) % cap
+            self._data[:, slots] = block
+            self._data[:, slots + cap] = block
+            self._head = (self._head + n) % cap
+            self._size = min(cap, self._size + n)
+        self.total += n
+
+    def view(self, column: int = 0):
+        """Contiguous read-only view of a column, oldest sample first."""
+        end = self._head + self.capacity
+        out = self._data[column, end - self._size:end]
+        out.flags.writeable = False
+        return out
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the newest samples that still fit."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if capacity == self.capacity:
+            return
+        keep = [self.view(c)[-capacity:].copy() for c in range(self.columns)]
+        total = self.total
+        self.capacity = int(capacity)
+        self._data = np.zeros((self.columns, 2 * self.capacity), dtype=self.dtype)
+        self._head = 0
+        self._size = 0
+        if keep and len(keep[0]):
+            self.extend(*keep)
+        self.total = total
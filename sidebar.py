@@ -0,0 +1,143 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+DEFAULT_PRECISION = 2
+DEFAULT_REFRESH_HZ = 10
+_UNSET = object()  # marks rows that have not been drawn yet
+
+def make_formatter(unit: str, precision: int = DEFAULT_PRECISION):
+    """Build the value -> text function for one field once, up front.
+
+    Numeric (unit-bearing) fields are rendered with a fixed precision and
+    their unit; text fields are shown as they are.
+    """
+    if not unit:
+        return str
+    template = f"{{:.{precision}f}} {unit}".format
+
+    def fmt(value):
+        try:
+            return template(value)
+        except (ValueError, TypeError):
+            return str(value)
+    return fmt
+
+class SidebarModel(QAbstractTableModel):
+    """Latest telemetry values for the sidebar, one row per selected field.
+
+    `update` only records the newest packet, so it is cheap at any packet
+    rate. A timer calls `refresh` at `refresh_hz`, which formats the fields
+    whose value changed since the last refresh and emits `dataChanged` for
+    just those rows; unchanged rows are never laid out again.
+    """
+
+    def __init__(self, fields_units: dict, fields=(), precision=None, refresh_hz=DEFAULT_REFRESH_HZ,
+                 parent=None):
+        QAbstractTableModel.__init__(self, parent)
+        self.fields_units = dict(fields_units or {})
+        self.precision = dict(precision or {})
+        self.headers = list(self.fields_units.keys())
+        self._packet = None
+        self._dirty = False
+        self.refreshes = 0
+        self.rows_changed = 0
+        self.set_fields(fields)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.set_refresh_rate(refresh_hz)
+
+    def set_refresh_rate(self, refresh_hz):
+        self.refresh_hz = max(1, refresh_hz or DEFAULT_REFRESH_HZ)
+        self.timer.start(int(1000 / self.refresh_hz))
+
+    def set_fields(self, fields):
+        """Change the displayed fields (sorted by name, like the old labels)."""
+        self.beginResetModel()
+        self.fields = sorted(fields)
+        index = {name: i for i, name in enumerate(self.headers)}
+        # Column positions for tuple/record packets; dict packets are read by name
+        self._columns = [index.get(name) for name in self.fields]
+        self._formatters = [make_formatter(self.fields_units.get(name, ''),
+                                           self.precision.get(name, self.precision.get('default', DEFAULT_PRECISION)))
+                            for name in self.fields]
+        self._shown = [_UNSET] * len(self.fields)  # raw value currently displayed
+        self._text = [''] * len(self.fields)      # formatted display text
+        self._dirty = self._packet is not None
+        self.endResetModel()
+
+    def update(self, packet):
+        """Remember the newest packet; the view catches up on the next refresh."""
+        self._packet = packet
+        self._dirty = True
+
+    def refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        packet = self._packet
+        if isinstance(packet, dict):
+            values = [packet.get(name) for name in self.fields]
+        else:
+            values = [packet[c] if c is not None and c < len(packet) else None for c in self._columns]
+        first = last = None
+        shown, text, formatters = self._shown, self._text, self._formatters
+        for row, value in enumerate(values):
+            if value == shown[row]:
+                continue
+            shown[row] = value
+            text[row] = '' if value is None else formatters[row](value)
+            self.rows_changed += 1
+            if first is None:
+                first = row
+            elif row != last + 1:
+                self._emit_rows(first, last)
+                first = row
+            last = row
+        if first is not None:
+            self._emit_rows(first, last)
+        self.refreshes += 1
+
+    def _emit_rows(self, first, last):
+        self.dataChanged.emit(self.index(first, 1), self.index(last, 1), [Qt.DisplayRole])
+
+    ## QAbstractTableModel interface ##
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            row = index.row()
+            return self.fields[row] if index.column() == 0 else self._text[row]
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ("Field", "Value")[section]
+        return None
+
+class SidebarView(QTableView):
+    """Read-only two-column table (field, value) for a SidebarModel."""
+
+    def __init__(self, model: SidebarModel, parent=None):
+        QTableView.__init__(self, parent)
+        self.setModel(model)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        # Rows have a fixed height so a value change never triggers a relayout
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.setStyleSheet("QTableView { color: black; font-weight: bold; background-color: #d1d1f0; border: none; }")
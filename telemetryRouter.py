@@ -0,0 +1,76 @@
+class TelemetryRouter:
+    """Field-to-graph dispatch table, rebuilt only when graphs change.
+
+    `rebuild` resolves every graph to the column indices it plots (one
+    column for a Graph, three for an rpyGraph's R/P/Y fields) and keeps
+    the resulting (indices, sink) pairs. `dispatch` then transposes a batch
+    of packets into columns once and hands each sink its columns, with no
+    per-packet name lookups, type checks or float conversions (the packet
+    parser already produced floats).
+    """
+
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.field_index = {name: i for i, name in enumerate(self.headers)}
+        self.routes = []  # (column indices, sink, rpy?)
+
+    def __len__(self):
+        return len(self.routes)
+
+    def rebuild(self, graphs: dict):
+        """Recompute routes from a {name: (graph, container)} mapping."""
+        routes = []
+        for name, (graph, _) in graphs.items():
+            if graph is None:
+                continue  # e.g. the GPS map placeholder
+            columns = self._columns_for(name, getattr(graph, '_columns', 2))
+            if columns is None:
+                continue
+            routes.append((columns, graph.update_batch, len(columns) == 3))
+        self.routes = routes
+
+    def _columns_for(self, name, graph_columns):
+        if graph_columns == 4:
+            # rpyGraph named after the prefix of its R/P/Y fields
+            idx = [self.field_index.get(f"{name}_{axis}") for axis in ('R', 'P', 'Y')]
+            return None if None in idx else tuple(idx)
+        idx = self.field_index.get(name)
+        return None if idx is None else (idx,)
+
+    def dispatch(self, packets, timestamps):
+        """Route a batch of parsed packets (dicts in header order, tuples or records)."""
+        if not packets or not self.routes:
+            return
+        if isinstance(packets[0], dict):
+            columns = list(zip(*(p.values() for p in packets)))
+        else:
+            columns = list(zip(*packets))
+        timestamps = list(timestamps)
+        for idx, sink, rpy in self.routes:
+            if rpy:
+                r, p, y = columns[idx[0]], columns[idx[1]], columns[idx[2]]
+                if None in r or None in p or None in y:
+                    r, p, y, ts = _fill_rpy(r, p, y, timestamps)
+                    sink(r, p, y, ts)
+                else:
+                    sink(list(r), list(p), list(y), timestamps)
+            else:
+                vals = columns[idx[0]]
+                if None in vals:
+                    # Drop the samples whose value did not parse
+                    pairs = [(v, t) for v, t in zip(vals, timestamps) if v is not None]
+                    sink([v for v, _ in pairs], [t for _, t in pairs])
+                else:
+                    sink(list(vals), timestamps)
+
+def _fill_rpy(r, p, y, timestamps):
+    """Skip samples with no R/P/Y value at all; missing components plot as 0."""
+    rs, ps, ys, ts = [], [], [], []
+    for rr, pp, yy, t in zip(r, p, y, timestamps):
+        if rr is None and pp is None and yy is None:
+            continue
+        rs.append(0.0 if rr is None else rr)
+        ps.append(0.0 if pp is None else pp)
+        ys.append(0.0 if yy is None else yy)
+        ts.append(t)
+    return rs, ps, ys, ts
@@ -0,0 +1,113 @@
+"""Dispatch benchmark: per-packet dictionary scan vs precomputed routing table.
+
+Routes one telemetry batch into an increasing number of (fake) graphs, with
+the loop GroundStation.handle_telemetry_batch used to run and with
+TelemetryRouter.
+
+Usage (from the repository root):
+    python tests/bench_dispatch.py [packets_per_batch]
+"""
+import sys
+import time
+
+from bench_utils import make_packet
+
+from data import Data
+from packetParser import PacketParser
+from telemetryRouter import TelemetryRouter
+
+
+class FakeGraph:
+    _columns = 2
+
+    def update_batch(self, values, timestamps):
+        pass
+
+
+class FakeRpyGraph(FakeGraph):
+    _columns = 4
+
+    def update_batch(self, rs, ps, ys, timestamps):
+        pass
+
+
+def legacy_dispatch(graphs, packets, timestamps):
+    """The per-batch loop that predates TelemetryRouter."""
+    for key, (gobj, container) in list(graphs.items()):
+        if isinstance(gobj, FakeRpyGraph):
+            rs, ps, ys, ts = [], [], [], []
+            for packet, t in zip(packets, timestamps):
+                r = packet.get(f"{key}_R")
+                p = packet.get(f"{key}_P")
+                y = packet.get(f"{key}_Y")
+                if r is None and p is None and y is None:
+                    continue
+                try:
+                    rr = float(r) if r is not None else 0.0
+                    pp = float(p) if p is not None else 0.0
+                    yy = float(y) if y is not None else 0.0
+                except Exception:
+                    continue
+                rs.append(rr)
+                ps.append(pp)
+                ys.append(yy)
+                ts.append(t)
+            gobj.update_batch(rs, ps, ys, ts)
+        elif gobj is not None:
+            vals, ts = [], []
+            for packet, t in zip(packets, timestamps):
+                val = packet.get(key)
+                if val is None:
+                    continue
+                try:
+                    vals.append(float(val))
+                except Exception:
+                    continue
+                ts.append(t)
+            gobj.update_batch(vals, ts)
+
+
+def make_graphs(fields, n):
+    """Build up to n graphs: the RPY groups first, then single numeric fields."""
+    graphs = {}
+    numeric = [f for f, unit in fields.items() if unit]
+    prefixes = sorted({f.rsplit('_', 1)[0] for f in numeric
+                       if f.endswith(('_R', '_P', '_Y'))
+                       and all(f"{f.rsplit('_', 1)[0]}_{a}" in fields for a in 'RPY')})
+    grouped = {f"{p}_{a}" for p in prefixes for a in 'RPY'}
+    candidates = [(p, FakeRpyGraph()) for p in prefixes]
+    candidates += [(f, FakeGraph()) for f in numeric if f not in grouped]
+    for name, graph in candidates[:n]:
+        graphs[name] = (graph, None)
+    return graphs
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    fields = Data().getTelemetryFields()
+    parser = PacketParser(fields)
+    headers = list(fields)
+    packets = [parser.parse_line(make_packet(headers, n)) for n in range(batch)]
+    timestamps = [time.time()] * batch
+    router = TelemetryRouter(headers)
+    max_graphs = len(make_graphs(fields, 1000))
+
+    print(f"{batch} packets per batch, time per packet")
+    print(f"  {'graphs':>6} {'legacy':>10} {'router':>10} {'speedup':>8}")
+    for n in range(1, max_graphs + 1):
+        graphs = make_graphs(fields, n)
+        router.rebuild(graphs)
+        legacy = timeit(lambda: legacy_dispatch(graphs, packets, timestamps), 200) / batch
+        routed = timeit(lambda: router.dispatch(packets, timestamps), 200) / batch
+        print(f"  {n:>6} {legacy * 1e6:>8.2f}us {routed * 1e6:>8.2f}us {legacy / routed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
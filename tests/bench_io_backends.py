@@ -0,0 +1,89 @@
+"""CPU cost of the threaded reader vs the asyncio I/O core.
+
+A separate feeder process sends CSV telemetry datagrams at a fixed rate to
+one or more local UDP ports. The receiving side is either one threaded
+Communication per link (reader + sender + log writer threads each) or a
+single asyncio Communication multiplexing every link, the command queue
+and the log writer in one loop thread. Only the receiving process's CPU
+time is measured.
+
+Usage (from the repository root):
+    python tests/bench_io_backends.py [seconds] [rate_per_link]
+"""
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+
+from bench_utils import make_packet
+
+from communication import Communication
+from data import Data
+
+BASE_PORT = 47600
+
+
+def feed(ports, rate, seconds, headers):
+    """Send `rate` packets/s to every port for `seconds` (runs in its own process)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.monotonic()
+    sent = 0
+    while True:
+        elapsed = time.monotonic() - start
+        if elapsed >= seconds:
+            break
+        due = int(elapsed * rate)
+        while sent < due:
+            packet = (make_packet(headers, sent) + '\n').encode()
+            for port in ports:
+                sock.sendto(packet, ('127.0.0.1', port))
+            sent += 1
+        time.sleep(0.001)
+
+
+def measure(backend, links, rate, seconds, tmp):
+    ports = [BASE_PORT + i for i in range(links)]
+    urls = [f"udp://127.0.0.1:{port}" for port in ports]
+    if backend == 'asyncio':
+        comms = [Communication(urls[0], timeout=1, csv_filename=os.path.join(tmp, 'a.csv'),
+                               read_mode='chunked', batch_interval=0.033, io_backend='asyncio',
+                               extra_ports=urls[1:])]
+    else:
+        comms = [Communication(url, timeout=1, csv_filename=os.path.join(tmp, f't{i}.csv'),
+                               read_mode='chunked', batch_interval=0.033)
+                 for i, url in enumerate(urls)]
+    headers = list(Data().getTelemetryFields())
+    feeder = multiprocessing.Process(target=feed, args=(ports, rate, seconds, headers))
+    for comm in comms:
+        comm.start_communication(None)
+    cpu = time.process_time()
+    feeder.start()
+    feeder.join()
+    time.sleep(0.2)  # let the last datagrams drain
+    cpu = time.process_time() - cpu
+    for comm in comms:
+        comm.stop_communication()
+    packets = sum(comm.receivedPacketCount for comm in comms)
+    return packets, cpu
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"UDP links at {rate:.0f} packets/s each, {seconds:.0f}s per run (receiver CPU only)")
+    print(f"  {'backend':>8} {'links':>5} {'packets':>8} {'ms CPU/1k pkts':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for links in (1, 2, 4):
+            for backend in ('threads', 'asyncio'):
+                packets, cpu = measure(backend, links, rate, seconds, tmp)
+                per_k = cpu / max(packets, 1) * 1e6
+                print(f"  {backend:>8} {links:>5} {packets:>8} {per_k:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Load test: the full receive pipeline fed by the synthetic loop:// transport.
+
+Runs Communication's reader thread (framing, parsing, sequence checks,
+batching and the log writer) against LoopbackTransport at increasing
+packet rates and reports the delivered rate and the CPU it cost (the
+CPU figure includes generating the synthetic packets, which runs in the
+reader thread).
+
+Usage (from the repository root):
+    python tests/bench_loopback.py [seconds_per_rate] [codec]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import bench_utils  # noqa: F401  (sys.path and PyQt5 stub)
+
+from communication import Communication
+
+RATES = (100, 1000, 5000, 0)  # packets/s; 0 = as fast as the pipeline reads
+
+
+def run(rate, seconds, codec, csv_filename):
+    comm = Communication(serial_port=f"loop://?rate={rate}", timeout=0.2, csv_filename=csv_filename,
+                         read_mode='chunked', codec=codec, batch_interval=0.033)
+    comm.reading = True
+    comm.log_writer.start()
+    reader = threading.Thread(target=comm.read, args=(None,))
+    cpu = time.process_time()
+    start = time.perf_counter()
+    reader.start()
+    time.sleep(seconds)
+    comm.reading = False
+    reader.join()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    comm.log_writer.stop()
+    packets = comm.receivedPacketCount
+    return packets / elapsed, cpu / elapsed, cpu / max(packets, 1) * 1e3, comm.stats.snapshot()
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    codec = sys.argv[2] if len(sys.argv) > 2 else 'csv'
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"loop:// transport, {codec} codec, {seconds:.0f}s per rate")
+    print(f"  {'target':>8} {'delivered':>10} {'CPU':>6} {'ms CPU/1k pkts':>15} {'missing':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rate in RATES:
+            delivered, load, per_k, stats = run(rate, seconds, codec, os.path.join(tmp, 'bench.csv'))
+            target = f"{rate}/s" if rate else "max"
+            print(f"  {target:>8} {delivered:>8.0f}/s {load:>5.0%} {per_k * 1e3:>15.1f} {stats['missing']:>8}")
+
+
+if __name__ == '__main__':
+    main()
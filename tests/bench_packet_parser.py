@@ -0,0 +1,61 @@
+"""Microbenchmark: per-packet parse cost for the default telemetry schema.
+
+Compares the original per-field dict building in parse_csv_data with the
+precompiled PacketParser in each record format.
+
+Usage (from the repository root):
+    python tests/bench_packet_parser.py [iterations]
+"""
+import sys
+import timeit
+
+from bench_utils import make_packet
+
+from data import Data
+from packetParser import PacketParser, RECORD_FORMATS
+
+
+def legacy_parse(line, headers, numeric_fields):
+    """The original Communication.parse_csv_data loop (minus history bookkeeping)."""
+    csv_data = line.split(',')
+    result = {}
+    for idx, name in enumerate(headers):
+        try:
+            val = csv_data[idx]
+        except IndexError:
+            val = None
+        if val is None:
+            result[name] = None
+        else:
+            if name in numeric_fields:
+                try:
+                    result[name] = float(val)
+                except Exception:
+                    result[name] = None
+            else:
+                result[name] = val
+    return result
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    fields = Data().getTelemetryFields()
+    headers = list(fields.keys())
+    numeric_fields = {f for f, unit in fields.items() if unit}
+    line = make_packet(headers, 1234)
+    split = line.split(',')
+
+    print(f"{len(headers)}-field schema, {iterations} packets")
+    legacy = timeit.timeit(lambda: legacy_parse(line, headers, numeric_fields), number=iterations)
+    print(f"  {'legacy dict (re-split)':<24} {legacy / iterations * 1e6:6.2f} us/packet")
+
+    for fmt in RECORD_FORMATS:
+        parser = PacketParser(fields, fmt)
+        assert parser.to_dict(parser.parse_fields(split)) == legacy_parse(line, headers, numeric_fields) \
+            if fmt != 'dict' else parser.parse_fields(split) == legacy_parse(line, headers, numeric_fields)
+        t = timeit.timeit(lambda: parser.parse_fields(split), number=iterations)
+        print(f"  {'compiled ' + fmt:<24} {t / iterations * 1e6:6.2f} us/packet  ({legacy / t:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
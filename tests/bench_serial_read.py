@@ -0,0 +1,60 @@
+"""Throughput benchmark: readline vs chunked reader, CSV vs binary codec.
+
+Usage (from the repository root):
+    python tests/bench_serial_read.py [packets]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import FakeSerial, make_packet
+
+from communication import Communication
+
+
+def run(read_mode, payload, packets, csv_filename, codec='csv'):
+    comm = Communication(serial_port=None, timeout=0, csv_filename=csv_filename,
+                         read_mode=read_mode, codec=codec, batch_interval=0.033)
+
+    def stop():
+        comm.reading = False
+
+    comm.ser = FakeSerial(payload, on_exhausted=stop)
+    comm.reading = True
+    comm.log_writer.start()
+    start = time.perf_counter()
+    comm.read(signal_emitter=None)
+    elapsed = time.perf_counter() - start
+    comm.log_writer.stop()
+    assert comm.receivedPacketCount == packets, (read_mode, comm.receivedPacketCount)
+    return packets / elapsed
+
+
+def main():
+    packets = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_filename = os.path.join(tmp, 'bench.csv')
+        comm = Communication(serial_port=None, csv_filename=csv_filename, codec='binary')
+        headers = comm.telemetryHeaders
+        lines = [make_packet(headers, n) for n in range(packets)]
+        payload = ''.join(line + '\n' for line in lines).encode('utf-8')
+        binary_payload = b''.join(comm.codec.encode(line.split(',')) for line in lines)
+
+        print(f"{packets} packets, {len(payload) / packets:.0f} bytes/packet CSV, "
+              f"{len(binary_payload) / packets:.0f} bytes/packet binary")
+        results = {}
+        for mode in ('readline', 'chunked'):
+            results[mode] = run(mode, payload, packets, csv_filename)
+            print(f"  {mode:<9} {results[mode]:>10.0f} packets/sec")
+        results['binary'] = run('chunked', binary_payload, packets, csv_filename, codec='binary')
+        print(f"  {'binary':<9} {results['binary']:>10.0f} packets/sec")
+        print(f"  speedup   {results['chunked'] / results['readline']:>10.1f}x chunked vs readline")
+        print(f"  speedup   {results['binary'] / results['chunked']:>10.1f}x binary vs chunked CSV")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Shared helpers for the benchmark scripts in this folder.
+
+Benchmarks are plain scripts (run them from the repository root, e.g.
+``python tests/bench_serial_read.py``). Importing this module puts the
+repository on ``sys.path`` and installs a minimal PyQt5.QtCore stub when
+PyQt5 is not available, so the communication layer can be exercised
+headless.
+"""
+import io
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+# Data() loads config.json relative to the working directory
+os.chdir(REPO_ROOT)
+
+# Provide a minimal PyQt5.QtCore stub if PyQt5 is not installed
+try:
+    import PyQt5.QtCore  # noqa: F401
+except ImportError:
+    import types
+    PyQt5 = types.ModuleType('PyQt5')
+    QtCore = types.ModuleType('PyQt5.QtCore')
+
+    class QObject:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class _DummySignal:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __get__(self, obj, objtype=None):
+            return self
+
+        def connect(self, *args, **kwargs):
+            return None
+
+        def emit(self, *args, **kwargs):
+            # no-op
+            return None
+
+    QtCore.QObject = QObject
+    QtCore.pyqtSignal = _DummySignal
+    PyQt5.QtCore = QtCore
+    sys.modules['PyQt5'] = PyQt5
+    sys.modules['PyQt5.QtCore'] = QtCore
+
+
+def make_packet(headers, n):
+    """Build one CSV telemetry line (without newline) for packet number n."""
+    values = []
+    for name in headers:
+        if name == 'TEAM_ID':
+            values.append('3195')
+        elif name == 'PACKET_COUNT':
+            values.append(str(n))
+        elif name == 'MISSION_TIME':
+            values.append(time.strftime('%H:%M:%S', time.gmtime(n)))
+        elif name == 'GPS_SATS':
+            values.append(str(n % 12))
+        elif name in ('MODE', 'STATE', 'CMD_ECHO', 'TEAM_NAME', 'GPS_TIME'):
+            values.append(name.lower())
+        else:
+            values.append(f"{(n * 0.37) % 500:.2f}")
+    return ','.join(values)
+
+
+class FakeSerial(io.RawIOBase):
+    """In-memory stand-in for serial.Serial.
+
+    Inherits `readline` from io.RawIOBase, which (like pySerial) pulls one
+    byte at a time. Calls `on_exhausted` once every byte has been consumed.
+    """
+
+    def __init__(self, payload: bytes, driver_buffer=4096, on_exhausted=None):
+        super().__init__()
+        self._payload = memoryview(payload)
+        self._pos = 0
+        self.driver_buffer = driver_buffer
+        self.on_exhausted = on_exhausted
+        self.is_open = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        remaining = len(self._payload) - self._pos
+        if remaining <= 0:
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            return 0
+        n = min(len(b), remaining)
+        b[:n] = self._payload[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    @property
+    def in_waiting(self):
+        return min(len(self._payload) - self._pos, self.driver_buffer)
+
+    def write(self, data):
+        return len(data)
+
+    def flush(self):
+        pass
@@ -0,0 +1,91 @@
+"""pytest setup: import the modules from the repository root and run headless.
+
+When PyQt5 is not installed a small PyQt5.QtCore stand-in is registered.
+Unlike the no-op stub in bench_utils, its signals keep their connections
+per instance and call them on `emit`, so signal wiring (e.g. the links of
+an IngestManager) can be tested.
+"""
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+try:
+    import PyQt5.QtCore  # noqa: F401
+except ImportError:
+    import types
+    PyQt5 = types.ModuleType('PyQt5')
+    QtCore = types.ModuleType('PyQt5.QtCore')
+
+    class QObject:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class _BoundSignal:
+        def __init__(self):
+            self._slots = []
+
+        def connect(self, slot):
+            self._slots.append(slot)
+
+        def disconnect(self, slot=None):
+            self._slots = [] if slot is None else [s for s in self._slots if s != slot]
+
+        def emit(self, *args):
+            for slot in list(self._slots):
+                slot(*args)
+
+    class pyqtSignal:
+        def __init__(self, *types, **kwargs):
+            pass
+
+        def __set_name__(self, owner, name):
+            self._attr = '_signal_' + name
+
+        def __get__(self, obj, objtype=None):
+            if obj is None:
+                return self
+            bound = obj.__dict__.get(self._attr)
+            if bound is None:
+                bound = obj.__dict__[self._attr] = _BoundSignal()
+            return bound
+
+    QtCore.QObject = QObject
+    QtCore.pyqtSignal = pyqtSignal
+    QtCore.pyqtSlot = lambda *args, **kwargs: (lambda f: f)
+    PyQt5.QtCore = QtCore
+    sys.modules['PyQt5'] = PyQt5
+    sys.modules['PyQt5.QtCore'] = QtCore
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    """Data() reads config.json from the working directory."""
+    monkeypatch.chdir(REPO_ROOT)
+
+
+@pytest.fixture
+def telemetry_fields():
+    from data import Data
+    return Data().getTelemetryFields()
+
+
+def make_row(headers, n, mission_time=None):
+    """One telemetry row (list of strings) for packet number n."""
+    row = []
+    for name in headers:
+        if name == 'TEAM_ID':
+            row.append('3195')
+        elif name == 'PACKET_COUNT':
+            row.append(str(n))
+        elif name == 'MISSION_TIME':
+            row.append(mission_time or f"00:{n // 60 % 60:02d}:{n % 60:02d}")
+        elif name in ('MODE', 'STATE', 'CMD_ECHO', 'TEAM_NAME', 'GPS_TIME'):
+            row.append(name.lower())
+        else:
+            row.append(f"{n * 0.5:.2f}")
+    return row
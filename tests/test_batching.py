@@ -0,0 +1,74 @@
+import threading
+import time
+
+from communication import Communication
+
+from conftest import make_row
+
+
+class QuietPort:
+    """Hands out scripted lines, then behaves like an idle link: each
+    readline blocks for the port timeout and returns nothing."""
+
+    is_open = True
+
+    def __init__(self, lines, timeout):
+        self.lines = list(lines)
+        self.timeout = timeout
+
+    def readline(self):
+        if self.lines:
+            return self.lines.pop(0)
+        time.sleep(self.timeout)
+        return b''
+
+    def close(self):
+        self.is_open = False
+
+
+def _batched_link(**kwargs):
+    comm = Communication('loop://?rate=0', timeout=1, csv_filename=None, **kwargs)
+    batches = []
+    emit = comm._emit
+
+    def record(name, *args):
+        if name == 'telemetry_batch':
+            batches.append((time.monotonic(), [int(p['PACKET_COUNT']) for p in args[0]]))
+        emit(name, *args)
+
+    comm._emit = record
+    return comm, batches
+
+
+def _line(comm, n):
+    return (','.join(make_row(comm.telemetryHeaders, n)) + '\n').encode()
+
+
+def test_full_batch_is_emitted_without_waiting():
+    comm, batches = _batched_link(batch_interval=10, batch_size=2)
+    frames = [_line(comm, n) for n in (1, 2, 3)]
+    comm._process_frames(frames, comm.codec, len(comm.telemetryHeaders))
+    assert [counts for _, counts in batches] == [[1, 2]]
+    comm._emit_batch()
+    assert [counts for _, counts in batches][1:] == [[3]]
+    comm.ser.close()
+
+
+def test_pending_batch_is_flushed_when_the_link_goes_quiet():
+    comm, batches = _batched_link(batch_interval=0.05)
+    loop = comm.ser
+    comm.ser = QuietPort([_line(comm, 1), _line(comm, 2)], timeout=5)
+    comm.reading = True
+    started = time.monotonic()
+    reader = threading.Thread(target=comm.read, args=(None,))
+    reader.start()
+    deadline = started + 2
+    while sum(len(counts) for _, counts in batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert comm.ser.timeout == 0.05  # capped at the batch interval while reading
+    comm.reading = False
+    reader.join()
+    loop.close()
+    assert [n for _, counts in batches for n in counts] == [1, 2]
+    assert batches[-1][0] - started < 0.5  # not held for the 5 s port timeout
+    assert comm.ser.timeout == 5
@@ -0,0 +1,102 @@
+from codec import BinaryCodec, CsvCodec, EnumField, LineFramer, resync_csv
+
+from conftest import make_row
+
+
+def test_framer_keeps_the_partial_tail():
+    framer = LineFramer()
+    assert framer.feed(b'1,a\n2,') == [b'1,a']
+    assert framer.feed(b'b') == []
+    assert framer.feed(b'\n3,c\n4') == [b'2,b', b'3,c']
+    assert bytes(framer.buffer) == b'4'
+
+
+def test_framer_passes_empty_and_crlf_lines_through():
+    framer = LineFramer()
+    assert framer.feed(b'1\r\n\n2\n') == [b'1\r', b'', b'2']
+
+
+def test_framer_drops_a_runaway_line():
+    framer = LineFramer(max_buffer=16)
+    assert framer.feed(b'x' * 10) == []
+    assert framer.feed(b'x' * 10) == []  # 20 bytes without a newline
+    assert framer.overflows == 1
+    assert framer.feed(b'\n1,a\n') == [b'', b'1,a']
+
+
+def test_csv_codec_reports_overflows_once(telemetry_fields):
+    codec = CsvCodec(telemetry_fields)
+    codec.framer.max_buffer = 8
+    codec.feed(b'0123456789')
+    assert codec.take_errors() == 1
+    assert codec.take_errors() == 0
+    codec.feed(b'x\n')
+    codec.reset()
+    assert codec.feed(b'1,a\n') == [b'1,a']
+
+
+def test_binary_round_trip(telemetry_fields):
+    codec = BinaryCodec(telemetry_fields, {'TEAM_ID': 'H', 'PACKET_COUNT': 'I',
+                                           'STATE': ['LAUNCH_PAD', 'ASCENT'],
+                                           'CMD_ECHO': ['', 'CXON', 'SIMP#']})
+    headers = list(telemetry_fields)
+    row = make_row(headers, 42)
+    row[headers.index('STATE')] = 'ASCENT'
+    row[headers.index('CMD_ECHO')] = 'SIMP101325'
+    frames = codec.feed(codec.encode(row))
+    assert len(frames) == 1
+    values = dict(zip(headers, frames[0]))
+    assert values['PACKET_COUNT'] == '42'
+    assert values['STATE'] == 'ASCENT'
+    assert values['CMD_ECHO'] == 'SIMP101325'
+    assert values['ALTITUDE'] == 21.0
+
+
+def test_binary_rejects_corrupted_frames(telemetry_fields):
+    codec = BinaryCodec(telemetry_fields)
+    headers = list(telemetry_fields)
+    good = codec.encode(make_row(headers, 1))
+    bad = bytearray(codec.encode(make_row(headers, 2)))
+    bad[10] ^= 0xFF
+    frames = codec.feed(bytes(bad) + good)
+    assert [f[headers.index('PACKET_COUNT')] for f in frames] == ['1']
+    assert codec.take_errors() == 1
+
+
+def test_enum_field():
+    enum = EnumField(['', 'CXON', 'SIMP#'])
+    assert enum.code == 'I'
+    for value in ('', 'CXON', 'SIMP101325'):
+        assert enum.decode(enum.encode(value)) == value
+    assert enum.decode(enum.encode('ST13:35:12')) == EnumField.UNKNOWN
+    assert EnumField(['A', 'B']).code == 'B'
+
+
+def _line(n, fields=6):
+    return ','.join(['3195', str(n)] + [f"{n}.{i}" for i in range(fields - 2)])
+
+
+def test_resync_splits_packets_glued_by_a_lost_newline():
+    line = _line(1) + _line(2) + _line(3)
+    packets, skipped = resync_csv(line, '3195', 6)
+    assert packets == [_line(1), _line(2), _line(3)]
+    assert skipped == 0
+
+
+def test_resync_skips_fragments_around_packets():
+    line = '7.5,garbage' + _line(1) + _line(2)[:9]
+    packets, skipped = resync_csv(line, '3195', 6)
+    assert packets == [_line(1)]
+    assert skipped == 2
+
+
+def test_resync_ignores_anchor_text_inside_a_packet():
+    # "3195," also appears as a data value; that start yields too many fields
+    inner = ','.join(['3195', '1', '3195', 'a', 'b', 'c'])
+    packets, skipped = resync_csv(inner + _line(2), '3195', 6)
+    assert packets == [inner, _line(2)]
+    assert skipped == 0
+
+
+def test_resync_line_without_anchor():
+    assert resync_csv('1,2,3', '3195', 6) == ([], 1)
@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+
+from columnStore import TIME_COLUMN, ColumnReader, ColumnStore, list_sessions
+
+from conftest import make_row
+
+
+def _record(tmp_path, telemetry_fields, rows):
+    store = ColumnStore(str(tmp_path), telemetry_fields)
+    store.open()
+    store.write_rows(rows)
+    store.close()
+    return store
+
+
+def test_round_trip(tmp_path, telemetry_fields):
+    headers = list(telemetry_fields)
+    rows = [make_row(headers, n) for n in range(50)]
+    store = _record(tmp_path, telemetry_fields, rows[:20])
+    reader = ColumnReader(store.session_dir)
+    assert len(reader) == 20
+    assert reader.schema['rows'] == 20
+    assert reader.columns == store.numeric_fields + [TIME_COLUMN]
+    np.testing.assert_array_equal(reader.column('ALTITUDE'), [n * 0.5 for n in range(20)])
+    np.testing.assert_array_equal(reader.column(TIME_COLUMN), np.arange(20.0))
+    text = list(reader.text_rows())
+    assert text[3] == [rows[3][headers.index(f)] for f in store.text_fields]
+
+
+def test_bad_values_become_nan(tmp_path, telemetry_fields):
+    headers = list(telemetry_fields)
+    rows = [make_row(headers, n) for n in range(3)]
+    rows[1][headers.index('ALTITUDE')] = 'n/a'
+    store = _record(tmp_path, telemetry_fields, rows)
+    altitude = ColumnReader(store.session_dir).column('ALTITUDE')
+    assert altitude[0] == 0.0 and math.isnan(altitude[1]) and altitude[2] == 1.0
+
+
+def test_sessions_are_never_overwritten(tmp_path, telemetry_fields):
+    headers = list(telemetry_fields)
+    first = _record(tmp_path, telemetry_fields, [make_row(headers, 1)])
+    second = _record(tmp_path, telemetry_fields, [make_row(headers, 2), make_row(headers, 3)])
+    assert list_sessions(str(tmp_path)) == [first.session_dir, second.session_dir]
+    assert len(ColumnReader(first.session_dir)) == 1
+    assert len(ColumnReader(second.session_dir)) == 2
+
+
+def test_reset_discards_the_session_rows(tmp_path, telemetry_fields):
+    headers = list(telemetry_fields)
+    store = ColumnStore(str(tmp_path), telemetry_fields)
+    store.open()
+    store.write_rows([make_row(headers, n) for n in range(5)])
+    store.reset()
+    store.write_rows([make_row(headers, 9)])
+    store.close()
+    reader = ColumnReader(store.session_dir)
+    assert len(reader) == 1
+    assert reader.column('ALTITUDE')[0] == 4.5
+    assert list(reader.text_rows())[0][0] == '3195'
@@ -0,0 +1,69 @@
+from commandTracker import CommandTracker, command_kind, expected_echo
+
+
+def test_expected_echo_and_kind():
+    assert expected_echo('CMD,3195,CX,ON\n') == 'CXON'
+    assert expected_echo('CMD,3195,SIMP,101325') == 'SIMP101325'
+    assert command_kind('CMD,3195,SIMP,101325') == 'SIMP'
+    assert expected_echo('PING') == 'PING'
+
+
+def test_echo_acknowledges_the_sent_command():
+    tracker = CommandTracker(timeout=2)
+    tracker.queued('CMD,3195,CX,ON', now=0)
+    assert tracker.observe('CXON', now=0.5) == []  # not written yet
+    tracker.observe('', now=0.6)
+    tracker.sent('CMD,3195,CX,ON', now=1.0)
+    acked = tracker.observe('CXON', now=1.04)
+    assert [t.command for t in acked] == ['CMD,3195,CX,ON']
+    assert abs(acked[0].rtt - 0.04) < 1e-9
+    assert tracker.outstanding == 0
+    stats = tracker.snapshot()
+    assert stats['acked'] == 1 and stats['ambiguous'] == 0
+    assert stats['rtt_p50_ms'] == 50  # upper bound of the 20-50 ms bucket
+
+
+def test_repeating_the_last_echoed_command_is_ambiguous():
+    tracker = CommandTracker()
+    tracker.observe('CXON', now=0)
+    tracker.queued('CMD,3195,CX,ON', now=0)
+    tracker.sent('CMD,3195,CX,ON', now=1)
+    acked = tracker.observe('CXON', now=1.2)
+    assert acked and acked[0].ambiguous
+    assert tracker.snapshot()['ambiguous'] == 1
+    assert sum(tracker.histogram) == 0  # left out of the latency figures
+
+
+def test_overdue_commands_are_retried_then_failed():
+    tracker = CommandTracker(timeout=1, max_retries=1)
+    tracker.queued('CMD,3195,CX,OFF', now=0)
+    tracker.sent('CMD,3195,CX,OFF', now=0)
+    assert tracker.expire(now=0.5) == ([], [])
+    retry, failed = tracker.expire(now=1.0)
+    assert [t.command for t in retry] == ['CMD,3195,CX,OFF'] and failed == []
+    tracker.sent('CMD,3195,CX,OFF', now=1.0)
+    retry, failed = tracker.expire(now=2.5)
+    assert retry == [] and [t.attempts for t in failed] == [2]
+    stats = tracker.snapshot()
+    assert stats['retries'] == 1 and stats['failed'] == 1 and stats['outstanding'] == 0
+
+
+def test_newer_command_of_the_same_kind_supersedes():
+    tracker = CommandTracker(timeout=1)
+    for pressure in ('101325', '101300'):
+        tracker.queued(f'CMD,3195,SIMP,{pressure}', now=0)
+        tracker.sent(f'CMD,3195,SIMP,{pressure}', now=0)
+    assert tracker.snapshot()['superseded'] == 1
+    retry, _ = tracker.expire(now=5)
+    assert [t.command for t in retry] == ['CMD,3195,SIMP,101300']
+
+
+def test_dropped_commands_count_as_failed():
+    tracker = CommandTracker()
+    first = tracker.queued('CMD,3195,CX,ON', now=0)
+    second = tracker.queued('CMD,3195,CX,ON', now=0)
+    assert tracker.dropped('CMD,3195,CX,ON') is second
+    assert tracker.dropped('CMD,3195,CX,ON', newest=False) is first
+    assert tracker.dropped('CMD,3195,CX,ON') is None
+    assert tracker.snapshot()['failed'] == 2
+    assert tracker.outstanding == 0
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+import communication
+from communication import Communication, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingPort:
+    """Write side of a port: records (time, command) for every write."""
+
+    is_open = True
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append((time.monotonic(), data.decode().strip()))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def test_bucket_allows_a_burst_then_paces(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(communication.time, 'monotonic', clock)
+    bucket = TokenBucket(rate=4, burst=2)
+    for _ in range(2):
+        assert bucket.delay() == 0
+        bucket.consume()
+    assert bucket.delay() == pytest.approx(0.25)
+    clock.now += 0.1
+    assert bucket.delay() == pytest.approx(0.15)
+    clock.now += 10  # idle time saves up no more than the burst
+    bucket.delay()
+    assert bucket.tokens == 2
+
+
+def test_bucket_needs_a_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def _start_sender(comm):
+    comm.ser = RecordingPort()
+    comm.reading = True
+    comm._stop_event.clear()
+    comm.send_thread = threading.Thread(target=comm.send_commands)
+    comm.send_thread.start()
+
+
+def test_commands_are_sent_in_order_at_the_paced_rate():
+    comm = Communication('loop://?rate=0', timeout=0.1, csv_filename=None,
+                         command_rate=20, command_burst=1)
+    port = comm.ser
+    for n in range(4):
+        comm.send_command(f'CMD,3195,SIMP,{n}')
+    _start_sender(comm)
+    comm.command_queue.join()
+    comm.stop_communication()
+    port.close()
+    writes = comm.ser.writes
+    assert [cmd for _, cmd in writes] == [f'CMD,3195,SIMP,{n}' for n in range(4)]
+    gaps = [b[0] - a[0] for a, b in zip(writes, writes[1:])]
+    assert min(gaps) >= 0.04  # one token every 50 ms
+
+
+def test_stop_returns_with_a_full_queue():
+    comm = Communication('loop://?rate=0', timeout=0.1, csv_filename=None,
+                         command_rate=0.1, command_burst=1)
+    port = comm.ser
+    while comm.command_queue.qsize() < comm.command_queue.maxsize:
+        comm.send_command('CMD,3195,CX,ON')
+    _start_sender(comm)
+    deadline = time.monotonic() + 2
+    while not comm.ser.writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    started = time.monotonic()
+    comm.stop_communication()  # the sender is waiting ten seconds for a token
+    port.close()
+    assert time.monotonic() - started < 1
+    assert not comm.send_thread.is_alive()
+    assert len(comm.ser.writes) == 1
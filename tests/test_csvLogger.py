@@ -0,0 +1,95 @@
+import csv
+
+import pytest
+
+from csvLogger import CsvLogWriter, CsvSink
+
+HEADER = ['PACKET_COUNT', 'ALTITUDE']
+
+
+def _rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'data.csv'
+    CsvSink(str(path), HEADER).reset()  # header only, as Communication leaves it
+    return path
+
+
+def test_rows_wait_for_the_batch_until_flush(log_file):
+    writer = CsvLogWriter(str(log_file), HEADER, flush_rows=1000, flush_interval=60)
+    writer.start()
+    for n in range(5):
+        assert writer.write([n, n * 2])
+    assert writer.flush()
+    assert _rows(log_file)[1:] == [[str(n), str(n * 2)] for n in range(5)]
+    assert writer.rows_written == 5
+    writer.stop()
+
+
+def test_reset_applies_to_rows_queued_before_it(log_file):
+    writer = CsvLogWriter(str(log_file), HEADER, flush_rows=1000, flush_interval=60)
+    writer.start()
+    writer.write([1, 1])
+    writer.write([2, 2])
+    assert writer.reset()
+    writer.write([3, 3])
+    writer.stop()
+    assert _rows(log_file) == [HEADER, ['3', '3']]
+    assert not writer.running
+
+
+def test_reset_without_a_writer_thread_truncates(log_file):
+    with open(log_file, 'a', newline='') as f:
+        csv.writer(f).writerow([9, 9])
+    writer = CsvLogWriter(str(log_file), HEADER)
+    assert writer.reset()
+    assert _rows(log_file) == [HEADER]
+
+
+def test_full_queue_drops_rows_without_blocking(log_file):
+    writer = CsvLogWriter(str(log_file), HEADER, max_queue=2)
+    assert writer.write([1, 1]) and writer.write([2, 2])
+    assert not writer.write([3, 3])
+    assert writer.rows_dropped == 1
+
+
+def test_pump_mode(log_file):
+    writer = CsvLogWriter(str(log_file), HEADER, flush_rows=2, flush_interval=60)
+    writer.start(threaded=False)
+    writer.write([1, 1])
+    assert writer.pump() > 0  # pending, due within flush_interval
+    writer.write([2, 2])
+    assert writer.pump() is None  # flush_rows reached: written
+    writer.write([3, 3])
+    assert writer.stop()
+    assert _rows(log_file)[1:] == [['1', '1'], ['2', '2'], ['3', '3']]
+
+
+class _BrokenSink:
+    def open(self):
+        pass
+
+    def write_rows(self, rows):
+        raise OSError("disk full")
+
+    def flush(self, sync=False):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_failing_extra_sink_is_dropped(log_file):
+    broken = _BrokenSink()
+    writer = CsvLogWriter(str(log_file), HEADER, sinks=[broken])
+    writer.start()
+    writer.write([1, 1])
+    assert writer.flush()
+    writer.write([2, 2])
+    writer.stop()
+    assert broken not in writer.sinks
+    assert _rows(log_file)[1:] == [['1', '1'], ['2', '2']]
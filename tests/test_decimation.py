@@ -0,0 +1,67 @@
+import numpy as np
+
+from decimation import MinMaxDecimator, minmax_buckets
+from ringBuffer import RingBuffer
+
+
+def test_buckets_keep_min_and_max_in_order():
+    x = np.arange(8.0)
+    y = np.array([1, 9, 0, 2, 5, 5, -3, 7], dtype=float)
+    bx, by = minmax_buckets(x, y, 4)
+    np.testing.assert_array_equal(bx, [1, 2, 6, 7])
+    np.testing.assert_array_equal(by, [9, 0, -3, 7])
+
+
+def test_bucket_size_is_a_power_of_two():
+    assert MinMaxDecimator.bucket_size_for(100, 100) == 1
+    assert MinMaxDecimator.bucket_size_for(1000, 100) == 16
+    assert MinMaxDecimator.bucket_size_for(1024, 64) == 16
+
+
+def _signal(n):
+    rng = np.random.default_rng(3195)
+    return rng.normal(size=n).cumsum()
+
+
+def test_cached_result_matches_a_fresh_decimation():
+    data = _signal(5000)
+    ring = RingBuffer(1500, columns=2)
+    cached = MinMaxDecimator()
+    for start in range(0, len(data), 137):
+        chunk = np.arange(start, min(start + 137, len(data)))
+        ring.extend(chunk, data[chunk])
+        x, y = ring.view(0), ring.view(1)
+        got = cached.decimate(x, y, ring.total, pixels=100)
+        want = MinMaxDecimator().decimate(x, y, ring.total, pixels=100)
+        np.testing.assert_array_equal(got[0], want[0])
+        np.testing.assert_array_equal(got[1], want[1])
+
+
+def test_output_covers_the_visible_window():
+    data = _signal(3000)
+    ring = RingBuffer(1000, columns=2)
+    ring.extend(np.arange(3000.0), data)
+    x, y = MinMaxDecimator().decimate(ring.view(0), ring.view(1), ring.total, pixels=50)
+    assert len(x) <= 2 * 50 + 4
+    assert x[0] >= 2000 and x[-1] <= 2999  # only samples still in the ring
+    assert np.all(np.diff(x) > 0)
+    visible = data[2000:]
+    assert y.min() == visible.min() and y.max() == visible.max()
+
+
+def test_shorter_series_starts_over():
+    decimator = MinMaxDecimator()
+    data = _signal(2000)
+    x = np.arange(2000.0)
+    decimator.decimate(x, data, 2000, pixels=50)
+    got = decimator.decimate(x[:600], data[:600], 600, pixels=50)  # series was reset
+    want = MinMaxDecimator().decimate(x[:600], data[:600], 600, pixels=50)
+    np.testing.assert_array_equal(got[0], want[0])
+    np.testing.assert_array_equal(got[1], want[1])
+
+
+def test_small_series_is_passed_through():
+    decimator = MinMaxDecimator()
+    x, y = np.arange(10.0), _signal(10)
+    out = decimator.decimate(x, y, 10, pixels=100)
+    assert out[0] is x and out[1] is y
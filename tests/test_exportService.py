@@ -0,0 +1,61 @@
+import csv
+import json
+import os
+
+import pytest
+
+from communication import Communication
+from exportService import ExportService
+
+from conftest import make_row
+
+
+@pytest.fixture
+def logged_comm(tmp_path):
+    """A Communication that logged 100 rows into gzip segments and a column store."""
+    comm = Communication('loop://?rate=0', timeout=0.1, csv_filename=str(tmp_path / 'data.csv'),
+                         log_dir=str(tmp_path / 'logs'), log_rotate_mb=0.002,
+                         log_compression='gzip', column_store=str(tmp_path / 'columns'),
+                         log_flush_rows=10)
+    comm.log_writer.start()
+    for n in range(100):
+        comm.log_writer.write(make_row(comm.telemetryHeaders, n))
+    yield comm
+    comm.log_writer.stop()
+    comm.ser.close()
+
+
+def _run(service, start_job):
+    results = []
+    service.finished.connect(lambda ok, message: results.append((ok, message)))
+    assert start_job()
+    service.wait(10)
+    assert len(results) == 1
+    return results[0]
+
+
+def test_export_logs_copies_segments_and_column_store(logged_comm, tmp_path):
+    dest = tmp_path / 'export'
+    service = ExportService()
+    ok, message = _run(service, lambda: service.export_logs(logged_comm, str(dest)))
+    assert ok, message
+    with open(dest / 'index.json') as f:
+        segments = json.load(f)['segments']
+    assert len(segments) > 1  # rotated
+    assert all((dest / entry['file']).exists() for entry in segments)
+    session = os.path.basename(logged_comm.column_store.session_dir)
+    assert (dest / session / 'schema.json').exists()
+    assert (dest / session / 'ALTITUDE.f64').stat().st_size == 100 * 8
+
+
+def test_export_log_subset_reads_every_segment(logged_comm, tmp_path):
+    dest = tmp_path / 'subset.csv'
+    service = ExportService()
+    ok, message = _run(service, lambda: service.export_log_subset(
+        logged_comm, str(dest), columns=['PACKET_COUNT', 'ALTITUDE'], start=30, end=69))
+    assert ok, message
+    with open(dest, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['PACKET_COUNT', 'ALTITUDE']
+    assert [int(r[0]) for r in rows[1:]] == list(range(30, 70))
+    assert rows[1][1] == '15.00'
@@ -0,0 +1,110 @@
+import csv
+import time
+
+import pytest
+
+from communication import Communication
+from ingestManager import IngestManager
+
+from conftest import make_row
+
+
+def _link(csv_filename=None):
+    return Communication('loop://?rate=0', timeout=0.1, csv_filename=csv_filename)
+
+
+@pytest.fixture
+def links():
+    pair = [_link(), _link()]
+    yield pair
+    for link in pair:
+        link.ser.close()
+
+
+def _deliver(link, counts):
+    """Emit `counts` from `link` as one batch of (packet, raw row) pairs."""
+    rows = [make_row(link.telemetryHeaders, n) for n in counts]
+    items = [(link.parser.parse_fields(row), row) for row in rows]
+    link.telemetry_batch.emit(items, [time.time()] * len(items))
+
+
+def _merged(manager):
+    out = []
+    manager.telemetry_batch.connect(
+        lambda packets, _: out.extend(int(p['PACKET_COUNT']) for p in packets))
+    manager.telemetry_received.connect(lambda p: out.append(int(p['PACKET_COUNT'])))
+    return out
+
+
+def test_copies_from_a_second_link_are_dropped(links):
+    manager = IngestManager(links, reorder_delay=10)
+    out = _merged(manager)
+    _deliver(links[0], range(1, 11))
+    _deliver(links[1], range(1, 11))
+    _deliver(links[1], range(11, 13))
+    _deliver(links[0], range(11, 13))
+    assert out == list(range(1, 13))
+    stats = manager.snapshot()
+    assert stats['redundant'] == 12
+    assert stats['valid'] == 12 and stats['missing'] == 0
+    assert [link['first'] for link in stats['links']] == [10, 2]
+    assert [link['redundant'] for link in stats['links']] == [2, 10]
+
+
+def test_gap_is_filled_by_the_other_link(links):
+    manager = IngestManager(links, reorder_delay=10)
+    out = _merged(manager)
+    _deliver(links[0], [1, 2, 4, 5])
+    assert out == [1, 2]  # 4 and 5 wait for 3
+    _deliver(links[1], [3])
+    assert out == [1, 2, 3, 4, 5]
+    stats = manager.snapshot()
+    assert stats['missing'] == 0 and stats['late'] == 0
+
+
+def test_unfilled_gap_is_released_after_the_reorder_delay(links):
+    manager = IngestManager(links, reorder_delay=0.05)
+    out = _merged(manager)
+    _deliver(links[0], [1, 2, 4])
+    assert out == [1, 2]
+    time.sleep(0.1)
+    links[0].link_stats.emit({})  # periodic stats release due packets on an idle link
+    assert out == [1, 2, 4]
+    _deliver(links[1], [3])  # arrives after 4 went out
+    assert out == [1, 2, 4, 3]
+    stats = manager.snapshot()
+    assert stats['missing'] == 1 and stats['late'] == 1
+
+
+def test_flush_releases_held_packets(links):
+    manager = IngestManager(links, reorder_delay=10)
+    out = _merged(manager)
+    _deliver(links[0], [1, 3, 4])
+    manager.flush()
+    assert out == [1, 3, 4]
+
+
+def test_window_bounds_the_remembered_keys(links):
+    manager = IngestManager(links, window=4, reorder_delay=10)
+    out = _merged(manager)
+    _deliver(links[0], range(1, 11))
+    assert len(manager._seen) == 4
+    _deliver(links[1], [10])
+    assert out == list(range(1, 11))
+
+
+def test_merged_raw_rows_are_logged_once(tmp_path):
+    primary = _link(str(tmp_path / 'merged.csv'))
+    secondary = _link()
+    manager = IngestManager([primary, secondary], reorder_delay=10)
+    primary.log_writer.start()
+    _deliver(primary, [1, 2])
+    _deliver(secondary, [1, 2, 3])
+    manager.flush()
+    primary.log_writer.stop()
+    for link in (primary, secondary):
+        link.ser.close()
+    with open(tmp_path / 'merged.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == primary.telemetryHeaders
+    assert rows[1:] == [make_row(primary.telemetryHeaders, n) for n in (1, 2, 3)]
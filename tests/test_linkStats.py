@@ -0,0 +1,68 @@
+from linkStats import LinkStats
+
+
+def test_gaps_count_as_missing():
+    stats = LinkStats()
+    for n in (1, 2, 5, 6):
+        assert stats.check_sequence(n)
+        stats.valid += 1
+    assert stats.missing == 2
+    assert stats.loss == 2 / 6
+    assert stats.last_packet_count == 6
+
+
+def test_duplicates_are_rejected():
+    stats = LinkStats()
+    for n in (8, 9, 10):
+        assert stats.check_sequence(n)
+    assert not stats.check_sequence(10)  # repeat of the last count
+    assert not stats.check_sequence(9)   # repeat of a recent count
+    assert stats.duplicate == 2
+    assert stats.missing == 0 and stats.resets == 0
+    assert stats.last_packet_count == 10
+
+
+def test_backwards_jump_to_an_unseen_count_is_a_restart():
+    stats = LinkStats()
+    assert stats.check_sequence(10)
+    assert stats.check_sequence(5)
+    assert stats.resets == 1 and stats.duplicate == 0
+    assert stats.check_sequence(6)
+    assert not stats.check_sequence(6)
+    assert stats.check_sequence(7) and stats.missing == 0
+
+
+def test_large_backwards_jump_is_a_restart():
+    stats = LinkStats()
+    stats.check_sequence(500)
+    assert stats.check_sequence(1)
+    assert stats.resets == 1
+    assert stats.duplicate == 0
+    assert stats.check_sequence(2)
+    assert stats.missing == 0
+
+
+def test_summary_reports_counts_since_the_last_summary():
+    stats = LinkStats(summary_interval=3600)
+    assert stats.summary() is None  # not due yet
+    stats.valid += 3
+    stats.timeouts += 1
+    line = stats.summary(force=True)
+    assert '3 valid' in line and '1 timeouts' in line
+    assert stats.summary(force=True) is None  # nothing new
+    stats.malformed += 2
+    line = stats.summary(force=True)
+    assert '0 valid' in line and '2 malformed' in line and 'timeouts' not in line
+
+
+def test_snapshot_and_reset():
+    stats = LinkStats()
+    stats.check_sequence(1)
+    stats.check_sequence(3)
+    stats.valid = 2
+    snap = stats.snapshot()
+    assert snap['valid'] == 2 and snap['missing'] == 1
+    assert snap['loss'] == 1 / 3
+    stats.reset()
+    assert stats.snapshot()['valid'] == 0
+    assert stats.last_packet_count is None
@@ -0,0 +1,113 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from communication import Communication
+from linkSupervisor import (CONNECTED, DISCONNECTED, RECONNECTING, Backoff, LinkSupervisor,
+                            port_present)
+
+from conftest import make_row
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    backoff = Backoff(0.5, 4)
+    assert [backoff.next_delay() for _ in range(6)] == [0.5, 1, 2, 4, 4, 4]
+    assert backoff.attempts == 6
+    backoff.reset()
+    assert backoff.next_delay() == 0.5
+
+
+def test_backoff_needs_a_positive_delay():
+    with pytest.raises(ValueError):
+        Backoff(0)
+
+
+def test_supervisor_records_outages():
+    supervisor = LinkSupervisor(0.1, 1)
+    supervisor.disconnected('COM3', OSError('unplugged'))
+    assert supervisor.state == DISCONNECTED
+    delays = [supervisor.next_delay() for _ in range(3)]
+    assert delays == [0.1, 0.2, 0.4]
+    outage = supervisor.reconnected()
+    assert supervisor.state == CONNECTED and supervisor.outage is None
+    assert outage.attempts == 3 and outage.error == 'unplugged'
+    assert outage.as_dict()['port'] == 'COM3'
+    supervisor.disconnected('COM3', 'again')
+    assert supervisor.next_delay() == 0.1  # backoff restarts with each outage
+    supervisor.reconnected()
+    assert len(supervisor.outages) == 2
+    assert supervisor.downtime == sum(o.duration for o in supervisor.outages)
+
+
+def test_urls_are_always_present():
+    assert port_present('tcp://127.0.0.1:1')
+    assert not port_present('/dev/does-not-exist-ground-station')
+
+
+def _serve(listener, headers, rounds, outage):
+    """Accept `rounds` connections on the port of `listener`, sending 20
+    packets on each and closing it, with `outage` seconds without a listener
+    in between."""
+    port = listener.getsockname()[1]
+    for rnd in range(rounds):
+        conn, _ = listener.accept()
+        for n in range(rnd * 20, rnd * 20 + 20):
+            conn.sendall((','.join(make_row(headers, n)) + '\n').encode())
+        time.sleep(0.2)
+        conn.close()
+        listener.close()
+        if rnd + 1 < rounds:
+            time.sleep(outage)
+            listener = socket.socket()
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind(('127.0.0.1', port))
+            listener.listen(1)
+
+
+@pytest.mark.parametrize('io_backend', ['threads', 'asyncio'])
+def test_link_reconnects_after_the_peer_goes_away(tmp_path, io_backend):
+    listener = socket.socket()
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    port = listener.getsockname()[1]
+    comm = Communication(f'tcp://127.0.0.1:{port}', timeout=0.5, csv_filename=str(tmp_path / 'a.csv'),
+                         read_mode='chunked', io_backend=io_backend,
+                         reconnect_initial=0.05, reconnect_max=0.2)
+    states = []
+    emit = comm._emit
+
+    def record(name, *args):
+        if name == 'link_state':
+            states.append(args[1])
+        emit(name, *args)
+
+    comm._emit = record
+    server = threading.Thread(target=_serve, args=(listener, comm.telemetryHeaders, 2, 0.5))
+    server.start()
+    comm.start_communication(None)
+    server.join(10)
+    deadline = time.monotonic() + 5
+    while comm.receivedPacketCount < 40 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    comm.stop_communication()
+    assert comm.receivedPacketCount == 40
+    assert comm.stats.missing == 0
+    assert states[:3] == [DISCONNECTED, RECONNECTING, CONNECTED]
+    outage = comm.supervisor.outages[0]
+    assert outage.duration >= 0.4 and outage.attempts >= 2
+
+
+def test_reconnect_drops_the_partial_line():
+    comm = Communication('loop://?rate=0', timeout=0.1, csv_filename=None,
+                         reconnect_initial=0.01, reconnect_max=0.01)
+    comm.reading = True
+    comm._partial_line = b'3195,00:00:01,1'  # cut short by the outage
+    comm.codec.feed(b'3195,00:00:01,2')
+    assert comm._reconnect(OSError('unplugged'))
+    assert comm._partial_line == b''
+    assert comm.codec.feed(b'3195\n') == [b'3195']
+    comm.reading = False
+    comm.ser.close()
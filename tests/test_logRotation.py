@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import os
+
+from logRotation import RotatingCsvSink, SegmentIndex, copy_segments, open_segment, segment_file
+
+from conftest import make_row
+
+HEADER = ['TEAM_ID', 'MISSION_TIME', 'PACKET_COUNT', 'ALTITUDE']
+
+
+def _rows(first, count):
+    return [make_row(HEADER, n) for n in range(first, first + count)]
+
+
+def _read(path):
+    with open_segment(path) as f:
+        return list(csv.reader(io.TextIOWrapper(f, newline='')))
+
+
+def test_segments_rotate_by_size(tmp_path):
+    sink = RotatingCsvSink(str(tmp_path), HEADER, max_bytes=200)
+    sink.open()
+    for first in range(0, 40, 10):
+        sink.write_rows(_rows(first, 10))
+        sink.flush()
+    sink.close()
+    segments = SegmentIndex(str(tmp_path)).select()
+    # The last flush rotated too, so a header-only segment was open at close
+    assert [(e['seq'], e['rows']) for e in segments] == [(1, 10), (2, 10), (3, 10), (4, 10), (5, 0)]
+    assert all(e['ended'] for e in segments)
+    assert segments[0]['first_time'] == '00:00:00'
+    assert segments[3]['last_time'] == '00:00:39'
+    rows = []
+    for entry in segments:
+        content = _read(os.path.join(str(tmp_path), entry['file']))
+        assert content[0] == HEADER
+        rows += content[1:]
+    assert rows == _rows(0, 40)
+
+
+def test_closed_segments_are_compressed(tmp_path):
+    sink = RotatingCsvSink(str(tmp_path), HEADER, max_bytes=200, compression='gzip')
+    sink.open()
+    for first in range(0, 30, 10):
+        sink.write_rows(_rows(first, 10))
+        sink.flush()
+    sink.close()
+    segments = SegmentIndex(str(tmp_path)).select()
+    assert all(e['file'].endswith('.csv.gz') and e['compression'] == 'gzip' for e in segments)
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.csv')]
+    assert _read(os.path.join(str(tmp_path), segments[1]['file']))[1:] == _rows(10, 10)
+
+
+def test_every_open_starts_a_new_session(tmp_path):
+    sink = RotatingCsvSink(str(tmp_path), HEADER)
+    sink.open()
+    sink.write_rows(_rows(0, 2))
+    sink.reset()
+    sink.write_rows(_rows(2, 2))
+    sink.close()
+    index = SegmentIndex(str(tmp_path))
+    sessions = index.sessions()
+    assert len(sessions) == 2
+    assert [e['rows'] for e in index.select(sessions=[sessions[1]])] == [2]
+
+
+def test_segment_file_follows_a_compressed_segment(tmp_path):
+    sink = RotatingCsvSink(str(tmp_path), HEADER, compression='gzip')
+    sink.open()
+    sink.write_rows(_rows(0, 3))
+    stale = dict(sink.index.select()[0])  # still names the .csv file
+    sink.close()
+    rows, entry = segment_file(sink.index, stale, _read)
+    assert entry['file'].endswith('.gz')
+    assert rows[1:] == _rows(0, 3)
+
+
+def test_copy_segments_writes_an_index(tmp_path):
+    log_dir = tmp_path / 'logs'
+    sink = RotatingCsvSink(str(log_dir), HEADER, max_bytes=200, compression='gzip')
+    sink.open()
+    for first in range(0, 20, 10):
+        sink.write_rows(_rows(first, 10))
+        sink.flush()
+    sink.close()
+    dest = tmp_path / 'export'
+    copied = copy_segments(sink.index, str(dest), [e for e in sink.index.select() if e['rows']])
+    assert len(copied) == 2
+    with open(dest / 'index.json') as f:
+        exported = json.load(f)['segments']
+    assert [e['file'] for e in exported] == [e['file'] for e in copied]
+    for entry in exported:
+        assert (dest / entry['file']).read_bytes() == (log_dir / entry['file']).read_bytes()
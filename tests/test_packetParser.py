@@ -0,0 +1,51 @@
+import pytest
+
+from packetParser import PacketParser
+
+from conftest import make_row
+
+
+def test_numeric_fields_become_floats_and_text_passes_through(telemetry_fields):
+    parser = PacketParser(telemetry_fields)
+    packet = parser.parse_fields(make_row(list(telemetry_fields), 4))
+    assert packet['ALTITUDE'] == 2.0
+    assert packet['PACKET_COUNT'] == '4'  # no unit: kept as text
+    assert packet['STATE'] == 'state'
+
+
+def test_bad_numeric_value_becomes_none(telemetry_fields):
+    headers = list(telemetry_fields)
+    parser = PacketParser(telemetry_fields)
+    row = make_row(headers, 4)
+    row[headers.index('ALTITUDE')] = 'n/a'
+    row[headers.index('PRESSURE')] = ''
+    packet = parser.parse_fields(row)
+    assert packet['ALTITUDE'] is None and packet['PRESSURE'] is None
+    assert packet['TEMPERATURE'] == 2.0  # the other columns still convert
+    assert row[headers.index('ALTITUDE')] == 'n/a'  # input left untouched
+
+
+def test_short_and_long_rows(telemetry_fields):
+    headers = list(telemetry_fields)
+    parser = PacketParser(telemetry_fields, 'tuple')
+    short = parser.parse_fields(make_row(headers, 1)[:3])
+    assert len(short) == len(headers)
+    assert short[:3] == ('3195', '00:00:01', '1')
+    assert all(v is None for v in short[3:])
+    long = parser.parse_fields(make_row(headers, 1) + ['extra'])
+    assert len(long) == len(headers)
+
+
+@pytest.mark.parametrize('record_format', ['dict', 'tuple', 'record'])
+def test_record_formats_hold_the_same_values(telemetry_fields, record_format):
+    parser = PacketParser(telemetry_fields, record_format)
+    row = make_row(list(telemetry_fields), 9)
+    packet = parser.parse_fields(row)
+    as_dict = packet if record_format == 'dict' else parser.to_dict(packet)
+    assert as_dict == PacketParser(telemetry_fields).parse_fields(row)
+    assert as_dict == parser.to_dict(parser.convert(row))
+
+
+def test_unknown_record_format(telemetry_fields):
+    with pytest.raises(ValueError):
+        PacketParser(telemetry_fields, 'json')
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from replay import ReplaySource, parse_mission_time
+
+from conftest import make_row
+
+
+def _write_log(path, headers, counts, trailing_newline=True):
+    lines = [','.join(headers)] + [','.join(make_row(headers, n)) for n in counts]
+    path.write_text('\n'.join(lines) + ('\n' if trailing_newline else ''))
+    return str(path)
+
+
+def _count(line):
+    return int(line.split(b',')[2])  # PACKET_COUNT
+
+
+def test_parse_mission_time():
+    assert parse_mission_time('01:02:03.5') == 3723.5
+    assert parse_mission_time(b'02:03') == 123
+    assert parse_mission_time('42') == 42
+    assert parse_mission_time('') is None
+    assert parse_mission_time('xx:01') is None
+
+
+def test_lines_are_paced_by_mission_time(tmp_path, telemetry_fields):
+    log = _write_log(tmp_path / 'log.csv', list(telemetry_fields), range(4))
+    source = ReplaySource(log, speed=10, timeout=1)
+    started = time.monotonic()
+    times = []
+    for _ in range(4):
+        line = source.readline()
+        times.append(time.monotonic() - started)
+        assert _count(line) == len(times) - 1
+    source.close()
+    # One second of mission time apart, played ten times faster
+    assert times[0] < 0.05
+    assert times[3] == pytest.approx(0.3, abs=0.05)
+
+
+def test_unpaced_replay_reads_everything_at_once(tmp_path, telemetry_fields):
+    log = _write_log(tmp_path / 'log.csv', list(telemetry_fields), range(100))
+    source = ReplaySource(log, speed=0, timeout=0.1)
+    data = source.read(source.in_waiting)
+    assert data.count(b'\n') == 100 and source.finished
+    assert source.lines_replayed == 100 and source.progress == 1.0
+    assert source.readline() == b''  # nothing left, the reader ends the replay
+    source.close()
+
+
+def test_seek_finds_the_first_line_at_or_after_the_time(tmp_path, telemetry_fields, monkeypatch):
+    monkeypatch.setattr(ReplaySource, 'INDEX_STRIDE', 8)
+    log = _write_log(tmp_path / 'log.csv', list(telemetry_fields), range(0, 200, 2))
+    source = ReplaySource(log, speed=0, timeout=0.1)
+    source.seek(61)
+    assert _count(source.readline()) == 62
+    source.seek(0)
+    assert _count(source.readline()) == 0
+    source.seek(1000)
+    assert source.finished
+    source.seek(None)
+    assert _count(source.readline()) == 0
+    source.close()
+
+
+def test_loop_restarts_and_last_line_needs_no_newline(tmp_path, telemetry_fields):
+    log = _write_log(tmp_path / 'log.csv', list(telemetry_fields), range(3), trailing_newline=False)
+    source = ReplaySource(log, speed=0, timeout=0.1, loop=True)
+    counts = [_count(source.readline()) for _ in range(7)]
+    assert counts == [0, 1, 2, 0, 1, 2, 0]
+    source.close()
+
+
+def test_empty_log_is_rejected(tmp_path):
+    (tmp_path / 'empty.csv').write_bytes(b'')
+    with pytest.raises(ValueError):
+        ReplaySource(str(tmp_path / 'empty.csv'))
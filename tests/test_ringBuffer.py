@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ringBuffer import RingBuffer
+
+
+def test_append_wraps_and_keeps_the_newest():
+    ring = RingBuffer(4, columns=2)
+    for n in range(7):
+        ring.append(n, 10 * n)
+    assert len(ring) == 4 and ring.total == 7
+    np.testing.assert_array_equal(ring.view(0), [3, 4, 5, 6])
+    np.testing.assert_array_equal(ring.view(1), [30, 40, 50, 60])
+
+
+def test_view_is_a_read_only_contiguous_slice():
+    ring = RingBuffer(3)
+    for n in range(5):
+        ring.append(n)
+    view = ring.view()
+    assert view.flags.c_contiguous and not view.flags.writeable
+    assert np.shares_memory(view, ring._data)
+    with pytest.raises(ValueError):
+        view[0] = 1
+
+
+def test_extend_matches_repeated_appends():
+    by_append, by_extend = RingBuffer(5), RingBuffer(5)
+    for chunk in ([0, 1, 2], [3, 4, 5, 6], list(range(7, 20))):
+        for v in chunk:
+            by_append.append(v)
+        by_extend.extend(chunk)
+        np.testing.assert_array_equal(by_extend.view(), by_append.view())
+    assert by_extend.total == by_append.total == 20
+
+
+def test_resize_keeps_the_newest_samples():
+    ring = RingBuffer(6)
+    ring.extend(range(10))
+    ring.resize(3)
+    np.testing.assert_array_equal(ring.view(), [7, 8, 9])
+    ring.resize(5)
+    np.testing.assert_array_equal(ring.view(), [7, 8, 9])
+    ring.extend([10, 11, 12])
+    np.testing.assert_array_equal(ring.view(), [8, 9, 10, 11, 12])
+    assert ring.total == 13 and ring.nbytes == 2 * 5 * 8
+
+
+def test_clear_and_bad_capacity():
+    ring = RingBuffer(3)
+    ring.extend([1, 2])
+    ring.clear()
+    assert len(ring) == 0 and len(ring.view()) == 0
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+    with pytest.raises(ValueError):
+        ring.resize(0)
@@ -0,0 +1,103 @@
+import pytest
+
+from communication import Communication
+
+from conftest import make_row
+
+
+class ChunkedPort:
+    """Serial stand-in whose driver buffer holds one chunk at a time."""
+
+    def __init__(self, chunks):
+        self.chunks = [bytes(c) for c in chunks]
+        self.timeout = 1
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size=1):
+        if not self.chunks:
+            return b''
+        data, rest = self.chunks[0][:size], self.chunks[0][size:]
+        if rest:
+            self.chunks[0] = rest
+        else:
+            self.chunks.pop(0)
+        return data
+
+    def readline(self):
+        # One scripted readline result per call (a timeout may cut a line short)
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.fixture
+def comm():
+    comm = Communication('loop://?rate=0', timeout=1, csv_filename=None)
+    loop = comm.ser
+    yield comm
+    loop.close()
+
+
+def _line(comm, n):
+    return (','.join(make_row(comm.telemetryHeaders, n)) + '\n').encode()
+
+
+def _packets(comm):
+    out = []
+    comm._deliver = out.append
+    return out
+
+
+def test_chunked_read_reassembles_lines_split_across_reads(comm):
+    data = _line(comm, 1) + _line(comm, 2) + _line(comm, 3)
+    comm.read_mode = 'chunked'
+    comm.ser = ChunkedPort([data[:30], data[30:200], data[200:]])
+    out = _packets(comm)
+    while True:
+        frames = comm._read_frames()
+        if frames is None:
+            break
+        comm._process_frames(frames, comm.codec, len(comm.telemetryHeaders))
+    assert [int(p['PACKET_COUNT']) for p in out] == [1, 2, 3]
+    assert comm.stats.malformed == 0
+
+
+def test_readline_keeps_a_line_cut_short_by_the_timeout(comm):
+    line = _line(comm, 7)
+    comm.ser = ChunkedPort([line[:25], line[25:60], line[60:], _line(comm, 8)])
+    comm._partial_line = b''
+    assert comm._read_frames() == []
+    assert comm._read_frames() == []
+    assert comm._read_frames() == [line]
+    assert comm._partial_line == b''
+    assert comm._read_frames() == [_line(comm, 8)]
+    assert comm._read_frames() is None
+
+
+def test_readline_partial_line_is_delivered_whole(comm):
+    out = _packets(comm)
+    line = _line(comm, 3)
+    comm.ser = ChunkedPort([line[:40], line[40:]])
+    comm._partial_line = b''
+    for _ in range(2):
+        comm._process_frames(comm._read_frames(), comm.codec, len(comm.telemetryHeaders))
+    assert [int(p['PACKET_COUNT']) for p in out] == [3]
+    assert comm.stats.malformed == 0
+
+
+def test_duplicates_are_logged_but_not_delivered(comm):
+    comm.read_mode = 'chunked'
+    comm.ser = ChunkedPort([_line(comm, 1) + _line(comm, 2) + _line(comm, 2) + _line(comm, 3)])
+    out = _packets(comm)
+    logged = []
+    comm.log_enabled = True
+    comm.log_writer.write = logged.append
+    comm._process_frames(comm._read_frames(), comm.codec, len(comm.telemetryHeaders))
+    assert [int(p['PACKET_COUNT']) for p in out] == [1, 2, 3]
+    assert [int(row[2]) for row in logged] == [1, 2, 2, 3]
+    assert comm.stats.duplicate == 1
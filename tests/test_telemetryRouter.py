@@ -0,0 +1,62 @@
+from packetParser import PacketParser
+from telemetryRouter import TelemetryRouter
+
+from conftest import make_row
+
+
+class Sink:
+    """Stands in for Graph (2 columns) or rpyGraph (4 columns)."""
+
+    def __init__(self, columns=2):
+        self._columns = columns
+        self.calls = []
+
+    def update_batch(self, *args):
+        self.calls.append(args)
+
+
+def _router(telemetry_fields):
+    graphs = {'ALTITUDE': (Sink(), None), 'GYRO': (Sink(4), None),
+              'GPS': (None, None), 'NOT_A_FIELD': (Sink(), None)}
+    router = TelemetryRouter(telemetry_fields)
+    router.rebuild(graphs)
+    return router, graphs['ALTITUDE'][0], graphs['GYRO'][0]
+
+
+def test_rebuild_skips_placeholders_and_unknown_fields(telemetry_fields):
+    router, _, _ = _router(telemetry_fields)
+    assert len(router) == 2
+    gyro = [i for i, name in enumerate(telemetry_fields) if name.startswith('GYRO_')]
+    assert router.routes[1][0] == tuple(gyro) and router.routes[1][2]
+
+
+def test_dispatch_hands_each_graph_its_columns(telemetry_fields):
+    router, altitude, gyro = _router(telemetry_fields)
+    headers = list(telemetry_fields)
+    for record_format in ('dict', 'tuple'):
+        parser = PacketParser(telemetry_fields, record_format)
+        packets = [parser.parse_fields(make_row(headers, n)) for n in (1, 2)]
+        router.dispatch(packets, (10.0, 11.0))
+    assert altitude.calls == [([0.5, 1.0], [10.0, 11.0])] * 2
+    assert gyro.calls == [([0.5, 1.0], [0.5, 1.0], [0.5, 1.0], [10.0, 11.0])] * 2
+
+
+def test_samples_without_a_value_are_skipped(telemetry_fields):
+    router, altitude, gyro = _router(telemetry_fields)
+    headers = list(telemetry_fields)
+    rows = [make_row(headers, n) for n in (1, 2, 3)]
+    rows[0][headers.index('ALTITUDE')] = 'bad'
+    rows[1][headers.index('GYRO_P')] = 'bad'
+    for name in ('GYRO_R', 'GYRO_P', 'GYRO_Y'):
+        rows[2][headers.index(name)] = 'bad'
+    packets = [PacketParser(telemetry_fields).parse_fields(row) for row in rows]
+    router.dispatch(packets, [1.0, 2.0, 3.0])
+    assert altitude.calls == [([1.0, 1.5], [2.0, 3.0])]
+    assert gyro.calls == [([0.5, 1.0], [0.5, 0.0], [0.5, 1.0], [1.0, 2.0])]
+
+
+def test_empty_batch_or_no_routes_does_nothing(telemetry_fields):
+    router, altitude, _ = _router(telemetry_fields)
+    router.dispatch([], [])
+    assert altitude.calls == []
+    TelemetryRouter(telemetry_fields).dispatch([{'ALTITUDE': 1.0}], [0.0])
@@ -0,0 +1,60 @@
+import numpy as np
+
+from trackSimplify import TrackSimplifier, douglas_peucker, project, tolerance_for_zoom
+
+
+def test_project_and_tolerance():
+    np.testing.assert_allclose(project(np.array([[0.0, 0.0], [0.0, 180.0]])), [[128, 128], [256, 128]])
+    assert tolerance_for_zoom(0) == 1.0
+    assert tolerance_for_zoom(3, pixel_tolerance=2.0) == 0.25
+
+
+def test_douglas_peucker_keeps_the_corners():
+    assert douglas_peucker(np.zeros((2, 2)), 1.0).tolist() == [0, 1]
+    line = np.column_stack((np.arange(10.0), np.zeros(10)))
+    line[3, 1] = 0.4  # wiggle below the tolerance
+    assert douglas_peucker(line, 0.5).tolist() == [0, 9]
+    corner = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [2, 2]], dtype=float)
+    assert douglas_peucker(corner, 0.1).tolist() == [0, 2, 4]
+
+
+def test_returning_to_the_start_is_not_collapsed():
+    loop = np.array([[0, 0], [5, 0], [5, 5], [0, 0]], dtype=float)
+    assert douglas_peucker(loop, 0.1).tolist() == [0, 1, 2, 3]
+
+
+def _zigzag(n):
+    # Straight legs of 50 points heading alternately north-east and south-east
+    lat = np.cumsum(np.where((np.arange(n) // 50) % 2, -1e-5, 1e-5))
+    lon = np.arange(n) * 1e-5
+    return np.column_stack((45 + lat, lon))
+
+
+def test_incremental_line_commits_only_final_vertices():
+    track = TrackSimplifier(zoom=17, chunk=64)
+    points = _zigzag(400)
+    committed, tail = [], []
+    for start in range(0, 400, 25):
+        track.append(points[start:start + 25])
+        new, tail = track.update()
+        committed.extend(new)
+    line = committed + tail
+    assert line[0] == points[0].tolist() and line[-1] == points[-1].tolist()
+    assert len(line) < 40  # about one vertex per leg
+    turns = points[49:400:50].tolist()
+    assert all(turn in line for turn in turns)
+    assert track.rebuild(17)[0] == points[0].tolist()
+    assert len(track) == 400 and track.last() == tuple(points[-1])
+
+
+def test_detail_is_limited_to_the_box():
+    track = TrackSimplifier()
+    points = _zigzag(200)
+    track.append(points)
+    lat0, lon0 = points[60]
+    lat1, lon1 = points[80]
+    segments = track.detail(20, min(lat0, lat1), lon0, max(lat0, lat1), lon1)
+    assert len(segments) == 1
+    lons = [lon for _, lon in segments[0]]
+    assert lons[0] == points[59][1] and lons[-1] == points[81][1]  # one point past each edge
+    assert track.detail(20, 0, 0, 1, 1) == []
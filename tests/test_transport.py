@@ -0,0 +1,120 @@
+import os
+import socket
+import threading
+
+import pytest
+import serial
+
+from codec import BinaryCodec, CsvCodec
+from transport import LoopbackTransport, PtyTransport, TcpTransport, UdpTransport, open_transport
+
+from conftest import make_row
+
+
+def _lines(headers, counts):
+    return b''.join((','.join(make_row(headers, n)) + '\n').encode() for n in counts)
+
+
+def _drain(transport, codec, until):
+    """Frames from feed_to calls until `until` frames arrived or a read timed out."""
+    frames = []
+    while len(frames) < until:
+        n, got = transport.feed_to(codec)
+        if not n:
+            break
+        frames.extend(got)
+    return frames
+
+
+@pytest.fixture
+def tcp_pair():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    transport = TcpTransport('127.0.0.1', listener.getsockname()[1], timeout=0.5)
+    peer, _ = listener.accept()
+    listener.close()
+    yield transport, peer
+    transport.close()
+    peer.close()
+
+
+def test_tcp_feed_to_reassembles_lines(tcp_pair, telemetry_fields):
+    transport, peer = tcp_pair
+    data = _lines(list(telemetry_fields), range(2000))  # several receive buffers' worth
+    sender = threading.Thread(target=peer.sendall, args=(data,))
+    sender.start()
+    frames = _drain(transport, CsvCodec(telemetry_fields), 2000)
+    sender.join()
+    assert len(frames) == 2000
+    assert bytes(frames[-1]) + b'\n' == _lines(list(telemetry_fields), [1999])
+    assert transport.bytes_received == len(data)
+
+
+def test_tcp_timeout_and_peer_close(tcp_pair, telemetry_fields):
+    transport, peer = tcp_pair
+    transport.timeout = 0.05
+    assert transport.feed_to(CsvCodec(telemetry_fields)) == (0, [])
+    transport.write(b'CMD,3195,CX,ON\n')
+    assert peer.recv(100) == b'CMD,3195,CX,ON\n'
+    peer.close()
+    with pytest.raises(serial.SerialException):
+        transport.feed_to(CsvCodec(telemetry_fields))
+    assert not transport.is_open
+
+
+def test_udp_datagrams_and_reply_address(telemetry_fields):
+    transport = UdpTransport('127.0.0.1', 0, timeout=0.5)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        target = transport.sock.getsockname()
+        headers = list(telemetry_fields)
+        for n in range(3):
+            sender.sendto(_lines(headers, [n]), target)
+        frames = _drain(transport, CsvCodec(telemetry_fields), 3)
+        assert [int(bytes(f).split(b',')[2]) for f in frames] == [0, 1, 2]
+        assert transport.datagrams == 3
+        transport.write(b'CMD,3195,CX,ON\n')  # goes back to the last sender
+        assert sender.recv(100) == b'CMD,3195,CX,ON\n'
+    finally:
+        sender.close()
+        transport.close()
+
+
+def test_udp_needs_a_port():
+    with pytest.raises(serial.SerialException):
+        open_transport('udp://127.0.0.1')
+
+
+@pytest.mark.skipif(not hasattr(os, 'openpty'), reason="needs a POSIX pseudo-terminal")
+def test_pty_feed_to_reads_what_the_slave_writes(telemetry_fields):
+    transport = PtyTransport(timeout=0.5)
+    try:
+        data = _lines(list(telemetry_fields), range(5))
+        os.write(transport.slave, data)
+        frames = _drain(transport, CsvCodec(telemetry_fields), 5)
+        assert b''.join(bytes(f) + b'\n' for f in frames) == data
+    finally:
+        transport.close()
+
+
+def test_loopback_counts_packets_and_echoes_commands(telemetry_fields):
+    transport = open_transport('loop://?rate=0', telemetry_fields=telemetry_fields)
+    headers = list(telemetry_fields)
+    count = headers.index('PACKET_COUNT')
+    frames = _drain(transport, CsvCodec(telemetry_fields), 300)
+    assert [int(bytes(f).split(b',')[count]) for f in frames[:300]] == list(range(300))
+    transport.write(b'CMD,3195,CX,ON\n')
+    frames = _drain(transport, CsvCodec(telemetry_fields), 1)
+    assert bytes(frames[-1]).split(b',')[headers.index('CMD_ECHO')] == b'CXON'
+    transport.close()
+
+
+def test_loopback_binary_frames(telemetry_fields):
+    codec = BinaryCodec(telemetry_fields)
+    transport = LoopbackTransport(telemetry_fields, rate=0, encode=codec.encode, timeout=0.5)
+    frames = _drain(transport, codec, 10)
+    count = list(telemetry_fields).index('PACKET_COUNT')
+    assert [int(f[count]) for f in frames[:10]] == list(range(10))
+    assert codec.take_errors() == 0
+    transport.close()
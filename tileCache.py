@@ -0,0 +1,237 @@
+"""On-disk map tile cache in MBTiles (SQLite) format.
+
+Tiles are stored in the standard MBTiles `tiles` table, so the cache can
+also be opened by other MBTiles tools. An extra `tile_access` table tracks
+when each tile was last served, which drives the LRU size limit.
+
+Seed a cache before going to the field (from the repository root):
+    python tileCache.py --bbox -86.70,34.60,-86.50,34.80 --zoom 10-17
+"""
+import argparse
+import math
+import sqlite3
+import threading
+import time
+import urllib.request
+import logging
+
+DEFAULT_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+DEFAULT_CACHE_FILE = "tiles.mbtiles"
+ACCESS_FLUSH_INTERVAL = 5.0  # seconds between writes of batched last-access times
+USER_AGENT = "ModularGS-ground-station/1.0"
+
+def deg2tile(lat, lon, zoom):
+    """Slippy-map (XYZ) tile containing a WGS84 position."""
+    lat = max(-85.0511, min(85.0511, lat))
+    n = 1 << zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def tiles_in_bbox(min_lon, min_lat, max_lon, max_lat, zoom):
+    """Yield every (z, x, y) tile covering the bounding box at `zoom`."""
+    x0, y0 = deg2tile(max_lat, min_lon, zoom)
+    x1, y1 = deg2tile(min_lat, max_lon, zoom)
+    for x in range(min(x0, x1), max(x0, x1) + 1):
+        for y in range(min(y0, y1), max(y0, y1) + 1):
+            yield zoom, x, y
+
+class TileCache:
+    """MBTiles tile store with an LRU size limit and optional upstream fetch.
+
+    `get` returns a cached tile (or None); `fetch` falls back to downloading
+    from `tile_url` when `online` and stores the result. Shared between the
+    GUI thread and tile download workers, so every query holds one lock.
+
+    Cache hits only note the access time in memory; the times are written in
+    one transaction by `flush_access` (due every `ACCESS_FLUSH_INTERVAL`, see
+    `access_due`), before an eviction and on `close`, so serving a tile never
+    waits for a commit.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, max_bytes=500 * 1024 * 1024,
+                 tile_url=DEFAULT_TILE_URL, online=True, timeout=10):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.tile_url = tile_url
+        self.online = online
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched = {}  # key -> last_used not yet written to tile_access
+        self._flushed_at = time.monotonic()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER,
+                    tile_row INTEGER, tile_data BLOB,
+                    PRIMARY KEY (zoom_level, tile_column, tile_row));
+                CREATE TABLE IF NOT EXISTS tile_access (zoom_level INTEGER, tile_column INTEGER,
+                    tile_row INTEGER, last_used REAL, size INTEGER,
+                    PRIMARY KEY (zoom_level, tile_column, tile_row));
+                CREATE INDEX IF NOT EXISTS tile_access_lru ON tile_access (last_used);
+            """)
+            self._db.executemany("INSERT OR IGNORE INTO metadata VALUES (?, ?)",
+                                 [("name", "ground station tile cache"), ("format", "png"),
+                                  ("type", "baselayer"), ("version", "1")])
+        self._size = self._total_size()
+
+    @staticmethod
+    def _key(z, x, y):
+        # MBTiles stores rows in TMS order (y grows northwards)
+        return z, x, (1 << z) - 1 - y
+
+    def _total_size(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM tile_access").fetchone()[0]
+
+    @property
+    def size(self):
+        """Bytes of tile data currently cached."""
+        return self._size
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def get(self, z, x, y):
+        key = self._key(z, x, y)
+        with self._lock:
+            row = self._db.execute("SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? "
+                                   "AND tile_row=?", key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._touched[key] = time.time()
+            self.hits += 1
+            return bytes(row[0])
+
+    @property
+    def access_due(self):
+        """True when batched access times are waiting and the last flush is
+        older than ACCESS_FLUSH_INTERVAL."""
+        return bool(self._touched) and time.monotonic() - self._flushed_at >= ACCESS_FLUSH_INTERVAL
+
+    def flush_access(self):
+        """Write the access times noted by `get` in a single transaction."""
+        with self._lock, self._db:
+            self._write_access()
+
+    def _write_access(self):
+        self._flushed_at = time.monotonic()
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        self._db.executemany("UPDATE tile_access SET last_used=? WHERE zoom_level=? AND "
+                             "tile_column=? AND tile_row=?",
+                             [(used,) + key for key, used in touched.items()])
+
+    def put(self, z, x, y, data: bytes):
+        key = self._key(z, x, y)
+        with self._lock, self._db:
+            old = self._db.execute("SELECT size FROM tile_access WHERE zoom_level=? AND tile_column=? "
+                                   "AND tile_row=?", key).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", key + (data,))
+            self._db.execute("INSERT OR REPLACE INTO tile_access VALUES (?, ?, ?, ?, ?)",
+                             key + (time.time(), len(data)))
+            self._size += len(data) - (old[0] if old else 0)
+            self._touched.pop(key, None)
+            if self.max_bytes and self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used tiles until the cache is 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        self._write_access()  # rank by the latest hits, not the last flush
+        victims = []
+        freed = 0
+        for z, x, y, size in self._db.execute("SELECT zoom_level, tile_column, tile_row, size "
+                                              "FROM tile_access ORDER BY last_used"):
+            if self._size - freed <= target:
+                break
+            victims.append((z, x, y))
+            freed += size
+        self._db.executemany("DELETE FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                             victims)
+        self._db.executemany("DELETE FROM tile_access WHERE zoom_level=? AND tile_column=? AND "
+                             "tile_row=?", victims)
+        self._size -= freed
+        logging.info(f"Tile cache evicted {len(victims)} tiles ({freed / 1e6:.1f} MB)")
+
+    def download(self, z, x, y):
+        url = self.tile_url.format(z=z, x=x, y=y)
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def fetch(self, z, x, y):
+        """Cached tile, else (when online) download and cache it. None if unavailable."""
+        data = self.get(z, x, y)
+        if data is not None or not self.online:
+            return data
+        try:
+            data = self.download(z, x, y)
+        except Exception as e:
+            logging.debug(f"Tile {z}/{x}/{y} unavailable: {e}")
+            return None
+        self.put(z, x, y, data)
+        return data
+
+    def seed(self, bbox, zooms, progress=None, delay=0.0):
+        """Download every missing tile of `bbox` (min_lon, min_lat, max_lon, max_lat)
+        for each zoom level in `zooms`. Returns (downloaded, failed)."""
+        tiles = [t for z in zooms for t in tiles_in_bbox(*bbox, z)]
+        downloaded = failed = 0
+        for i, (z, x, y) in enumerate(tiles):
+            with self._lock:
+                have = self._db.execute("SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? "
+                                        "AND tile_row=?", self._key(z, x, y)).fetchone()
+            if not have:
+                try:
+                    self.put(z, x, y, self.download(z, x, y))
+                    downloaded += 1
+                except Exception as e:
+                    logging.warning(f"Failed to seed tile {z}/{x}/{y}: {e}")
+                    failed += 1
+                if delay:
+                    time.sleep(delay)  # be polite to the tile server
+            if progress is not None:
+                progress(i + 1, len(tiles))
+        return downloaded, failed
+
+    def close(self):
+        with self._lock:
+            with self._db:
+                self._write_access()
+            self._db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-seed the offline map tile cache.")
+    parser.add_argument("--bbox", required=True,
+                        help="min_lon,min_lat,max_lon,max_lat of the area to cache")
+    parser.add_argument("--zoom", default="10-17", help="zoom level or range, e.g. 12 or 10-17")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_FILE, help="MBTiles file to fill")
+    parser.add_argument("--url", default=DEFAULT_TILE_URL, help="upstream tile URL template")
+    parser.add_argument("--max-mb", type=float, default=0, help="LRU size limit (0 = none)")
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds between downloads")
+    args = parser.parse_args()
+
+    bbox = tuple(float(v) for v in args.bbox.split(','))
+    lo, _, hi = args.zoom.partition('-')
+    zooms = range(int(lo), int(hi or lo) + 1)
+    total = sum(1 for z in zooms for _ in tiles_in_bbox(*bbox, z))
+    print(f"Seeding {total} tiles into {args.cache}")
+    cache = TileCache(args.cache, max_bytes=int(args.max_mb * 1e6), tile_url=args.url)
+
+    def progress(done, count):
+        if done % 50 == 0 or done == count:
+            print(f"  {done}/{count} tiles")
+
+    downloaded, failed = cache.seed(bbox, zooms, progress, args.delay)
+    print(f"Done: {downloaded} downloaded, {failed} failed, {cache.size / 1e6:.1f} MB cached")
+    cache.close()
+
+if __name__ == '__main__':
+    main()
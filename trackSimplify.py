@@ -0,0 +1,159 @@
+"""Douglas-Peucker simplification of the GPS track for the map page.
+
+Points are projected to Web Mercator pixels at zoom 0, so a tolerance of
+`pixel_tolerance` screen pixels at zoom z is simply pixel_tolerance / 2**z
+in those units and the simplified line is indistinguishable on screen.
+"""
+import math
+import numpy as np
+
+DEFAULT_PIXEL_TOLERANCE = 1.0
+DEFAULT_CHUNK = 256  # tail length after which simplified vertices are committed
+
+def project(latlon):
+    """(N, 2) lat/lon degrees -> (N, 2) Web Mercator pixels at zoom 0."""
+    lat = np.radians(np.clip(latlon[:, 0], -85.0511, 85.0511))
+    xy = np.empty_like(latlon, dtype=float)
+    xy[:, 0] = (latlon[:, 1] + 180.0) / 360.0 * 256.0
+    xy[:, 1] = (1.0 - np.arcsinh(np.tan(lat)) / math.pi) / 2.0 * 256.0
+    return xy
+
+def tolerance_for_zoom(zoom, pixel_tolerance=DEFAULT_PIXEL_TOLERANCE):
+    return pixel_tolerance / float(1 << max(0, int(zoom)))
+
+def douglas_peucker(xy, tolerance):
+    """Indices of the vertices kept by Douglas-Peucker (always first and last)."""
+    n = len(xy)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dx, dy = xy[last] - xy[first]
+        rel = xy[first + 1:last] - xy[first]
+        norm = math.hypot(dx, dy)
+        if norm == 0.0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(dx * rel[:, 1] - dy * rel[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+class TrackSimplifier:
+    """Full-resolution GPS track plus an incrementally simplified copy.
+
+    The overview line is simplified for `zoom`. New points only re-run the
+    simplification over the tail after the last committed vertex; once the
+    tail reaches `chunk` points its vertices are committed and never change
+    again, so each update costs O(chunk) regardless of flight length.
+    `detail` gives a finer version restricted to a bounding box, for when
+    the map is zoomed in past the overview.
+    """
+
+    def __init__(self, zoom=17, pixel_tolerance=DEFAULT_PIXEL_TOLERANCE, chunk=DEFAULT_CHUNK):
+        self.pixel_tolerance = pixel_tolerance
+        self.chunk = chunk
+        self._latlon = np.empty((1024, 2))
+        self._xy = np.empty((1024, 2))
+        self._n = 0
+        self.zoom = zoom
+        self._committed = []  # simplified vertex indices that are final
+        self._anchor = 0      # last committed index; the tail starts here
+        self._sent = 0        # committed vertices already handed out by update()
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def latlon(self):
+        """The full-resolution track as an (N, 2) array view."""
+        return self._latlon[:self._n]
+
+    def last(self):
+        return tuple(self._latlon[self._n - 1].tolist()) if self._n else None
+
+    def append(self, points):
+        """Add (lat, lon) points to the full-resolution track."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if not len(points):
+            return
+        need = self._n + len(points)
+        if need > len(self._latlon):
+            size = max(need, 2 * len(self._latlon))
+            for name in ('_latlon', '_xy'):
+                grown = np.empty((size, 2))
+                grown[:self._n] = getattr(self, name)[:self._n]
+                setattr(self, name, grown)
+        self._latlon[self._n:need] = points
+        self._xy[self._n:need] = project(points)
+        if self._n == 0:
+            self._committed = [0]
+            self._sent = 0
+        self._n = need
+
+    def update(self):
+        """Advance the overview line.
+
+        Returns (new_committed, tail): lat/lon lists of the vertices committed
+        since the previous call and the current provisional tail after them.
+        """
+        n = self._n
+        tail = []
+        if n > self._anchor + 1:
+            a = self._anchor
+            idx = douglas_peucker(self._xy[a:n], tolerance_for_zoom(self.zoom, self.pixel_tolerance)) + a
+            if n - a >= self.chunk:
+                self._committed.extend(idx[1:].tolist())
+                self._anchor = n - 1
+            else:
+                tail = idx[1:]
+        new = self._committed[self._sent:]
+        self._sent = len(self._committed)
+        return self._latlon[new].tolist(), self._latlon[tail].tolist()
+
+    def rebuild(self, zoom):
+        """Re-simplify the whole track for a new overview zoom.
+
+        Returns the complete committed line; call update() for the tail.
+        """
+        self.zoom = zoom
+        if self._n:
+            idx = douglas_peucker(self._xy[:self._n], tolerance_for_zoom(zoom, self.pixel_tolerance))
+            self._committed = idx.tolist()
+            self._anchor = self._n - 1
+        self._sent = len(self._committed)
+        return self._latlon[self._committed].tolist()
+
+    def detail(self, zoom, south, west, north, east):
+        """Segments of the track inside the box, simplified for `zoom`.
+
+        Runs of consecutive points inside the box are widened by one point
+        on either side, so the line leaves the box instead of stopping at
+        its edge.
+        """
+        ll = self.latlon
+        if not len(ll):
+            return []
+        inside = (ll[:, 0] >= south) & (ll[:, 0] <= north) & (ll[:, 1] >= west) & (ll[:, 1] <= east)
+        if not inside.any():
+            return []
+        wide = inside.copy()
+        wide[1:] |= inside[:-1]
+        wide[:-1] |= inside[1:]
+        # Start/stop of each run of True values
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], wide.view(np.int8), [0]))))
+        tolerance = tolerance_for_zoom(zoom, self.pixel_tolerance)
+        segments = []
+        for start, stop in zip(edges[::2], edges[1::2]):
+            idx = douglas_peucker(self._xy[start:stop], tolerance) + start
+            segments.append(ll[idx].tolist())
+        return segments
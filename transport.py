@@ -0,0 +1,399 @@
+"""Byte transports that Communication can read telemetry from.
+
+Every transport exposes the subset of the pySerial API that Communication
+uses (`read`, `readline`, `in_waiting`, `write`, `flush`, `close`,
+`is_open`, `timeout`, plus `fileno` where there is a descriptor to watch),
+so they can all be assigned to `Communication.ser` and driven by the same
+reader and sender threads. `open_transport` picks
+one from the port string:
+
+    COM3, /dev/ttyUSB0          serial port (pySerial)
+    tcp://host:port             TCP client, e.g. a telemetry relay
+    udp://[host]:port           UDP listener; commands go back to the last sender
+    udp://host:port?remote=h:p  ... or to a fixed address
+    pty://                      pseudo-terminal; another program writes to the slave
+    loop://?rate=100            synthetic packets at `rate` per second (0 = flat out)
+
+Other URLs (rfc2217://, socket://, spy://, ...) are handed to
+serial.serial_for_url. Errors are raised as serial.SerialException so
+callers handle every transport the same way.
+"""
+import math
+import os
+import select
+import socket
+import time
+import logging
+from urllib.parse import urlsplit, parse_qs
+
+import serial
+
+from commandTracker import expected_echo
+
+DEFAULT_TEAM_ID = '3195'
+
+def open_transport(port, baud_rate=115200, timeout=4, telemetry_fields=None, encode=None):
+    """Open the transport named by `port` (see the module docstring)."""
+    scheme = urlsplit(port).scheme.lower() if port and '://' in port else ''
+    if not scheme:
+        return serial.Serial(port, baud_rate, timeout=timeout)
+    url = urlsplit(port)
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    try:
+        if scheme == 'tcp':
+            return TcpTransport(url.hostname, url.port, timeout=timeout)
+        if scheme == 'udp':
+            remote = None
+            if 'remote' in query:
+                host, _, rport = query['remote'].rpartition(':')
+                remote = (host, int(rport))
+            return UdpTransport(url.hostname or '0.0.0.0', url.port, timeout=timeout, remote=remote)
+        if scheme == 'pty':
+            return PtyTransport(timeout=timeout)
+        if scheme == 'loop':
+            if telemetry_fields is None:
+                raise ValueError("loop:// needs the telemetry fields")
+            return LoopbackTransport(telemetry_fields, rate=float(query.get('rate', 10)),
+                                     encode=encode, timeout=timeout,
+                                     team_id=query.get('team', DEFAULT_TEAM_ID))
+    except (OSError, ValueError, TypeError) as e:
+        raise serial.SerialException(f"Could not open {port}: {e}") from e
+    return serial.serial_for_url(port, baud_rate, timeout=timeout)
+
+class BufferedTransport:
+    """Receive buffer and pySerial-style reads on top of `_recv_into`.
+
+    Subclasses implement `_recv_into(view, timeout)`, which fills the free
+    end of the receive buffer in place (socket.recv_into / os.readv) and
+    returns the byte count, 0 on timeout. Incoming bytes are therefore
+    written once, straight into the buffer the reader slices from.
+    `read`/`readline` return bytes copies like pySerial; `feed_to` hands a
+    codec a view of the buffer instead, so the bytes are copied only once
+    more, into the codec's own frame buffer.
+    """
+
+    def __init__(self, timeout=4, buffer_size=65536):
+        self.timeout = timeout
+        self.write_timeout = None
+        self.is_open = True
+        self._buf = bytearray(buffer_size)
+        self._start = 0
+        self._end = 0
+        self.bytes_received = 0
+
+    def _recv_into(self, view, timeout):
+        raise NotImplementedError
+
+    def _fill(self, timeout):
+        """Receive into the free space at the end of the buffer."""
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif len(self._buf) - self._end < len(self._buf) // 4:
+            # Running out of room: move unread data to the front, or grow
+            pending = self._end - self._start
+            if pending > len(self._buf) // 2:
+                self._buf.extend(bytes(len(self._buf)))
+            self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+        with memoryview(self._buf) as view:
+            n = self._recv_into(view[self._end:], timeout)
+        self._end += n
+        self.bytes_received += n
+        return n
+
+    def _take(self, n):
+        data = bytes(self._buf[self._start:self._start + n])
+        self._start += n
+        return data
+
+    @property
+    def in_waiting(self):
+        if self.is_open:
+            self._fill(0)
+        return self._end - self._start
+
+    def read(self, size=1):
+        """Up to `size` bytes; blocks until they arrive or `timeout` passes."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while self._end - self._start < size and self.is_open:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._fill(remaining) and remaining == 0:
+                break
+        return self._take(min(size, self._end - self._start))
+
+    def feed_to(self, codec):
+        """Feed everything buffered to `codec.feed` as a view of the receive
+        buffer, waiting up to `timeout` when nothing has arrived yet.
+
+        Returns (bytes consumed, frames); (0, []) on timeout.
+        """
+        if self.is_open:
+            self._fill(0)  # pick up what arrived since the last call
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while self._start == self._end and self.is_open:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._fill(remaining) and remaining == 0:
+                break
+        n = self._end - self._start
+        if not n:
+            return 0, []
+        with memoryview(self._buf)[self._start:self._end] as chunk:
+            frames = codec.feed(chunk)
+        self._start += n
+        return n, frames
+
+    def readline(self):
+        """One newline-terminated line, or what arrived before the timeout."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while self.is_open:
+            end = self._buf.find(b'\n', self._start, self._end)
+            if end >= 0:
+                return self._take(end + 1 - self._start)
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._fill(remaining) and remaining == 0:
+                break
+        return self._take(self._end - self._start)
+
+    def reset_input_buffer(self):
+        self._start = self._end = 0
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+def _wait_readable(fileobj, timeout):
+    try:
+        return bool(select.select([fileobj], [], [], timeout)[0])
+    except (OSError, ValueError) as e:
+        raise serial.SerialException(f"Transport closed: {e}") from e
+
+class TcpTransport(BufferedTransport):
+    """TCP client connection (e.g. to a telemetry relay)."""
+
+    def __init__(self, host, port, timeout=4, connect_timeout=5):
+        super().__init__(timeout)
+        self.address = (host, port)
+        self.sock = socket.create_connection(self.address, timeout=connect_timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(None)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def _recv_into(self, view, timeout):
+        if not _wait_readable(self.sock, timeout):
+            return 0
+        try:
+            n = self.sock.recv_into(view)
+        except OSError as e:
+            raise serial.SerialException(f"TCP receive failed: {e}") from e
+        if n == 0:
+            self.is_open = False
+            raise serial.SerialException(f"TCP connection to {self.address[0]}:{self.address[1]} closed")
+        return n
+
+    def write(self, data):
+        try:
+            self.sock.settimeout(self.write_timeout)
+            self.sock.sendall(data)
+        except socket.timeout as e:
+            raise serial.SerialTimeoutException("TCP write timeout") from e
+        except OSError as e:
+            raise serial.SerialException(f"TCP send failed: {e}") from e
+        finally:
+            self.sock.settimeout(None)
+        return len(data)
+
+    def close(self):
+        super().close()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class UdpTransport(BufferedTransport):
+    """UDP listener. Each datagram is received with recv_into directly into
+    the read buffer, which `feed_to` passes to the codec without an
+    intermediate bytes object.
+
+    Commands are sent to `remote`, or to whoever sent the last datagram.
+    """
+
+    MAX_DATAGRAM = 65507
+
+    def __init__(self, host='0.0.0.0', port=None, timeout=4, remote=None):
+        super().__init__(timeout, buffer_size=4 * self.MAX_DATAGRAM)
+        if port is None:
+            raise ValueError("udp:// needs a port")
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            # Room for bursts while the reader is busy
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        self.sock.bind((host, port))
+        self.remote = remote
+        self._fixed_remote = remote is not None
+        self.datagrams = 0
+
+    def _fill(self, timeout):
+        # A whole datagram must fit, or the kernel truncates it
+        if len(self._buf) - self._end < self.MAX_DATAGRAM and self._start:
+            pending = self._end - self._start
+            self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+        if len(self._buf) - self._end < self.MAX_DATAGRAM:
+            self._buf.extend(bytes(self.MAX_DATAGRAM))
+        return super()._fill(timeout)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def _recv_into(self, view, timeout):
+        if not _wait_readable(self.sock, timeout):
+            return 0
+        try:
+            n, sender = self.sock.recvfrom_into(view)
+        except OSError as e:
+            raise serial.SerialException(f"UDP receive failed: {e}") from e
+        if not self._fixed_remote:
+            self.remote = sender
+        self.datagrams += 1
+        return n
+
+    def write(self, data):
+        if self.remote is None:
+            logging.warning("UDP transport has no peer yet; command not sent")
+            return 0
+        try:
+            return self.sock.sendto(data, self.remote)
+        except OSError as e:
+            raise serial.SerialException(f"UDP send failed: {e}") from e
+
+    def close(self):
+        super().close()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class PtyTransport(BufferedTransport):
+    """Pseudo-terminal pair (POSIX). We hold the master end; `slave_name` is
+    a tty path a simulator or `cat log.csv > /dev/pts/N` can write to."""
+
+    def __init__(self, timeout=4):
+        super().__init__(timeout)
+        if not hasattr(os, 'openpty'):
+            raise OSError("pty:// is not supported on this platform")
+        import tty
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo or newline translation
+        self.slave_name = os.ttyname(self.slave)
+        logging.info(f"Pseudo-terminal ready, write telemetry to {self.slave_name}")
+
+    def fileno(self):
+        return self.master
+
+    def _recv_into(self, view, timeout):
+        if not _wait_readable(self.master, timeout):
+            return 0
+        try:
+            return os.readv(self.master, [view])
+        except OSError as e:
+            raise serial.SerialException(f"pty read failed: {e}") from e
+
+    def write(self, data):
+        try:
+            return os.write(self.master, data)
+        except OSError as e:
+            raise serial.SerialException(f"pty write failed: {e}") from e
+
+    def close(self):
+        super().close()
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+class LoopbackTransport(BufferedTransport):
+    """Synthetic telemetry source for load tests without a radio.
+
+    Generates `rate` packets per second (0 = as fast as they are read) from
+    the telemetry schema: a counting PACKET_COUNT, MISSION_TIME from the
+    packet clock, a GPS fix circling the launch site and smooth values for
+    the other numeric fields. Packets are CSV lines unless `encode`
+    (e.g. BinaryCodec.encode) is given. Written commands are acknowledged
+    in CMD_ECHO of the following packets.
+    """
+
+    BURST = 256  # max packets generated per fill when running flat out
+
+    def __init__(self, telemetry_fields: dict, rate=10.0, encode=None, timeout=4,
+                 team_id=DEFAULT_TEAM_ID, latitude=34.7295, longitude=-86.5853):
+        super().__init__(timeout)
+        self.fields = dict(telemetry_fields)
+        self.rate = max(0.0, rate)
+        self.encode = encode or (lambda values: (','.join(str(v) for v in values) + '\n').encode('utf-8'))
+        self.team_id = team_id
+        self.origin = (latitude, longitude)
+        self.cmd_echo = ''
+        self.packets_sent = 0
+        self._started = time.monotonic()
+
+    def _packet(self, n):
+        t = n / self.rate if self.rate else n * 0.1
+        values = []
+        for name, unit in self.fields.items():
+            if name == 'TEAM_ID':
+                values.append(self.team_id)
+            elif name == 'PACKET_COUNT':
+                values.append(n)
+            elif name in ('MISSION_TIME', 'GPS_TIME'):
+                values.append(time.strftime('%H:%M:%S', time.gmtime(t)) + f".{int(t * 100) % 100:02d}")
+            elif name == 'GPS_LATITUDE':
+                values.append(round(self.origin[0] + 0.002 * math.sin(t / 60), 6))
+            elif name == 'GPS_LONGITUDE':
+                values.append(round(self.origin[1] + 0.002 * math.cos(t / 60), 6))
+            elif name == 'GPS_SATS':
+                values.append(8)
+            elif name == 'MODE':
+                values.append('F')
+            elif name == 'STATE':
+                values.append('LAUNCH_PAD')
+            elif name == 'CMD_ECHO':
+                values.append(self.cmd_echo)
+            elif unit:
+                values.append(round(100 * math.sin(t + len(name)), 2))
+            else:
+                values.append('')
+        return self.encode(values)
+
+    def _recv_into(self, view, timeout):
+        if self.rate:
+            due = int((time.monotonic() - self._started) * self.rate) - self.packets_sent
+            if due <= 0:
+                wait = (self.packets_sent + 1) / self.rate - (time.monotonic() - self._started)
+                if timeout is not None and wait > timeout:
+                    time.sleep(timeout)
+                    return 0
+                time.sleep(max(0.0, wait))
+                due = 1
+        else:
+            due = self.BURST
+        n = 0
+        for _ in range(due):
+            packet = self._packet(self.packets_sent)
+            if n + len(packet) > len(view):
+                break
+            view[n:n + len(packet)] = packet
+            n += len(packet)
+            self.packets_sent += 1
+        return n
+
+    def write(self, data):
+        self.cmd_echo = expected_echo(data.decode('utf-8', errors='ignore'))
+        return len(data)